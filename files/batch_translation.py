@@ -0,0 +1,385 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+import csv
+import json
+import os
+import re
+import threading
+import time
+from file_loader import read_text
+from file_saver import write_atomically, write_text
+from grammars import grammar_for
+from structured_document import from_line, is_structured, load_segments, to_line, write_segments
+from translation_memory import TranslationMemory
+
+# Aynı anda çevirmene giden en fazla istek; Y3_TRANSLATION_WORKERS ile
+# değiştirilebilir. İstekler ağ beklediğinden iş parçacığı yeterlidir.
+DEFAULT_TRANSLATION_WORKERS = 4
+
+# İlerleme en fazla bu aralıkla (saniye) bildirilir.
+REPORT_INTERVAL = 0.25
+
+# Art arda bu kadar çeviri başarısız olursa (ör. ağ yok) iş durdurulur.
+MAX_CONSECUTIVE_FAILURES = 10
+
+_LETTER = re.compile(r'[^\W\d_]')
+
+
+def translation_workers():
+    try:
+        return max(1, int(os.environ.get('Y3_TRANSLATION_WORKERS', DEFAULT_TRANSLATION_WORKERS)))
+    except ValueError:
+        return DEFAULT_TRANSLATION_WORKERS
+
+
+def translatable(text):
+    # Harf içermeyen değerler (sayılar, yer tutucular) çevrilmez.
+    return bool(_LETTER.search(text))
+
+
+def _decode_json(raw):
+    return json.loads(raw)
+
+
+def _encode_json(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _decode_csv(raw):
+    return raw[1:-1].replace('""', '"')
+
+
+def _encode_csv(value):
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _decode_text(raw):
+    return raw[1:-1]
+
+
+def _encode_text(value):
+    # Düz metin dizgilerinde kaçış yoktur; tırnak içeren çeviri dizgiyi
+    # böleceğinden yazılmaz (bkz. TextSegments.unwritable).
+    if '"' in value:
+        raise ValueError("Çeviri tırnak içeriyor")
+    return '"' + value + '"'
+
+
+# Dilbilgisi adı -> tırnaklarıyla birlikte dizgiyi değere çeviren ve geri
+# yazan işlevler.
+STRING_CODECS = {
+    'json': (_decode_json, _encode_json),
+    'csv': (_decode_csv, _encode_csv),
+}
+DEFAULT_STRING_CODEC = (_decode_text, _encode_text)
+
+
+def string_segments(lines, grammar):
+    # Renklendiricinin 'string' olarak tanıdığı ve aynı satırda açılıp
+    # kapanan dizgiler: (satır, başlangıç, bitiş, değer). Satırlara bölünmüş
+    # dizgiler parça parça çevrilmez.
+    decode, _ = STRING_CODECS.get(grammar.name, DEFAULT_STRING_CODEC)
+    state = 0
+    for number, line in enumerate(lines):
+        spans, end_state = grammar.scan(line, state)
+        for index, (start, length, name) in enumerate(spans):
+            if name != 'string' or (start == 0 and state) \
+                    or (end_state and index == len(spans) - 1):
+                continue
+            try:
+                value = decode(line[start:start + length])
+            except ValueError:
+                continue
+            if translatable(value):
+                yield number, start, start + length, value
+        state = end_state
+
+
+def pending_segments(values, sources, targets, translated=None):
+    # Yapılandırılmış dosyada çevrilecek segmentler: (sıra, kaynak). Değeri
+    # boş olan ya da hâlâ kaynağın aynısı olan segmentlerin kaynağı çevrilir;
+    # zaten çevrilmiş değerlere dokunulmaz. Hedef alanı olmayan (target None)
+    # segmentlerde çeviri kaynağın yerine yazıldığından değer hep kaynağa
+    # eşittir; translated(metin) True dönerse (çeviri belleğindeki bir
+    # çeviriyse) segment atlanır.
+    for index, (value, source, target) in enumerate(zip(values, sources, targets)):
+        source = source or ''
+        if value and value != source or not translatable(source):
+            continue
+        if target is None and translated is not None and translated(source):
+            continue
+        yield index, source
+
+
+class TextSegments:
+    # Metindeki çevrilebilir değerler. segment_store verilirse her satır bir
+    # segment değeridir (bkz. to_line, pending_segments); verilmezse
+    # dilbilgisinin dizgileri çevrilir. edits, çevrilen değerlerin (satır,
+    # başlangıç, bitiş, yeni metin) listesidir ve satır sırasındadır;
+    # dilbilgisinde yazılamayan çeviriler atlanır ve unwritable'da sayılır.
+    #
+    # translated(metin) True dönerse değer zaten bir çeviridir (çeviri
+    # belleğinde çeviri olarak kayıtlıdır) ve yeniden çevrilmez.
+    def __init__(self, text, grammar, segment_store=None):
+        self.text = text
+        self.grammar = grammar
+        # İş başka bir iş parçacığında çalışır; kaydetme store'u değiştirse
+        # de iş başladığı andaki kaynak/hedef bilgisiyle devam eder.
+        self.segment_sources = None
+        self.segment_targets = None
+        if segment_store is not None:
+            self.segment_sources = list(segment_store.sources)
+            self.segment_targets = list(segment_store.targets)
+        self.places = []
+        self.sources = []
+        self.edits = []
+        self.unwritable = 0
+
+    def extract(self, translated=None):
+        lines = self.text.split('\n')
+        if self.segment_sources is not None:
+            values = [from_line(line) for line in lines]
+            for number, source in pending_segments(
+                    values, self.segment_sources, self.segment_targets, translated):
+                self.places.append((number, 0, len(lines[number])))
+                self.sources.append(source)
+        else:
+            for number, start, end, value in string_segments(lines, self.grammar):
+                if translated is not None and translated(value):
+                    continue
+                self.places.append((number, start, end))
+                self.sources.append(value)
+
+    def replace(self, translations):
+        if self.segment_sources is not None:
+            encode = to_line
+        else:
+            encode = STRING_CODECS.get(self.grammar.name, DEFAULT_STRING_CODEC)[1]
+        self.edits = []
+        self.unwritable = 0
+        for (number, start, end), source in zip(self.places, self.sources):
+            if source not in translations:
+                continue
+            try:
+                text = encode(translations[source])
+            except ValueError:
+                self.unwritable += 1
+                continue
+            self.edits.append((number, start, end, text))
+        return bool(self.edits)
+
+    def replaced_text(self):
+        lines = self.text.split('\n')
+        for number, start, end, text in reversed(self.edits):
+            lines[number] = lines[number][:start] + text + lines[number][end:]
+        return '\n'.join(lines)
+
+
+class DocumentJob(TextSegments):
+    # Düzenleyicideki belge; sonuçlar (edits) arayüz iş parçacığında tek bir
+    # düzenleme olarak uygulanır, kaydetme her zamanki gibi yapılır.
+    file_path = None
+
+    def apply(self, translations):
+        return self.replace(translations)
+
+
+class FileJob:
+    # Diskteki dosya yerinde çevrilir. .json/.csv dosyalarında segment
+    # değerleri, diğerlerinde dilbilgisinin dizgileri çevrilir; dosya
+    # write_atomically ile baştan yazılır.
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.store = None
+        # .json/.csv: (sıra, kaynak) çiftleri; diğerleri: TextSegments.
+        self.pending = None
+        self.segments = None
+        self.encoding = None
+        self.sources = []
+        self.unwritable = 0
+
+    def extract(self, translated=None):
+        if is_structured(self.file_path):
+            self.store = load_segments(self.file_path)
+            self.pending = list(pending_segments(
+                self.store.texts(), self.store.sources, self.store.targets, translated))
+            self.sources = [source for _, source in self.pending]
+        else:
+            text, self.encoding, _ = read_text(self.file_path)
+            self.segments = TextSegments(text, grammar_for(self.file_path))
+            self.segments.extract(translated)
+            self.sources = self.segments.sources
+
+    def apply(self, translations):
+        if self.store is not None:
+            values = self.store.texts()
+            changed = False
+            for index, source in self.pending:
+                if source in translations:
+                    values[index] = translations[source]
+                    changed = True
+            if not changed:
+                return False
+            write_atomically(self.file_path, partial(write_segments, self.store, values))
+            return True
+        replaced = self.segments.replace(translations)
+        self.unwritable = self.segments.unwritable
+        if not replaced:
+            return False
+        write_atomically(self.file_path, partial(
+            write_text, text=self.segments.replaced_text(), encoding=self.encoding))
+        return True
+
+
+class BatchTranslator(QThread):
+    # İşlerin (DocumentJob/FileJob) değerlerini sınırlı sayıda eşzamanlı
+    # istekle çevirir. Aynı metin bir kez çevrilir; çeviri belleğinde olanlar
+    # çevirmene hiç gitmez. Bellek bu iş parçacığında ayrı bir bağlantıyla
+    # açılır (WAL sayesinde arayüzdeki bağlantıyı beklemez).
+    #
+    # translator_factory her havuz iş parçacığı için ayrı bir çevirmen
+    # oluşturur; GoogleTranslator istekler arasında durum tutar.
+    progress = pyqtSignal(int, int, float, float)  # bitti, toplam, segment/sn, kalan sn (-1: bilinmiyor)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, jobs, translator_factory, memory_path=None, workers=None):
+        super().__init__()
+        self.jobs = jobs
+        self.translator_factory = translator_factory
+        self.memory_path = memory_path
+        self.workers = workers or translation_workers()
+        self._local = threading.local()
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def _translate(self, text):
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self._local.translator = self.translator_factory()
+        return translator.translate(text)
+
+    def run(self):
+        report = {
+            'files': 0,
+            'segments': 0,
+            'unique': 0,
+            'remembered': 0,
+            'translated': 0,
+            'failed': 0,
+            'unwritable': 0,
+            'errors': [],
+            'cancelled': False,
+            'seconds': 0.0,
+        }
+        started = time.monotonic()
+        memory = TranslationMemory(self.memory_path)
+        prototype = self.translator_factory()
+        key = (prototype.source, prototype.target, type(prototype).__name__)
+
+        # Hedef alanı olmayan dosyalarda önceki çeviriler kaynağın yerindedir.
+        translated = partial(memory.is_translation, *key)
+        sources = {}
+        extracted = []
+        for job in self.jobs:
+            if self.isInterruptionRequested():
+                break
+            try:
+                job.extract(translated)
+            except (OSError, ValueError, csv.Error) as e:
+                report['errors'].append((job.file_path, str(e)))
+                continue
+            extracted.append(job)
+            report['segments'] += len(job.sources)
+            for text in job.sources:
+                sources.setdefault(text, None)
+
+        translations = {}
+        missing = []
+        for text in sources:
+            translation = memory.get(*key, text)
+            if translation is None:
+                missing.append(text)
+            else:
+                translations[text] = translation
+        total = report['unique'] = len(sources)
+        done = report['remembered'] = len(translations)
+        self.progress.emit(done, total, 0.0, -1.0)
+
+        # Kuyrukta bekleyen istek sayısı sınırlı tutulur; iptal edildiğinde
+        # yalnızca süren istekler beklenir.
+        max_pending = self.workers * 2
+        pending = {}
+        queue = iter(missing)
+        failures = 0
+        # Çeviriler belleğe ilerleme bildirimleriyle birlikte toplu yazılır.
+        remembered = []
+        network_started = last_report = time.monotonic()
+        network_done = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                while len(pending) < max_pending and not self.isInterruptionRequested():
+                    text = next(queue, None)
+                    if text is None:
+                        break
+                    pending[executor.submit(self._translate, text)] = text
+
+                if self.isInterruptionRequested():
+                    report['cancelled'] = True
+                    for future in pending:
+                        future.cancel()
+                    pending = {
+                        future: text for future, text in pending.items()
+                        if not future.cancelled()
+                    }
+                if not pending:
+                    break
+
+                completed, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    text = pending.pop(future)
+                    error = future.exception()
+                    translation = future.result() if error is None else None
+                    if translation:
+                        translations[text] = translation
+                        remembered.append((text, translation))
+                        report['translated'] += 1
+                        failures = 0
+                    else:
+                        report['failed'] += 1
+                        failures += 1
+                        if error is not None and len(report['errors']) < 10:
+                            report['errors'].append((None, f'{text[:40]!r}: {error}'))
+                    done += 1
+                    network_done += 1
+                if failures >= MAX_CONSECUTIVE_FAILURES and not self.isInterruptionRequested():
+                    report['errors'].append(
+                        (None, f'Art arda {failures} çeviri başarısız oldu; iş durduruldu'))
+                    self.requestInterruption()
+
+                now = time.monotonic()
+                if now - last_report >= REPORT_INTERVAL:
+                    memory.put_many(*key, remembered)
+                    remembered = []
+                    rate = network_done / (now - network_started)
+                    eta = (total - done) / rate if rate else -1.0
+                    self.progress.emit(done, total, rate, eta)
+                    last_report = now
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            memory.put_many(*key, remembered)
+
+        # İptal edilse de o ana kadar çevrilenler yazılır.
+        for job in extracted:
+            try:
+                if job.apply(translations) and job.file_path is not None:
+                    report['files'] += 1
+                report['unwritable'] += job.unwritable
+            except (OSError, ValueError) as e:
+                report['errors'].append((job.file_path, str(e)))
+        memory.close()
+        report['seconds'] = time.monotonic() - started
+        self.progress.emit(done, total, 0.0, 0.0)
+        self.finished.emit(report)
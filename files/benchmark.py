@@ -0,0 +1,596 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from byte_conversion import ByteConverter, convert_file_bytes
+from conversion_engine import STREAM_CHUNK_SIZE, compile_mapping, convert_file
+
+# Performans ölçümleri.
+#
+#   python benchmark.py run --sizes 1,100 -o sonuc.json
+#   python benchmark.py compare eski.json yeni.json
+#   python benchmark.py engines conversion streaming bytes
+#   python benchmark.py engines --size-mb 10 highlight
+#
+# "run" her aşamayı (yükleme, renklendirme, dönüştürme, çeviri) ayrı bir
+# süreçte, QT_QPA_PLATFORM=offscreen ile çalıştırır; böylece tepe bellek
+# (RSS) her aşama için ayrı ölçülür.
+
+DEFAULT_MAPPING = {
+    'ß': 'ss', 'é': 'e', 'Î': 'I', 'É': 'E', 'ê': 'e',
+    'Á': 'A', 'ì': 'i', 'Ğ': 'G', 'ş': 's', 'İ': 'I',
+    'Ş': 'S', 'ğ': 'g', 'Ç': 'C', 'ı': 'i'
+}
+
+WORDS = [
+    'Gölge', 'şövalye', 'İstanbul', 'kılıç', 'ağaç', 'Çarşı', 'yıldız',
+    'gümüş', 'Şehir', 'dağ', 'ışık', 'savaşçı', 'görev', 'büyü', 'köprü',
+    'sword', 'quest', 'the', 'of', 'straße', 'café', 'Élan', 'être',
+]
+
+KEYS = ['Title', 'Name', 'Description', 'Dialog', 'Hint', 'Objective']
+
+STAGES = ('load', 'highlight', 'convert', 'convert_bytes', 'translate')
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), 'y3-benchmark')
+
+
+def _corpus_block(rng, lines=1000):
+    out = []
+    for _ in range(lines):
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+        kind = rng.random()
+        if kind < 0.3:
+            out.append(f'{rng.choice(KEYS)}: "{words}"')
+        elif kind < 0.5:
+            out.append(f'[tag_{rng.randint(0, 999)}] {words}')
+        elif kind < 0.6:
+            out.append(f'[color=#{rng.randint(0, 0xFFFFFF):06x}]"{words}"[/color]')
+        else:
+            out.append(words)
+    return '\n'.join(out) + '\n'
+
+
+def generate_corpus(path, size_mb, seed=0):
+    # Büyük derlemleri hızlı üretmek için bir blok havuzu oluşturulur ve
+    # bloklar rastgele sırayla yazılır.
+    rng = random.Random(seed)
+    blocks = [_corpus_block(rng).encode('utf-8') for _ in range(32)]
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'wb') as file:
+        while written < target:
+            block = rng.choice(blocks)
+            file.write(block)
+            written += len(block)
+    return path
+
+
+def corpus_path(corpus_dir, size_mb):
+    os.makedirs(corpus_dir, exist_ok=True)
+    path = os.path.join(corpus_dir, f'corpus_{size_mb}mb.txt')
+    if not os.path.exists(path) or os.path.getsize(path) < size_mb * 1024 * 1024:
+        generate_corpus(path, size_mb)
+    return path
+
+
+def legacy_convert_file(file_path, mapping, output_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        content = file.read()
+
+    for orig, conv in mapping.items():
+        content = content.replace(orig, conv)
+
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+
+
+# Tek birleşik regex'ten önceki renklendirme: her kural için ayrı bir
+# re.finditer geçişi, sonraki kural öncekinin biçimini ezer.
+LEGACY_HIGHLIGHT_RULES = (
+    (r'\[.*?\]', 'tag'),
+    (r'".*?"', 'string'),
+    (r'[A-Z][A-Za-z]*:', 'key'),
+)
+
+
+def legacy_highlight_block(highlighter, text):
+    for pattern, name in LEGACY_HIGHLIGHT_RULES:
+        for match in re.finditer(pattern, text):
+            start = match.start()
+            length = match.end() - match.start()
+            highlighter.setFormat(start, length, highlighter.formats[name])
+
+
+def timed(func, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def percentiles(samples):
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    ordered = sorted(samples)
+
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': ordered[-1] * 1000}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class StubTranslator:
+    # Ağ kullanmayan çevirmen; GoogleTranslator ile aynı translate arayüzü.
+    def __init__(self, latency=0.0, source='auto', target='tr'):
+        self.latency = latency
+        self.source = source
+        self.target = target
+        self.calls = 0
+
+    def translate(self, text):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return text[::-1]
+
+
+class _TimedWriter:
+    # Dönüştürülmüş her parçanın yazılma anını kaydeder.
+    def __init__(self, target):
+        self.target = target
+        self.latencies = []
+        self.last = time.perf_counter()
+
+    def write(self, data):
+        self.target.write(data)
+        now = time.perf_counter()
+        self.latencies.append(now - self.last)
+        self.last = now
+
+
+def _qt_app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def stage_load(path, options):
+    app = _qt_app()
+    from file_loader import FileLoader
+
+    latencies = []
+    result = {}
+    last = [time.perf_counter()]
+
+    def on_progress(_):
+        now = time.perf_counter()
+        latencies.append(now - last[0])
+        last[0] = now
+
+    def on_finished(*args):
+        result['content'] = args[0] if args else None
+
+    loader = FileLoader(path)
+    loader.progress.connect(on_progress)
+    loader.finished.connect(on_finished)
+    start = time.perf_counter()
+    # run() ana iş parçacığında çağrılır; sinyaller doğrudan bağlantıyla
+    # hemen işlenir, sayıları olay döngüsü yükünü gösterir.
+    loader.run()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    return {
+        'seconds': elapsed,
+        'latency_ms': percentiles(latencies),
+        'progress_signals': len(latencies),
+    }
+
+
+def stage_highlight(path, options):
+    _qt_app()
+    from PyQt5.QtGui import QTextDocument
+    from syntax_highlighter import SyntaxHighlighter
+
+    latencies = []
+
+    class TimedHighlighter(SyntaxHighlighter):
+        def highlightBlock(self, text):
+            start = time.perf_counter()
+            super().highlightBlock(text)
+            latencies.append(time.perf_counter() - start)
+
+    with open(path, 'r', encoding='utf-8') as file:
+        content = file.read()
+
+    document = QTextDocument()
+    document.setPlainText(content)
+    del content
+    highlighter = TimedHighlighter(None)
+    start = time.perf_counter()
+    highlighter.setDocument(document)
+    highlighter.rehighlight()
+    elapsed = time.perf_counter() - start
+    return {
+        'seconds': elapsed,
+        'latency_ms': percentiles(latencies),
+        'blocks': len(latencies),
+        'blocks_per_second': len(latencies) / elapsed if elapsed else None,
+    }
+
+
+def stage_convert(path, options):
+    compiled = compile_mapping(DEFAULT_MAPPING)
+    output = path + '.out'
+    try:
+        start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as source, \
+                open(output, 'w', encoding='utf-8') as target:
+            writer = _TimedWriter(target)
+            compiled.convert_stream(source, writer)
+        elapsed = time.perf_counter() - start
+    finally:
+        if os.path.exists(output):
+            os.remove(output)
+    return {'seconds': elapsed, 'latency_ms': percentiles(writer.latencies)}
+
+
+def stage_convert_bytes(path, options):
+    converter = ByteConverter(DEFAULT_MAPPING, 'cp1252')
+    output = path + '.out'
+    try:
+        start = time.perf_counter()
+        with open(path, 'rb') as source, open(output, 'wb') as target:
+            writer = _TimedWriter(target)
+            converter.convert_stream(source, writer)
+        elapsed = time.perf_counter() - start
+    finally:
+        if os.path.exists(output):
+            os.remove(output)
+    return {
+        'seconds': elapsed,
+        'latency_ms': percentiles(writer.latencies),
+        'unencodable': sum(converter.unencodable.values()),
+    }
+
+
+def stage_translate(path, options):
+    # Segmentler çeviri belleği üzerinden çevrilir; bellek her ölçümde boş
+    # başlar, isabetler derlemdeki yinelenen metinlerden gelir.
+    from translation_memory import TranslationMemory
+    translator = StubTranslator(options.get('translator_latency', 0.0))
+    memory = TranslationMemory(':memory:')
+    pattern = re.compile(r'"(.*?)"')
+    latencies = []
+    hit_latencies = []
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            for match in pattern.finditer(line):
+                call_start = time.perf_counter()
+                _, remembered = memory.translate(translator, match.group(1))
+                latency = time.perf_counter() - call_start
+                latencies.append(latency)
+                if remembered:
+                    hit_latencies.append(latency)
+    elapsed = time.perf_counter() - start
+    memory.close()
+    return {
+        'seconds': elapsed,
+        'latency_ms': percentiles(latencies),
+        'segments': len(latencies),
+        'segments_per_second': len(latencies) / elapsed if elapsed else None,
+        'translator_calls': translator.calls,
+        'memory_hits': memory.hits,
+        'memory_hit_latency_ms': percentiles(hit_latencies),
+    }
+
+
+STAGE_FUNCTIONS = {
+    'load': stage_load,
+    'highlight': stage_highlight,
+    'convert': stage_convert,
+    'convert_bytes': stage_convert_bytes,
+    'translate': stage_translate,
+}
+
+
+def run_stage(stage, path, options):
+    rss_before = peak_rss_mb()
+    metrics = STAGE_FUNCTIONS[stage](path, options)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    metrics['size_mb'] = size_mb
+    metrics['throughput_mb_s'] = size_mb / metrics['seconds'] if metrics['seconds'] else None
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    metrics['rss_before_mb'] = rss_before
+    return metrics
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def command_run(args):
+    stages = args.stages.split(',') if args.stages else list(STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        sys.exit(f'bilinmeyen aşama: {", ".join(sorted(unknown))}')
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'stages': {},
+    }
+    for size_mb in sizes:
+        path = corpus_path(args.corpus_dir, size_mb)
+        for stage in stages:
+            if stage == 'highlight' and size_mb > args.max_highlight_mb:
+                continue
+            command = [
+                sys.executable, os.path.abspath(__file__), '_stage', stage, path,
+                '--translator-latency', str(args.translator_latency),
+            ]
+            env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+            completed = subprocess.run(command, capture_output=True, text=True, env=env)
+            if completed.returncode != 0:
+                print(f'{stage} {size_mb} MB başarısız:\n{completed.stderr}', file=sys.stderr)
+                continue
+            metrics = json.loads(completed.stdout.strip().splitlines()[-1])
+            results['stages'][f'{stage}/{size_mb}mb'] = metrics
+            print(format_metrics(f'{stage}/{size_mb}mb', metrics))
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+    print(f'Sonuçlar kaydedildi: {args.output}')
+
+
+def format_metrics(name, metrics):
+    latency = metrics.get('latency_ms') or {}
+    p95 = latency.get('p95')
+    throughput = metrics.get('throughput_mb_s')
+    rss = metrics.get('peak_rss_mb')
+    return (
+        f'{name:<24} {metrics["seconds"]:8.3f} s  '
+        f'{throughput if throughput is not None else 0:8.1f} MB/s  '
+        f'p95 {p95 if p95 is not None else 0:8.3f} ms  '
+        f'RSS {rss if rss is not None else 0:8.1f} MB'
+    )
+
+
+def command_compare(args):
+    with open(args.old, 'r', encoding='utf-8') as file:
+        old = json.load(file)
+    with open(args.new, 'r', encoding='utf-8') as file:
+        new = json.load(file)
+
+    print(f'{"aşama":<24} {"eski s":>9} {"yeni s":>9} {"hız":>7} {"eski RSS":>9} {"yeni RSS":>9}')
+    for name in sorted(set(old['stages']) & set(new['stages'])):
+        a = old['stages'][name]
+        b = new['stages'][name]
+        speedup = a['seconds'] / b['seconds'] if b['seconds'] else float('inf')
+        print(
+            f'{name:<24} {a["seconds"]:9.3f} {b["seconds"]:9.3f} {speedup:6.2f}x '
+            f'{a.get("peak_rss_mb") or 0:9.1f} {b.get("peak_rss_mb") or 0:9.1f}'
+        )
+
+
+def command_stage(args):
+    metrics = run_stage(args.stage, args.path, {'translator_latency': args.translator_latency})
+    print(json.dumps(metrics))
+
+
+def bench_conversion(size_mb, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = generate_corpus(os.path.join(tmp, 'corpus.txt'), size_mb)
+        legacy_out = os.path.join(tmp, 'legacy.txt')
+        legacy = timed(legacy_convert_file, source, DEFAULT_MAPPING, legacy_out, repeat=repeat)
+        with open(legacy_out, 'rb') as file:
+            expected = file.read()
+
+        print(f'Dönüştürme ({size_mb} MB, {len(DEFAULT_MAPPING)} kural)')
+        print(f'  eski (replace zinciri): {legacy:.3f} s  {size_mb / legacy:.1f} MB/s')
+
+        for strategy in (None, 'translate'):
+            compiled = compile_mapping(DEFAULT_MAPPING, strategy)
+            output = os.path.join(tmp, f'{compiled.strategy}.txt')
+            elapsed = timed(convert_file, source, compiled, output, repeat=repeat)
+            with open(output, 'rb') as file:
+                identical = file.read() == expected
+            print(
+                f'  derlenmiş ({compiled.strategy}): {elapsed:.3f} s  '
+                f'{size_mb / elapsed:.1f} MB/s  {legacy / elapsed:.2f}x  '
+                f'çıktı aynı: {identical}'
+            )
+
+
+def bench_streaming(size_mb, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = generate_corpus(os.path.join(tmp, 'corpus.txt'), size_mb)
+        output = os.path.join(tmp, 'out.txt')
+        compiled = compile_mapping(DEFAULT_MAPPING)
+
+        print(f'Akış modu ({size_mb} MB)')
+        for label, chunk_size in (('tüm dosya', None), ('akış', STREAM_CHUNK_SIZE)):
+            elapsed = timed(convert_file, source, compiled, output, 'utf-8', chunk_size, repeat=repeat)
+            tracemalloc.start()
+            convert_file(source, compiled, output, 'utf-8', chunk_size)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'  {label}: {elapsed:.3f} s  tepe bellek: {peak / 1024 / 1024:.1f} MB')
+
+
+def convert_then_transcode(source, mapping, output, target_encoding):
+    intermediate = output + '.utf8'
+    convert_file(source, mapping, intermediate)
+    with open(intermediate, 'r', encoding='utf-8') as file, \
+            open(output, 'w', encoding=target_encoding, errors='replace') as target:
+        while True:
+            data = file.read(STREAM_CHUNK_SIZE)
+            if not data:
+                break
+            target.write(data)
+    os.remove(intermediate)
+
+
+def bench_bytes(size_mb, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = generate_corpus(os.path.join(tmp, 'corpus.txt'), size_mb)
+        legacy_source = os.path.join(tmp, 'corpus_1254.txt')
+        with open(source, 'r', encoding='utf-8') as file, \
+                open(legacy_source, 'w', encoding='cp1254', errors='replace') as target:
+            target.write(file.read())
+        output = os.path.join(tmp, 'out.txt')
+        compiled = compile_mapping(DEFAULT_MAPPING)
+
+        print(f'Bayt modu, cp1252 çıktısı ({size_mb} MB)')
+        elapsed = timed(convert_then_transcode, source, compiled, output, 'cp1252', repeat=repeat)
+        print(f'  dönüştür + ayrı kod çevirme: {elapsed:.3f} s')
+        for label, path, encoding in (('utf-8 kaynak', source, 'utf-8'),
+                                      ('cp1254 kaynak', legacy_source, 'cp1254')):
+            converter = ByteConverter(compiled, 'cp1252', encoding)
+            elapsed = timed(convert_file_bytes, path, converter, output, repeat=repeat)
+            mode = 'bayt tablosu' if converter.table is not None else 'çöz + eşle + charmap'
+            print(f'  {mode} ({label}): {elapsed:.3f} s')
+
+
+def _block_formats(document):
+    formats = []
+    block = document.firstBlock()
+    while block.isValid():
+        formats.append([(item.start, item.length, item.format.foreground().color().name())
+                        for item in block.layout().formats()])
+        block = block.next()
+    return formats
+
+
+def bench_highlight(size_mb, repeat):
+    app = _qt_app()
+    from PyQt5.QtGui import QTextDocument
+    from syntax_highlighter import SyntaxHighlighter
+    from tokenizer import Tokenizer
+
+    class LegacyHighlighter(SyntaxHighlighter):
+        def highlightBlock(self, text):
+            legacy_highlight_block(self, text)
+
+    # Önbellek belgenin tüm satırlarını tutacak kadar büyük tutulur; ilk
+    # geçiş (ısınma) dahil bütün bloklar hemen çözülür, iş parçacığı
+    # kullanılmaz.
+    tokenizer = Tokenizer(max_blocks=sys.maxsize, inline_blocks=sys.maxsize)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = generate_corpus(os.path.join(tmp, 'corpus.txt'), size_mb)
+        with open(source, 'r', encoding='utf-8') as file:
+            content = file.read()
+
+    print(f'Renklendirme ({size_mb} MB)')
+    results = {}
+    variants = (
+        ('eski (kural başına geçiş)', LegacyHighlighter(None)),
+        ('birleşik regex', SyntaxHighlighter(None)),
+        ('belirteç önbelleği (sıcak)', SyntaxHighlighter(None, tokenizer)),
+    )
+    for label, highlighter in variants:
+        document = QTextDocument()
+        document.setPlainText(content)
+        highlighter.setDocument(document)
+        if highlighter.tokenizer is not None:
+            highlighter.rehighlight()
+        elapsed = timed(highlighter.rehighlight, repeat=repeat)
+        blocks = document.blockCount()
+        results[label] = (elapsed, _block_formats(document))
+        legacy = results[next(iter(results))][0]
+        print(f'  {label}: {elapsed:.3f} s  {blocks / elapsed:,.0f} blok/s  '
+              f'{legacy / elapsed:.2f}x')
+    old, new, cached = (formats for _, formats in results.values())
+    same = sum(1 for a, b in zip(old, new) if a == b)
+    # Farklar iç içe belirteçlerden gelir (ör. tırnak içindeki [etiket]).
+    print(f'  aynı biçimlenen blok: {same}/{len(old)}')
+    print(f'  önbellekle aynı biçimlenen blok: '
+          f'{sum(1 for a, b in zip(new, cached) if a == b)}/{len(new)}')
+
+
+ENGINE_BENCHMARKS = {
+    'conversion': bench_conversion,
+    'streaming': bench_streaming,
+    'bytes': bench_bytes,
+    'highlight': bench_highlight,
+}
+
+
+def command_engines(args):
+    unknown = set(args.benchmarks) - set(ENGINE_BENCHMARKS)
+    if unknown:
+        sys.exit(f'bilinmeyen ölçüm: {", ".join(sorted(unknown))}')
+    for name in args.benchmarks or ENGINE_BENCHMARKS:
+        ENGINE_BENCHMARKS[name](args.size_mb, args.repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performans ölçümleri')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='aşama ölçümlerini çalıştırır ve JSON kaydeder')
+    run.add_argument('--sizes', default='1,100,1024', help='MB cinsinden derlem boyutları, ör. 1,100,1024')
+    run.add_argument('--stages', help=', '.join(STAGES))
+    run.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR)
+    run.add_argument('--max-highlight-mb', type=int, default=100,
+                     help='renklendirme aşamasının çalıştırılacağı en büyük derlem')
+    run.add_argument('--translator-latency', type=float, default=0.0,
+                     help='sahte çevirmenin çağrı başına gecikmesi (s)')
+    run.add_argument('-o', '--output', default='benchmark_results.json')
+    run.set_defaults(func=command_run)
+
+    compare = commands.add_parser('compare', help='iki sonuç dosyasını karşılaştırır')
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.set_defaults(func=command_compare)
+
+    engines = commands.add_parser('engines', help='dönüştürme motorlarını karşılaştırır')
+    engines.add_argument('--size-mb', type=int, default=100)
+    engines.add_argument('--repeat', type=int, default=3)
+    engines.add_argument('benchmarks', nargs='*', help=', '.join(ENGINE_BENCHMARKS))
+    engines.set_defaults(func=command_engines)
+
+    stage = commands.add_parser('_stage')
+    stage.add_argument('stage', choices=STAGES)
+    stage.add_argument('path')
+    stage.add_argument('--translator-latency', type=float, default=0.0)
+    stage.set_defaults(func=command_stage)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
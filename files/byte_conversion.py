@@ -0,0 +1,251 @@
+import codecs
+import json
+import os
+import re
+import threading
+from collections import Counter
+from conversion_engine import STREAM_CHUNK_SIZE, compile_mapping, converted_path
+
+# Kodlanamayan karakterleri sayan hata işleyicisi. Sayaç, o an kodlama
+# yapan iş parçacığının dönüştürücüsüne aittir.
+_report = threading.local()
+
+
+def _report_unencodable(error):
+    counter = getattr(_report, 'counter', None)
+    if counter is not None:
+        counter.update(error.object[error.start:error.end])
+    return (getattr(_report, 'replacement', b'?') * (error.end - error.start), error.end)
+
+
+codecs.register_error('byte_conversion.report', _report_unencodable)
+
+
+def single_byte_table(encoding):
+    # Bayt -> karakter çözme tablosu; tanımsız baytlar None olur.
+    if len(bytes(range(256)).decode(encoding, errors='replace')) != 256:
+        raise ValueError(f"Tek baytlık bir kodlama değil: {encoding}")
+    table = []
+    for byte in range(256):
+        try:
+            table.append(bytes([byte]).decode(encoding))
+        except UnicodeDecodeError:
+            table.append(None)
+    return table
+
+
+def load_custom_table(file_path):
+    # {"ğ": 240, "ş": 254} biçiminde karakter -> bayt tablosu.
+    with open(file_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    table = {}
+    for char, value in data.items():
+        if len(char) != 1 or not isinstance(value, int) or not 0 <= value <= 255:
+            raise ValueError(f"Geçersiz tablo girdisi: {char!r}: {value!r}")
+        table[char] = value
+    return table
+
+
+class ByteConverter:
+    # Eşleştirmeyi ve tek baytlık hedef kodlamaya (cp1252, latin-1 ya da özel
+    # tablo) çevirmeyi tek adımda yapar.
+    #
+    # Kaynak tek baytlık bir kod sayfasıysa çözme, eşleştirme ve hedefe
+    # kodlama 256 girdili tek bir bytes.translate tablosunda birleşir ve hiç
+    # str oluşturulmaz; birden çok bayta açılan ya da kodlanamayan baytlar
+    # ayrı bir regex ile işlenir.
+    #
+    # Bayt tablosu yalnızca tek baytlık kaynaklar içindir. Kaynak UTF-8 ise
+    # çok baytlı dizileri bayt düzeyinde tek tek değiştirmek CPython'da C
+    # içinde çalışan çözücüden çok daha yavaştır (Türkçe derlemde ASCII için
+    # bytes.translate, diğer diziler için regex + önbellek: ~5 kat); bu
+    # durumda parça parça çözülür, derlenmiş eşleştirme uygulanır ve hedef
+    # tablodan üretilen charmap kodlayıcısıyla yazılır. table None kalır.
+    def __init__(self, mapping, target_encoding='cp1252', source_encoding='utf-8',
+                 custom_table=None, replacement=b'?'):
+        self.mapping = compile_mapping(mapping)
+        self.target_encoding = target_encoding
+        self.source_encoding = codecs.lookup(source_encoding).name
+        self.replacement = replacement
+        self.unencodable = Counter()
+
+        decoding_table = single_byte_table(target_encoding)
+        for char, byte in (custom_table or {}).items():
+            decoding_table[byte] = char
+        self.decoding_table = ''.join(
+            char if char is not None else '\ufffe' for char in decoding_table
+        )
+        self.encoding_map = codecs.charmap_build(self.decoding_table)
+
+        self.utf8_source = self.source_encoding == 'utf-8'
+        self.sequences = {}
+        self.table = None
+        self.pattern = None
+        self.max_key_length = 1
+        if not self.utf8_source:
+            self._build_byte_table()
+
+    def __getstate__(self):
+        # EncodingMap pickle edilemez; işçi süreçlerinde yeniden kurulur.
+        state = self.__dict__.copy()
+        del state['encoding_map']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.encoding_map = codecs.charmap_build(self.decoding_table)
+
+    def _encode(self, text):
+        _report.counter = self.unencodable
+        _report.replacement = self.replacement
+        try:
+            return codecs.charmap_encode(text, 'byte_conversion.report', self.encoding_map)[0]
+        finally:
+            _report.counter = None
+
+    def _encode_checked(self, text):
+        out = []
+        failed = []
+        for char in text:
+            try:
+                out.append(codecs.charmap_encode(char, 'strict', self.encoding_map)[0])
+            except UnicodeEncodeError:
+                out.append(self.replacement)
+                failed.append(char)
+        return b''.join(out), tuple(failed)
+
+    def _build_byte_table(self):
+        # 256 girdili bytes.translate tablosu. Tek bayta inmeyen ya da
+        # kodlanamayan baytlar "special" listesine alınır ve regex yoluyla
+        # işlenir; çok karakterlik anahtarlar da aynı regex'e girer.
+        source_table = single_byte_table(self.source_encoding)
+        table = bytearray(range(256))
+        special = []
+        for byte, char in enumerate(source_table):
+            if char is None:
+                encoded, failed = self.replacement, ('\\x%02x' % byte,)
+            else:
+                encoded, failed = self._encode_checked(self.mapping.single.get(char, char))
+            if len(encoded) == 1 and not failed:
+                table[byte] = encoded[0]
+            else:
+                special.append(byte)
+                self.sequences[bytes([byte])] = (encoded, failed)
+        self.table = bytes(table)
+
+        alternatives = []
+        for key in sorted(self.mapping.multi, key=len, reverse=True):
+            try:
+                encoded = key.encode(self.source_encoding)
+            except UnicodeEncodeError:
+                continue
+            self.sequences[encoded] = self._encode_checked(self.mapping.multi[key])
+            alternatives.append(re.escape(encoded))
+            self.max_key_length = max(self.max_key_length, len(encoded))
+        if special:
+            alternatives.append(b'[' + b''.join(re.escape(bytes([b])) for b in special) + b']')
+
+        if alternatives:
+            self.pattern = re.compile(b'(' + b'|'.join(alternatives) + b')')
+
+    def convert(self, data):
+        if self.utf8_source:
+            return self._encode(self.mapping.convert(data.decode('utf-8-sig')))
+        if self.pattern is None:
+            return data.translate(self.table)
+        return self._join(self.pattern.split(data))
+
+    def _join(self, parts):
+        matched = parts[1::2]
+        parts[0::2] = [part.translate(self.table) for part in parts[0::2]]
+        parts[1::2] = [self.sequences[sequence][0] for sequence in matched]
+
+        failed = [sequence for sequence in set(matched) if self.sequences[sequence][1]]
+        if failed:
+            counts = Counter(matched)
+            for sequence in failed:
+                for char in self.sequences[sequence][1]:
+                    self.unencodable[char] += counts[sequence]
+        return b''.join(parts)
+
+    def convert_chunk(self, data, final=False):
+        if final or self.pattern is None:
+            return self.convert(data), b''
+
+        cut = len(data) - (self.max_key_length - 1)
+        if cut <= 0:
+            return b'', data
+
+        # Sondan geriye yürüyerek cut'tan önce başlayan son eşleşme bulunur;
+        # ondan sonra başlayanlar bir sonraki parçaya bırakılır.
+        parts = self.pattern.split(data)
+        pos = len(data)
+        index = len(parts) - 1
+        while index > 0:
+            start = pos - len(parts[index])
+            if index % 2 and start < cut:
+                break
+            pos = start
+            index -= 1
+
+        if index <= 0:
+            return data[:cut].translate(self.table), data[cut:]
+
+        end = max(pos, cut)
+        head = parts[:index + 1]
+        head.append(data[pos:end])
+        return self._join(head), data[end:]
+
+    def convert_stream(self, source, target, chunk_size=STREAM_CHUNK_SIZE):
+        if self.utf8_source:
+            self._convert_utf8_stream(source, target, chunk_size)
+            return
+
+        remainder = b''
+        while True:
+            data = source.read(chunk_size)
+            final = not data
+            converted, remainder = self.convert_chunk(remainder + data, final)
+            if converted:
+                target.write(converted)
+            if final:
+                break
+
+    def _convert_utf8_stream(self, source, target, chunk_size):
+        # Artımlı çözücü parça sınırında bölünen UTF-8 dizilerini birleştirir
+        # ve baştaki BOM'u atar; çok karakterlik anahtarları CompiledMapping
+        # bir sonraki parçaya bekletir.
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        remainder = ''
+        while True:
+            data = source.read(chunk_size)
+            final = not data
+            text = decoder.decode(data, final)
+            converted, remainder = self.mapping.convert_chunk(remainder + text, final)
+            if converted:
+                target.write(self._encode(converted))
+            if final:
+                break
+
+
+def convert_file_bytes(file_path, converter, output_path=None, chunk_size=STREAM_CHUNK_SIZE):
+    if output_path is None:
+        output_path = converted_path(file_path)
+    with open(file_path, 'rb') as source, open(output_path, 'wb') as target:
+        converter.convert_stream(source, target, chunk_size)
+    return output_path
+
+
+# Süreç havuzu işçileri; dönüştürücü her işçiye bir kez gönderilir.
+_worker_converter = None
+
+
+def init_byte_worker(converter):
+    global _worker_converter
+    _worker_converter = converter
+
+
+def convert_bytes_in_worker(file_path, output_path):
+    _worker_converter.unencodable.clear()
+    convert_file_bytes(file_path, _worker_converter, output_path)
+    return os.path.getsize(file_path), Counter(_worker_converter.unencodable)
@@ -1,8 +1,13 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QPushButton, QLabel, QFileDialog, QTableWidget, 
-                            QTableWidgetItem, QMessageBox, QHeaderView, QProgressBar)
+                            QTableWidgetItem, QMessageBox, QHeaderView, QProgressBar,
+                            QSpinBox, QCheckBox, QLineEdit)
 from PyQt5.QtCore import Qt, QDir
 import os
+from conversion_engine import convert_file, converted_path
+from mapping_profile import MappingProfileError, compile_profile
+from conversion_worker import FolderConversionWorker, default_worker_count
+from file_discovery import DEFAULT_INCLUDE, parse_patterns
 
 class ModernCharacterConverter(QMainWindow):
     def __init__(self):
@@ -136,6 +141,30 @@ class ModernCharacterConverter(QMainWindow):
         """)
         layout.addWidget(self.progress_bar)
 
+        # Worker count
+        worker_layout = QHBoxLayout()
+        worker_layout.addWidget(QLabel("İşlemci sayısı:"))
+        self.worker_spin = QSpinBox()
+        self.worker_spin.setRange(1, default_worker_count() * 4)
+        self.worker_spin.setValue(default_worker_count())
+        worker_layout.addWidget(self.worker_spin)
+        worker_layout.addStretch()
+        self.reverse_checkbox = QCheckBox("Ters yönde uygula (Dönüştürülecek → Orijinal)")
+        worker_layout.addWidget(self.reverse_checkbox)
+        layout.addLayout(worker_layout)
+
+        # Folder filters
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Dahil:"))
+        self.include_edit = QLineEdit("; ".join(DEFAULT_INCLUDE))
+        self.include_edit.setToolTip("Klasörde dönüştürülecek dosya desenleri, ör. *.txt; *.csv")
+        filter_layout.addWidget(self.include_edit)
+        filter_layout.addWidget(QLabel("Hariç:"))
+        self.exclude_edit = QLineEdit()
+        self.exclude_edit.setToolTip("Atlanacak dosya ya da klasör desenleri, ör. yedek; eski/*.txt")
+        filter_layout.addWidget(self.exclude_edit)
+        layout.addLayout(filter_layout)
+
         # Convert button
         self.convert_button = QPushButton("Dönüştür")
         self.convert_button.setStyleSheet("""
@@ -153,6 +182,13 @@ class ModernCharacterConverter(QMainWindow):
         self.convert_button.clicked.connect(self.convert)
         layout.addWidget(self.convert_button)
 
+        # Cancel button
+        self.cancel_button = QPushButton("İptal")
+        self.cancel_button.setStyleSheet(self.delete_row_button.styleSheet())
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_conversion)
+        layout.addWidget(self.cancel_button)
+
         # Main window style
         self.setStyleSheet("""
             QMainWindow {
@@ -166,6 +202,7 @@ class ModernCharacterConverter(QMainWindow):
 
         self.selected_path = None
         self.is_folder = False
+        self.conversion_worker = None
         self.load_default_mapping()
 
     def load_default_mapping(self):
@@ -219,28 +256,41 @@ class ModernCharacterConverter(QMainWindow):
         for row in sorted(selected_rows, reverse=True):
             self.char_table.removeRow(row)
 
-    def get_mapping_dict(self):
-        mapping = {}
+    def get_mapping_rows(self):
+        rows = []
         for row in range(self.char_table.rowCount()):
             orig_item = self.char_table.item(row, 0)
             conv_item = self.char_table.item(row, 1)
             if orig_item and conv_item and orig_item.text() and conv_item.text():
-                mapping[orig_item.text()] = conv_item.text()
-        return mapping
+                rows.append((orig_item.text(), conv_item.text()))
+        return rows
+
+    def get_mapping_dict(self):
+        return dict(self.get_mapping_rows())
+
+    def get_profile(self):
+        try:
+            profile = compile_profile(self.get_mapping_rows())
+        except MappingProfileError as e:
+            QMessageBox.warning(self, "Uyarı", f"Eşleştirme tablosunda hata var:\n{str(e)}")
+            return None
+
+        if profile.warnings:
+            reply = QMessageBox.question(
+                self, "Uyarı",
+                "Eşleştirme tablosunda çakışmalar var:\n"
+                + "\n".join(issue.message for issue in profile.warnings)
+                + "\n\nYine de devam edilsin mi?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return None
+        return profile
 
     def convert_file(self, file_path, mapping):
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-            for orig, conv in mapping.items():
-                content = content.replace(orig, conv)
-                
-            output_path = os.path.splitext(file_path)[0] + '_converted' + os.path.splitext(file_path)[1]
-            
-            with open(output_path, 'w', encoding='utf-8') as file:
-                file.write(content)
-                
+            convert_file(file_path, mapping)
             return True
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Dosya dönüştürülürken hata oluştu:\n{str(e)}")
@@ -251,42 +301,99 @@ class ModernCharacterConverter(QMainWindow):
             QMessageBox.warning(self, "Uyarı", "Lütfen bir dosya veya klasör seçin!")
             return
 
-        mapping = self.get_mapping_dict()
-        if not mapping:
+        if not self.get_mapping_rows():
             QMessageBox.warning(self, "Uyarı", "Lütfen en az bir karakter eşleştirmesi ekleyin!")
             return
 
-        if self.is_folder:
-            txt_files = []
-            for root, _, files in os.walk(self.selected_path):
-                for file in files:
-                    if file.endswith('.txt'):
-                        txt_files.append(os.path.join(root, file))
-            
-            if not txt_files:
-                QMessageBox.warning(self, "Uyarı", "Seçili klasörde .txt dosyası bulunamadı!")
+        profile = self.get_profile()
+        if not profile:
+            return
+
+        try:
+            mapping = profile.table('decode' if self.reverse_checkbox.isChecked() else 'encode')
+        except MappingProfileError as e:
+            QMessageBox.warning(
+                self, "Uyarı",
+                f"Eşleştirme birebir olmadığı için ters yönde uygulanamaz:\n{str(e)}"
+            )
+            return
+        if self.reverse_checkbox.isChecked() and profile.reverse_warnings:
+            reply = QMessageBox.question(
+                self, "Uyarı",
+                "Ters yön özgün metni bozabilir:\n"
+                + "\n".join(issue.message for issue in profile.reverse_warnings[:10])
+                + "\n\nYine de devam edilsin mi?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
                 return
 
+        if self.is_folder:
             self.progress_bar.setVisible(True)
-            self.progress_bar.setMaximum(len(txt_files))
+            # Toplam, tarama sürdükçe total_changed ile güncellenir.
+            self.progress_bar.setMaximum(0)
             self.progress_bar.setValue(0)
+            self.convert_button.setEnabled(False)
+            self.cancel_button.setVisible(True)
 
-            success_count = 0
-            for idx, file_path in enumerate(txt_files):
-                if self.convert_file(file_path, mapping):
-                    success_count += 1
-                self.progress_bar.setValue(idx + 1)
-
-            self.progress_bar.setVisible(False)
-            QMessageBox.information(
-                self,
-                "Başarılı",
-                f"Toplam {len(txt_files)} dosyadan {success_count} tanesi başarıyla dönüştürüldü."
+            self.conversion_worker = FolderConversionWorker(
+                self.selected_path, mapping, self.worker_spin.value(),
+                include=parse_patterns(self.include_edit.text()) or DEFAULT_INCLUDE,
+                exclude=parse_patterns(self.exclude_edit.text())
             )
+            self.conversion_worker.total_changed.connect(self.progress_bar.setMaximum)
+            self.conversion_worker.progress.connect(self.progress_bar.setValue)
+            self.conversion_worker.finished.connect(self.folder_conversion_finished)
+            self.conversion_worker.start()
         else:
             if self.convert_file(self.selected_path, mapping):
                 QMessageBox.information(
                     self,
                     "Başarılı",
-                    f"Dosya dönüştürüldü ve kaydedildi:\n{os.path.splitext(self.selected_path)[0]}_converted{os.path.splitext(self.selected_path)[1]}"
-                )
\ No newline at end of file
+                    f"Dosya dönüştürüldü ve kaydedildi:\n{converted_path(self.selected_path)}"
+                )
+
+    def cancel_conversion(self):
+        if self.conversion_worker:
+            self.cancel_button.setEnabled(False)
+            self.conversion_worker.cancel()
+
+    def folder_conversion_finished(self, report):
+        # Sinyal run() dönmeden hemen önce gelir; nesne bırakılmadan önce
+        # iş parçacığının bitmesi beklenir.
+        self.conversion_worker.wait()
+        self.conversion_worker = None
+        self.progress_bar.setVisible(False)
+        self.convert_button.setEnabled(True)
+        self.cancel_button.setVisible(False)
+        self.cancel_button.setEnabled(True)
+
+        if not report['total'] and not report['errors'] and not report['cancelled']:
+            QMessageBox.warning(self, "Uyarı", "Seçili klasörde desenlerle eşleşen dosya bulunamadı!")
+            return
+
+        errors = report['errors']
+        summary = (
+            f"Toplam {report['total']} dosya: {report['converted']} dönüştürüldü, "
+            f"{report['skipped']} değişmediği için atlandı, "
+            f"{report['removed']} silinmiş kaynak temizlendi."
+        )
+        if report['cancelled']:
+            summary = "Dönüştürme iptal edildi.\n" + summary
+
+        if errors:
+            box = QMessageBox(self)
+            box.setIcon(QMessageBox.Warning)
+            box.setWindowTitle("Uyarı")
+            box.setText(f"{summary}\n{len(errors)} dosya dönüştürülemedi.")
+            box.setDetailedText("\n".join(f"{path}: {error}" for path, error in errors))
+            box.exec_()
+        else:
+            QMessageBox.information(self, "Başarılı", summary)
+
+    def closeEvent(self, event):
+        if self.conversion_worker:
+            self.conversion_worker.cancel()
+            self.conversion_worker.wait()
+        event.accept()
\ No newline at end of file
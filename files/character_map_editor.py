@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import (
     QTableWidgetItem, QHeaderView, QPushButton, QFileDialog, QMessageBox
 )
 import json
+from mapping_profile import MappingProfileError, compile_profile
 
 class CharacterMapEditor(QWidget):
     def __init__(self, parent=None):
@@ -62,14 +63,20 @@ class CharacterMapEditor(QWidget):
         for row in sorted(selected_rows, reverse=True):
             self.table.removeRow(row)
             
-    def get_mappings(self):
-        mappings = {}
+    def get_mapping_rows(self):
+        rows = []
         for row in range(self.table.rowCount()):
             source = self.table.item(row, 0)
             target = self.table.item(row, 1)
             if source and target and source.text() and target.text():
-                mappings[source.text()] = target.text()
-        return mappings
+                rows.append((source.text(), target.text()))
+        return rows
+
+    def get_mappings(self):
+        return dict(self.get_mapping_rows())
+
+    def get_profile(self):
+        return compile_profile(self.get_mapping_rows())
         
     def set_mappings(self, mappings):
         self.table.setRowCount(0)
@@ -84,6 +91,12 @@ class CharacterMapEditor(QWidget):
         if not mappings:
             QMessageBox.warning(self, "Uyarı", "Kaydedilecek eşleştirme bulunamadı!")
             return
+
+        try:
+            profile = self.get_profile()
+        except MappingProfileError as e:
+            QMessageBox.warning(self, "Uyarı", f"Eşleştirme tablosunda hata var:\n{str(e)}")
+            return
             
         file_name, _ = QFileDialog.getSaveFileName(
             self, "Eşleştirmeleri Kaydet", "", "JSON files (*.json)"
@@ -93,7 +106,12 @@ class CharacterMapEditor(QWidget):
             try:
                 with open(file_name, 'w', encoding='utf-8') as f:
                     json.dump(mappings, f, ensure_ascii=False, indent=4)
-                QMessageBox.information(self, "Başarılı", "Eşleştirmeler kaydedildi!")
+                message = "Eşleştirmeler kaydedildi!"
+                if profile.warnings:
+                    message += "\n\nUyarılar:\n" + "\n".join(
+                        issue.message for issue in profile.warnings
+                    )
+                QMessageBox.information(self, "Başarılı", message)
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Kaydetme hatası: {str(e)}")
             
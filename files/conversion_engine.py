@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import re
+from encoding_detection import detect_encoding
+
+# Yoğun (liste) translate tablosu için üst sınır; bunun üzerindeki kod
+# noktaları için sözlük tablosu kullanılır.
+DENSE_TABLE_LIMIT = 0x3000
+
+# Bu kadar satıra kadar (zincirsiz, tek karakterlik) tablolar art arda
+# str.replace ile uygulanır. Metinde sık geçen karakterlerle ölçüldüğünde
+# replace her satır için bir tarama yapar ve ~14 satırda translate'in tek
+# geçişine yetişir; 60 satırda yaklaşık 3,5 kat yavaştır.
+REPLACE_MAX_ROWS = 16
+
+# Akış modunda bir seferde okunan karakter sayısı.
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class CompiledMapping:
+    # Eşleştirme tablosunu tek geçişli dönüşüme derler.
+    # Tek kod noktalı anahtarlar bir str.translate tablosuna, çok karakterlik
+    # anahtarlar ise en uzun eşleşmeyi önce deneyen tek bir regex'e girer.
+    # Bir kuralın çıktısı hiçbir zaman başka bir kurala tekrar girmez, bu
+    # yüzden sonuç satır sırasından bağımsızdır.
+    # chained verilirse zincir denetimi (anahtar sayısının karesiyle büyür)
+    # atlanır; önbellekten yüklenen profiller kullanır.
+    def __init__(self, mapping, strategy=None, chained=None):
+        self.mapping = {orig: conv for orig, conv in mapping.items() if orig}
+        self.single = {}
+        self.multi = {}
+
+        for orig, conv in self.mapping.items():
+            if len(orig) == 1:
+                self.single[orig] = conv
+            else:
+                self.multi[orig] = conv
+
+        self.table = self._build_table(self.single)
+
+        if self.multi:
+            keys = sorted(self.multi, key=len, reverse=True)
+            self.pattern = re.compile(
+                '(' + '|'.join(re.escape(key) for key in keys) + ')'
+            )
+            self.max_key_length = len(keys[0])
+        else:
+            self.pattern = None
+            self.max_key_length = 1
+
+        self.fingerprint = mapping_fingerprint(self.mapping)
+        self.chained = self._has_chains() if chained is None else chained
+        if strategy is None:
+            # Zincir yoksa ve tüm anahtarlar tek karakterse, art arda
+            # str.replace çağrıları tek geçişle birebir aynı sonucu verir.
+            # Her çağrı metni baştan taradığından yalnızca az satırlı
+            # tablolarda translate'ten hızlıdır (bkz. REPLACE_MAX_ROWS).
+            strategy = 'replace' if not self.chained and not self.multi \
+                and len(self.single) <= REPLACE_MAX_ROWS else 'translate'
+        self.strategy = strategy
+
+    def to_data(self):
+        # JSON'a yazılabilen hâli; tablo ve regex from_data ile yeniden kurulur.
+        return {'mapping': self.mapping, 'strategy': self.strategy, 'chained': self.chained}
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(data['mapping'], data['strategy'], data['chained'])
+
+    @staticmethod
+    def _build_table(single):
+        if not single:
+            return {}
+        highest = max(ord(orig) for orig in single)
+        if highest >= DENSE_TABLE_LIMIT:
+            return {ord(orig): conv for orig, conv in single.items()}
+
+        table = list(range(highest + 1))
+        for orig, conv in single.items():
+            table[ord(orig)] = ord(conv) if len(conv) == 1 else conv
+        return table
+
+    def _has_chains(self):
+        keys = list(self.mapping)
+        for conv in self.mapping.values():
+            if any(key in conv for key in keys):
+                return True
+        for key in self.multi:
+            if any(other != key and other in key for other in keys):
+                return True
+        return False
+
+    def __bool__(self):
+        return bool(self.mapping)
+
+    def convert(self, text):
+        if self.strategy == 'replace':
+            for orig, conv in self.single.items():
+                text = text.replace(orig, conv)
+            return text
+
+        if self.pattern is None:
+            return text.translate(self.table)
+
+        # split, yakalanan anahtarları tek indekslere koyar; arada kalan
+        # düz metin parçaları translate tablosundan geçer.
+        parts = self.pattern.split(text)
+        parts[0::2] = [part.translate(self.table) for part in parts[0::2]]
+        parts[1::2] = map(self.multi.__getitem__, parts[1::2])
+        return ''.join(parts)
+
+    def convert_chunk(self, text, final=False):
+        # Akış modu için: dönüştürülen kısım ile bir sonraki parçanın başına
+        # eklenecek kalanı döndürür. Çok karakterlik bir anahtar parça
+        # sınırına denk gelebileceğinden, en uzun anahtarın tamamı
+        # görülmeden başlayan eşleşmeler bir sonraki parçaya bırakılır.
+        if final or self.pattern is None:
+            return self.convert(text), ''
+
+        cut = len(text) - (self.max_key_length - 1)
+        if cut <= 0:
+            return '', text
+
+        out = []
+        pos = 0
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            if start >= cut:
+                break
+            out.append(text[pos:start].translate(self.table))
+            out.append(self.multi[match.group()])
+            pos = match.end()
+
+        end = max(pos, cut)
+        out.append(text[pos:end].translate(self.table))
+        return ''.join(out), text[end:]
+
+    def convert_stream(self, source, target, chunk_size=STREAM_CHUNK_SIZE):
+        # Metin modunda açılmış dosyalar beklenir; parça sınırında bölünen
+        # UTF-8 dizilerini ve \r\n çiftlerini TextIOWrapper birleştirir.
+        remainder = ''
+        while True:
+            data = source.read(chunk_size)
+            final = not data
+            converted, remainder = self.convert_chunk(remainder + data, final)
+            if converted:
+                target.write(converted)
+            if final:
+                break
+
+
+def mapping_fingerprint(mapping):
+    data = json.dumps(sorted(mapping.items()), ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def file_digest(file_path, block_size=1024 * 1024):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compile_mapping(mapping, strategy=None):
+    if isinstance(mapping, CompiledMapping):
+        return mapping
+    return CompiledMapping(mapping, strategy)
+
+
+def converted_path(file_path):
+    base, ext = os.path.splitext(file_path)
+    return base + '_converted' + ext
+
+
+def convert_file(file_path, mapping, output_path=None, encoding=None,
+                 chunk_size=STREAM_CHUNK_SIZE):
+    # chunk_size=None dosyanın tamamını belleğe okur; aksi halde bellek
+    # kullanımı dosya boyutundan bağımsız kalır. encoding verilmezse
+    # algılanır; çıktı kaynakla aynı kodlamada yazılır ve BOM karakteri
+    # eşleştirmeden değişmeden geçtiği için korunur.
+    compiled = compile_mapping(mapping)
+    if encoding is None:
+        encoding = detect_encoding(file_path).codec
+    if output_path is None:
+        output_path = converted_path(file_path)
+
+    with open(file_path, 'r', encoding=encoding) as source, \
+            open(output_path, 'w', encoding=encoding) as target:
+        if chunk_size is None:
+            target.write(compiled.convert(source.read()))
+        else:
+            compiled.convert_stream(source, target, chunk_size)
+
+    return output_path
+
+
+# Süreç havuzu işçileri: derlenmiş tablo her işçiye başlatılırken bir kez
+# gönderilir, görevlerle birlikte yalnızca dosya yolu taşınır.
+_worker_mapping = None
+
+
+def init_worker(mapping):
+    global _worker_mapping
+    _worker_mapping = compile_mapping(mapping)
+
+
+def convert_in_worker(file_path, known_digest=None):
+    # known_digest verilirse (manifestte boyut/zaman uyuşmadığında) önce içerik
+    # özeti karşılaştırılır; içerik aynıysa dosya yeniden yazılmaz.
+    stat = os.stat(file_path)
+    digest = file_digest(file_path)
+    skipped = digest == known_digest and os.path.exists(converted_path(file_path))
+    if not skipped:
+        convert_file(file_path, _worker_mapping)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'digest': digest,
+        'skipped': skipped,
+    }
+
+
+def convert_to_in_worker(file_path, output_path, encoding=None):
+    convert_file(file_path, _worker_mapping, output_path, encoding)
+    return os.path.getsize(file_path)
@@ -0,0 +1,85 @@
+import json
+import os
+from conversion_engine import converted_path
+
+MANIFEST_NAME = '.conversion_manifest.json'
+MANIFEST_VERSION = 1
+
+
+class ConversionManifest:
+    # Klasör dönüştürmelerinde her kaynak dosya için boyut, değiştirilme
+    # zamanı, içerik özeti ve eşleştirme parmak izini tutar. Çıktı dosyaları
+    # kaynakların yanına yazıldığı için manifest de klasörün köküne yazılır.
+    def __init__(self, root):
+        self.root = root
+        self.path = os.path.join(root, MANIFEST_NAME)
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('files', {})
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'version': MANIFEST_VERSION, 'files': self.entries},
+                file, ensure_ascii=False, indent=1, sort_keys=True
+            )
+        os.replace(temp_path, self.path)
+
+    def key(self, file_path):
+        return os.path.relpath(file_path, self.root).replace(os.sep, '/')
+
+    def check(self, file_path, fingerprint):
+        # (atla, bilinen_özet) döndürür. Boyut ya da zaman değiştiyse ama
+        # eşleştirme aynıysa bilinen özet verilir; işçi önce özeti
+        # karşılaştırır.
+        entry = self.entries.get(self.key(file_path))
+        if not entry or entry.get('mapping') != fingerprint:
+            return False, None
+        if not os.path.exists(converted_path(file_path)):
+            return False, None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False, None
+        if stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns'):
+            return True, None
+        return False, entry.get('digest')
+
+    def record(self, file_path, fingerprint, result):
+        self.entries[self.key(file_path)] = {
+            'size': result['size'],
+            'mtime_ns': result['mtime_ns'],
+            'digest': result['digest'],
+            'mapping': fingerprint,
+        }
+
+    def forget(self, file_path):
+        self.entries.pop(self.key(file_path), None)
+
+    def remove_missing(self, file_paths):
+        # Kaynağı artık bulunmayan kayıtları ve onlardan üretilmiş
+        # *_converted dosyalarını siler; silinen kayıt sayısını döndürür.
+        present = {self.key(file_path) for file_path in file_paths}
+        removed = 0
+        for key in [key for key in self.entries if key not in present]:
+            source = os.path.join(self.root, *key.split('/'))
+            if os.path.exists(source):
+                continue
+            try:
+                os.remove(converted_path(source))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del self.entries[key]
+            removed += 1
+        return removed
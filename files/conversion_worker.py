@@ -0,0 +1,134 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import multiprocessing
+import os
+from conversion_engine import compile_mapping, convert_in_worker, init_worker
+from conversion_manifest import ConversionManifest
+from file_discovery import DEFAULT_INCLUDE, FileDiscovery
+
+
+def default_worker_count():
+    return os.cpu_count() or 1
+
+
+class FolderConversionWorker(QThread):
+    progress = pyqtSignal(int)
+    total_changed = pyqtSignal(int)
+    file_failed = pyqtSignal(str, str)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, root, mapping, workers=None, include=DEFAULT_INCLUDE, exclude=()):
+        super().__init__()
+        # Klasör manifesti kullanılır ve değişmeyen dosyalar yeniden
+        # dönüştürülmez.
+        self.root = root
+        self.mapping = compile_mapping(mapping)
+        self.workers = workers or default_worker_count()
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        report = {
+            'total': 0,
+            'converted': 0,
+            'skipped': 0,
+            'removed': 0,
+            'errors': [],
+            'cancelled': False,
+        }
+        fingerprint = self.mapping.fingerprint
+        manifest = ConversionManifest(self.root)
+
+        # Dosyalar tarama sürerken kuyruktan alınır; toplam sayı bulundukça
+        # total_changed ile bildirilir.
+        discovery = FileDiscovery(self.root, self.include, self.exclude).start()
+        found = []
+        done = 0
+        reported = (0, 0)
+
+        # Aynı anda kuyrukta bekleyen görev sayısı sınırlı tutulur; böylece
+        # iptal edildiğinde beklemede çok az iş kalır.
+        max_pending = self.workers * 4
+        pending = {}
+
+        # Linux'ta varsayılan fork, iş parçacıkları çalışan Qt sürecinin
+        # kopyasını (tutulan kilitler, pencere sistemi bağlantısı dahil)
+        # oluşturur; işçiler temiz bir yorumlayıcıyla başlatılır. İşçi işlevi
+        # ve derlenmiş eşleştirme pickle edilebilir.
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(self.mapping,)
+        )
+        try:
+            while True:
+                while len(pending) < max_pending and not self.isInterruptionRequested():
+                    # Süren dönüştürme varken tarayıcı beklenmez; yoksa yeni
+                    # bir yol için kısa süre beklenir.
+                    if pending:
+                        file_path = discovery.get_nowait()
+                    else:
+                        file_path = discovery.get(timeout=0.1)
+                    if file_path is None:
+                        break
+                    found.append(file_path)
+                    skip, known_digest = manifest.check(file_path, fingerprint)
+                    if skip:
+                        report['skipped'] += 1
+                        done += 1
+                    else:
+                        future = executor.submit(convert_in_worker, file_path, known_digest)
+                        pending[future] = file_path
+
+                if self.isInterruptionRequested():
+                    report['cancelled'] = True
+                    discovery.stop()
+                    for future in pending:
+                        future.cancel()
+                    pending = {
+                        future: path for future, path in pending.items()
+                        if not future.cancelled()
+                    }
+
+                if pending:
+                    completed, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        file_path = pending.pop(future)
+                        error = future.exception()
+                        if error is None:
+                            result = future.result()
+                            report['skipped' if result['skipped'] else 'converted'] += 1
+                            manifest.record(file_path, fingerprint, result)
+                        else:
+                            report['errors'].append((file_path, str(error)))
+                            manifest.forget(file_path)
+                            self.file_failed.emit(file_path, str(error))
+                        done += 1
+
+                if (len(found), done) != reported:
+                    if len(found) != reported[0]:
+                        self.total_changed.emit(len(found))
+                    self.progress.emit(done)
+                    reported = (len(found), done)
+
+                if not pending and (discovery.finished or report['cancelled']):
+                    break
+        finally:
+            discovery.stop()
+            executor.shutdown(wait=True, cancel_futures=True)
+            report['total'] = len(found)
+            report['errors'].extend(discovery.errors)
+            # Silinmiş kaynakların temizliği yalnızca tarama tamamlandıysa
+            # yapılır; yarım bir listeyle eksik dosyalar yanlış sayılırdı.
+            if discovery.finished:
+                report['removed'] = manifest.remove_missing(found)
+            try:
+                manifest.save()
+            except OSError as e:
+                report['errors'].append((manifest.path, str(e)))
+
+        self.finished.emit(report)
@@ -0,0 +1,230 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+from functools import partial
+
+from conversion_engine import converted_path, convert_to_in_worker, init_worker
+from file_discovery import DEFAULT_INCLUDE, is_output, iter_files
+from mapping_profile import MappingProfileError, load_profile
+
+# Qt'ye bağımlı olmayan toplu dönüştürücü. GUI ile aynı motoru kullanır:
+#   python convert_cli.py -m harita.json "veri/**/*.txt" -o cikti -j 8
+
+
+def collect_inputs(patterns, include, exclude=()):
+    # (kaynak, kök) çiftleri üretir; kök, çıktı klasöründe korunacak göreli
+    # yolun başlangıcıdır. Glob eşleşmelerinde de klasör taramasındaki gibi
+    # önceki *_converted çıktıları atlanır.
+    seen = set()
+    for pattern in patterns:
+        magic = glob.has_magic(pattern)
+        matches = glob.glob(pattern, recursive=True) if magic else [pattern]
+        for path in sorted(matches):
+            if os.path.isdir(path):
+                for file_path in iter_files(path, include, exclude):
+                    yield from _unique(file_path, path, seen)
+            elif os.path.isfile(path):
+                if magic and is_output(os.path.basename(path)):
+                    continue
+                yield from _unique(path, os.path.dirname(path), seen)
+            else:
+                raise FileNotFoundError(f"Girdi bulunamadı: {pattern}")
+
+
+def _unique(path, root, seen):
+    key = os.path.abspath(path)
+    if key not in seen:
+        seen.add(key)
+        yield path, root
+
+
+def output_path_for(path, root, output_dir):
+    if not output_dir:
+        return converted_path(path)
+    return os.path.join(output_dir, os.path.relpath(path, root))
+
+
+def run_serial(jobs, task):
+    for path, output_path in jobs:
+        try:
+            yield path, task(path, output_path), None
+        except Exception as e:
+            yield path, None, e
+
+
+def run_parallel(jobs, task, initializer, initarg, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=(initarg,)) as executor:
+        futures = [
+            (path, executor.submit(task, path, output_path))
+            for path, output_path in jobs
+        ]
+        for path, future in futures:
+            try:
+                yield path, future.result(), None
+            except Exception as e:
+                yield path, None, e
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Karakter eşleştirme tablosuyla toplu dosya dönüştürme'
+    )
+    parser.add_argument('inputs', nargs='+', help='dosya, klasör ya da glob desenleri')
+    parser.add_argument('-m', '--mapping', required=True,
+                        help='Karakter Eşleştirme Tablosu ile kaydedilmiş JSON dosyası')
+    parser.add_argument('-o', '--output-dir',
+                        help='çıktı klasörü (verilmezse *_converted dosyaları kaynağın yanına yazılır)')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('-e', '--encoding',
+                        help='kaynak dosyaların kodlaması (varsayılan: her dosya için algılanır; '
+                             'bayt tablosu modunda utf-8)')
+    parser.add_argument('--legacy-encoding',
+                        help='UTF-8/UTF-16 olmayan dosyalar için kod sayfası (varsayılan: cp1254)')
+    parser.add_argument('-t', '--target-encoding',
+                        help='tek baytlık hedef kodlama (cp1252, latin-1, ...); verilirse '
+                             'eşleştirme ve kodlama tek adımda yapılır. Bayt tablosu '
+                             '(bytes.translate, str oluşturmadan) yalnızca tek baytlık '
+                             'kaynaklarda (ör. -e cp1254) kullanılır; UTF-8 kaynak çözülür, '
+                             'eşleştirilir ve hedefe kodlanır')
+    parser.add_argument('--custom-table',
+                        help='karakter -> bayt JSON tablosu; hedef kodlamanın üzerine yazar')
+    parser.add_argument('--ext', action='append', default=None,
+                        help='klasörlerde aranacak uzantılar (varsayılan: .txt)')
+    parser.add_argument('--include', action='append', default=None,
+                        help='klasörlerde dönüştürülecek dosya deseni, ör. "*.csv" ya da "metin/*.txt"')
+    parser.add_argument('--exclude', action='append', default=[],
+                        help='klasörlerde atlanacak dosya ya da klasör deseni')
+    parser.add_argument('-d', '--direction', choices=('encode', 'decode'), default='encode',
+                        help='encode: tabloyu yazıldığı gibi uygular, decode: ters tabloyu')
+    parser.add_argument('--verify-roundtrip', action='store_true',
+                        help='dosyaları çözüp yeniden kodlar ve yalnızca farklı satırları yazar')
+    parser.add_argument('-q', '--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.legacy_encoding:
+        # İşçi süreçleri ortamı devralır.
+        os.environ['Y3_LEGACY_ENCODING'] = args.legacy_encoding
+
+    try:
+        profile = load_profile(args.mapping)
+        include = tuple(args.include or ()) + tuple(f'*{ext}' for ext in args.ext or ())
+        inputs = list(collect_inputs(args.inputs, include or DEFAULT_INCLUDE, args.exclude))
+    except MappingProfileError as e:
+        parser.exit(2, f"Eşleştirme tablosunda hata var:\n{e}\n")
+    except (OSError, ValueError) as e:
+        parser.exit(2, f"Hata: {e}\n")
+
+    if not profile.mapping:
+        parser.exit(2, "Hata: eşleştirme tablosu boş\n")
+    if not args.quiet:
+        for issue in profile.warnings:
+            print(f"Uyarı: {issue.message}", file=sys.stderr)
+
+    try:
+        mapping = profile.table('decode' if args.verify_roundtrip else args.direction)
+    except MappingProfileError as e:
+        parser.exit(2, f"Ters tablo kurulamadı, eşleştirme birebir değil:\n{e}\n")
+    if args.direction == 'decode' and not args.verify_roundtrip and not args.quiet:
+        for issue in profile.reverse_warnings:
+            print(f"Uyarı (ters yön): {issue.message}", file=sys.stderr)
+
+    if args.verify_roundtrip:
+        return verify_round_trip([path for path, _ in inputs], profile, args)
+
+    if args.target_encoding or args.custom_table:
+        from byte_conversion import (
+            ByteConverter, convert_bytes_in_worker, init_byte_worker, load_custom_table
+        )
+        try:
+            custom_table = load_custom_table(args.custom_table) if args.custom_table else None
+            converter = ByteConverter(
+                mapping, args.target_encoding or 'latin-1', args.encoding or 'utf-8', custom_table
+            )
+        except (OSError, LookupError, ValueError) as e:
+            parser.exit(2, f"Hata: {e}\n")
+        initializer, initarg, task = init_byte_worker, converter, convert_bytes_in_worker
+    else:
+        initializer, initarg = init_worker, mapping
+        task = partial(convert_to_in_worker, encoding=args.encoding)
+
+    jobs = []
+    for path, root in inputs:
+        output_path = output_path_for(path, root, args.output_dir)
+        # Çıktı kaynağın kendisiyse (ör. -o kaynak klasörü) kaynak okunmadan
+        # kesilirdi; hiçbir iş başlamadan reddedilir.
+        if os.path.realpath(output_path) == os.path.realpath(path):
+            parser.exit(2, f"Hata: çıktı kaynağın üzerine yazılırdı: {path}\n"
+                           "Başka bir çıktı klasörü seçin.\n")
+        jobs.append((path, output_path))
+    for _, output_path in jobs:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    start = time.perf_counter()
+    if args.workers > 1 and len(jobs) > 1:
+        results = run_parallel(jobs, task, initializer, initarg, args.workers)
+    else:
+        initializer(initarg)
+        results = run_serial(jobs, task)
+
+    converted = 0
+    total_bytes = 0
+    failed = 0
+    unencodable = Counter()
+    for path, result, error in results:
+        if error is None:
+            if isinstance(result, tuple):
+                result, missing = result
+                unencodable.update(missing)
+            converted += 1
+            total_bytes += result
+        else:
+            failed += 1
+            print(f"Hata: {path}: {error}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    if unencodable:
+        print(
+            "Hedef kodlamada karşılığı olmayan karakterler: " + ", ".join(
+                f"{char!r} x{count}" for char, count in unencodable.most_common()
+            ),
+            file=sys.stderr
+        )
+    if not args.quiet:
+        megabytes = total_bytes / (1024 * 1024)
+        rate = megabytes / elapsed if elapsed > 0 else 0.0
+        print(
+            f"{converted} dosya dönüştürüldü, {failed} hata | "
+            f"{megabytes:.1f} MB, {elapsed:.2f} s, {rate:.1f} MB/s, "
+            f"{converted / elapsed if elapsed > 0 else 0.0:.0f} dosya/s"
+        )
+    return 1 if failed else 0
+
+
+def verify_round_trip(file_paths, profile, args):
+    from round_trip import verify_files
+
+    start = time.perf_counter()
+    differences = 0
+    for difference in verify_files(file_paths, profile, args.encoding):
+        differences += 1
+        print(
+            f"{difference.path}:{difference.line}: "
+            f"{difference.original!r} != {difference.round_trip!r}"
+        )
+    if not args.quiet:
+        print(
+            f"{len(file_paths)} dosya doğrulandı, {differences} satır farklı, "
+            f"{time.perf_counter() - start:.2f} s",
+            file=sys.stderr
+        )
+    return 1 if differences else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
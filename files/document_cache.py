@@ -0,0 +1,89 @@
+import os
+from collections import OrderedDict, namedtuple
+
+# Önbelleğin varsayılan bellek bütçesi; Y3_DOCUMENT_CACHE_MB ile değiştirilebilir.
+DEFAULT_BUDGET_MB = 256
+
+# QTextDocument'ta satır (blok) başına tahmini ek yük: düzen, biçim
+# aralıkları ve blok verisi.
+BLOCK_OVERHEAD = 200
+
+# segments: yapılandırılmış (.json/.csv) dosyalarda SegmentStore, yoksa None.
+CachedDocument = namedtuple('CachedDocument',
+                            ['document', 'highlighter', 'encoding', 'line_index', 'segments'],
+                            defaults=(None,))
+
+
+def default_budget():
+    try:
+        megabytes = float(os.environ.get('Y3_DOCUMENT_CACHE_MB', DEFAULT_BUDGET_MB))
+    except ValueError:
+        megabytes = DEFAULT_BUDGET_MB
+    return int(megabytes * 1024 * 1024)
+
+
+def document_cost(document):
+    # QTextDocument metni UTF-16 olarak tutar.
+    return document.characterCount() * 2 + document.blockCount() * BLOCK_OVERHEAD
+
+
+class DocumentCache:
+    # Çözülmüş belgeler için LRU önbellek. Anahtar (yol, mtime_ns, boyut)
+    # üçlüsüdür; dosya diskte değiştiyse eski kayıt eşleşmez. Anahtar dosya
+    # yüklenirken alınır, böylece yükleme sırasında değişen dosya da
+    # önbellekten yanlış sunulmaz.
+    def __init__(self, budget=None, on_evict=None):
+        self.budget = default_budget() if budget is None else budget
+        self.on_evict = on_evict
+        self.entries = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.normcase(os.path.abspath(file_path)), stat.st_mtime_ns, stat.st_size
+
+    def take(self, key):
+        # Kaydı önbellekten çıkarıp döndürür; gösterilen belge önbellekte
+        # tutulmaz, başka bir dosyaya geçilince put ile geri konur.
+        entry = self.entries.pop(key, None) if key else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        value, cost = entry
+        self.used -= cost
+        return value
+
+    def put(self, key, value, cost):
+        if not key:
+            return False
+        # Aynı dosyanın eski sürümleri atılır.
+        for old_key in [old for old in self.entries if old[0] == key[0]]:
+            self._evict(old_key)
+        if cost > self.budget:
+            self._discard(value)
+            return False
+        self.entries[key] = (value, cost)
+        self.used += cost
+        while self.used > self.budget:
+            self._evict(next(iter(self.entries)))
+        return True
+
+    def _evict(self, key):
+        value, cost = self.entries.pop(key)
+        self.used -= cost
+        self._discard(value)
+
+    def _discard(self, value):
+        if self.on_evict is not None:
+            self.on_evict(value)
+
+    def clear(self):
+        for key in list(self.entries):
+            self._evict(key)
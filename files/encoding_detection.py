@@ -0,0 +1,105 @@
+import codecs
+import os
+from collections import namedtuple
+
+# Eski oyun sürümlerinin dosyaları için varsayılan tek baytlık kod sayfası;
+# Y3_LEGACY_ENCODING ortam değişkeniyle değiştirilebilir.
+DEFAULT_LEGACY_ENCODING = 'cp1254'
+
+# Baştan ve sondan okunan örnek boyutu.
+SAMPLE_SIZE = 8 * 1024
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# codec: BOM'suz çözücü adı. bom: dosya BOM ile başlıyorsa True; okurken
+# baştaki '\ufeff' atılır, yazarken aynı codec ile yeniden eklenir.
+DetectedEncoding = namedtuple('DetectedEncoding', ['codec', 'bom'])
+
+UTF8 = DetectedEncoding('utf-8', False)
+
+
+def legacy_encoding():
+    return os.environ.get('Y3_LEGACY_ENCODING') or DEFAULT_LEGACY_ENCODING
+
+
+def _utf16_order(sample):
+    # BOM'suz UTF-16: Latin metinde her karakterin bir baytı sıfırdır.
+    # Sıfırlar tek konumlarda toplanıyorsa LE, çift konumlardaysa BE.
+    if len(sample) < 4:
+        return None
+    even = sample[0::2].count(0)
+    odd = sample[1::2].count(0)
+    half = len(sample) // 2
+    if odd > half * 0.3 and even < half * 0.05:
+        return 'utf-16-le'
+    if even > half * 0.3 and odd < half * 0.05:
+        return 'utf-16-be'
+    return None
+
+
+def _is_utf8(head, tail):
+    # Örnekler çok baytlı bir dizinin ortasında kesilmiş olabilir: baştaki
+    # örneğin sonundaki yarım dizi artımlı çözücüde bekletilir, sondaki
+    # örneğin başındaki devam baytları atlanır.
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        skip = 0
+        while skip < min(3, len(tail)) and 0x80 <= tail[skip] <= 0xBF:
+            skip += 1
+        tail[skip:].decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_bytes(head, tail=b'', legacy=None):
+    for bom, codec in BOMS:
+        if head.startswith(bom):
+            return DetectedEncoding(codec, True)
+
+    order = _utf16_order(head)
+    if order:
+        return DetectedEncoding(order, False)
+    if _is_utf8(head, tail):
+        return UTF8
+    return DetectedEncoding(legacy or legacy_encoding(), False)
+
+
+def detect_encoding(file_path, legacy=None, sample_size=SAMPLE_SIZE):
+    # Yalnızca BOM'a ve dosyanın ilk/son sample_size baytına bakar; asıl
+    # okuma bundan sonra bir kez yapılır.
+    with open(file_path, 'rb') as file:
+        head = file.read(sample_size)
+        size = os.fstat(file.fileno()).st_size
+        tail = b''
+        if size > sample_size:
+            file.seek(max(sample_size, size - sample_size))
+            tail = file.read(sample_size)
+    return detect_bytes(head, tail, legacy)
+
+
+def fallback_encoding(encoding):
+    # Algılama yalnızca örneklere bakar; BOM'suz UTF-8 sanılan bir dosyanın
+    # ortasında geçersiz bayt çıkarsa dosya eski kod sayfasıyla bir kez
+    # yeniden okunur. Başka kodlamalar için yedek yoktur (None).
+    if encoding == UTF8:
+        return DetectedEncoding(legacy_encoding(), False)
+    return None
+
+
+def strip_bom(text, encoding):
+    if encoding.bom and text.startswith('\ufeff'):
+        return text[1:]
+    return text
+
+
+def add_bom(text, encoding):
+    return '\ufeff' + text if encoding.bom else text
+
+
+def describe(encoding):
+    return encoding.codec + (' (BOM)' if encoding.bom else '')
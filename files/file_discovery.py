@@ -0,0 +1,129 @@
+import fnmatch
+import os
+import queue
+import threading
+
+DEFAULT_INCLUDE = ('*.txt',)
+
+# Tarayıcının dönüştürmenin önüne geçebileceği en fazla dosya sayısı.
+QUEUE_SIZE = 256
+
+_DONE = object()
+
+
+def parse_patterns(text):
+    # "*.txt; *.csv" biçimindeki metni desen demetine çevirir.
+    return tuple(pattern.strip() for pattern in text.split(';') if pattern.strip())
+
+
+def matches(name, rel_path, patterns):
+    # "/" içeren desenler köke göre yolla, diğerleri yalnızca adla eşleşir.
+    for pattern in patterns:
+        if fnmatch.fnmatch(rel_path if '/' in pattern else name, pattern):
+            return True
+    return False
+
+
+def is_output(name):
+    # Önceki çalıştırmaların *_converted çıktıları yeniden dönüştürülmez.
+    return os.path.splitext(name)[0].endswith('_converted')
+
+
+def iter_files(root, include=DEFAULT_INCLUDE, exclude=(), stop=None, errors=None):
+    # os.scandir ile derinlik öncelikli tarama. os.walk'tan farkı, her
+    # klasörün dosyaları bulunur bulunmaz döndürülmesidir; hariç tutulan
+    # klasörlere hiç girilmez. Okunamayan klasörler errors listesine eklenir.
+    stack = ['']
+    while stack:
+        if stop is not None and stop.is_set():
+            return
+        rel_dir = stack.pop()
+        path = os.path.join(root, *rel_dir.split('/')) if rel_dir else root
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            if errors is not None:
+                errors.append((path, str(e)))
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+            if matches(entry.name, rel_path, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(rel_path)
+                elif entry.is_file() and not is_output(entry.name) \
+                        and matches(entry.name, rel_path, include):
+                    yield entry.path
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+class FileDiscovery:
+    # iter_files'ı ayrı bir iş parçacığında çalıştırıp bulunan yolları
+    # sınırlı bir kuyruğa koyar. Kuyruk doluysa tarama bekler, böylece ağ
+    # paylaşımlarında tarama sürerken ilk dosyalar dönüştürülmeye başlar.
+    def __init__(self, root, include=DEFAULT_INCLUDE, exclude=(), maxsize=QUEUE_SIZE):
+        self.root = root
+        self.include = tuple(include) or DEFAULT_INCLUDE
+        self.exclude = tuple(exclude)
+        self.errors = []
+        self.finished = False
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self):
+        self._thread.join()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            for file_path in iter_files(self.root, self.include, self.exclude,
+                                        self._stop, self.errors):
+                if not self._put(file_path):
+                    return
+        except Exception as e:
+            self.errors.append((self.root, str(e)))
+        finally:
+            self._put(_DONE)
+
+    def get(self, timeout=None):
+        # Bir sonraki yolu döndürür; süre dolarsa ya da tarama bittiyse None.
+        # timeout None ise yol gelene kadar bekler (queue.Queue.get gibi).
+        return self._take(True, timeout)
+
+    def get_nowait(self):
+        # Kuyrukta hazır yol yoksa beklemeden None döndürür.
+        return self._take(False, None)
+
+    def _take(self, block, timeout):
+        if self.finished:
+            return None
+        try:
+            item = self._queue.get(block, timeout)
+        except queue.Empty:
+            return None
+        if item is _DONE:
+            self.finished = True
+            return None
+        return item
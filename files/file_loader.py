@@ -1,33 +1,219 @@
 from PyQt5.QtCore import QThread, pyqtSignal
+import codecs
+import io
+import os
+import time
+from encoding_detection import detect_encoding, fallback_encoding, strip_bom
+from line_index import LineIndex
+from paged_document import PagedDocument
+from structured_document import load_segments
+
+# Bir seferde okunan bayt sayısı.
+READ_BLOCK_SIZE = 1024 * 1024
+
+# progress sinyalleri arasındaki en kısa süre (ms); sinyal ayrıca yalnızca
+# tam yüzde değiştiğinde gönderilir.
+PROGRESS_INTERVAL_MS = 50
+
+# Aşamalı modda ilk okunan blok küçük tutulur ki ilk ekran hemen gelsin;
+# sonraki metin en fazla BATCH_INTERVAL_MS aralıklarla toplu gönderilir.
+FIRST_BLOCK_SIZE = 64 * 1024
+BATCH_INTERVAL_MS = 100
+
+# Bu boyutun üzerindeki dosyalar aşamalı modda açılır.
+PROGRESSIVE_THRESHOLD = 1024 * 1024
+
+def decode_blocks(file, encoding, block_size=READ_BLOCK_SIZE, first_block_size=None):
+    # Dosya ikili modda büyük bloklarla okunur; bölünen çok baytlı dizileri
+    # artımlı çözücü, \r\n ve \r satır sonlarını da metin modundaki gibi
+    # IncrementalNewlineDecoder birleştirir. (metin, okunan bayt) çiftleri
+    # üretilir; son çiftin bayt sayısı 0'dır ve çözücüde kalanı taşır.
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding.codec)(), translate=True
+    )
+    size = first_block_size or block_size
+    bom_pending = encoding.bom
+    while True:
+        data = file.read(size)
+        size = block_size
+        text = decoder.decode(data, final=not data)
+        if bom_pending and text:
+            text = strip_bom(text, encoding)
+            bom_pending = False
+        yield text, len(data)
+        if not data:
+            return
+
+
+def read_text(file_path, encoding=None, stop=None, block_size=READ_BLOCK_SIZE):
+    # Sinyalsiz tam okuma (önceden yükleme için). (metin, kodlama, satır
+    # dizini) döndürür; stop() True dönerse okuma bırakılır ve None döner.
+    # UTF-8 sanılan dosya çözülemezse eski kod sayfasıyla yeniden okunur.
+    if encoding is None:
+        encoding = detect_encoding(file_path)
+    try:
+        return _read_text(file_path, encoding, stop, block_size)
+    except UnicodeDecodeError:
+        fallback = fallback_encoding(encoding)
+        if fallback is None:
+            raise
+        return _read_text(file_path, fallback, stop, block_size)
+
+
+def _read_text(file_path, encoding, stop, block_size):
+    content = []
+    line_index = LineIndex()
+    with open(file_path, "rb") as file:
+        for text, _ in decode_blocks(file, encoding, block_size):
+            if stop is not None and stop():
+                return None
+            line_index.add(text)
+            content.append(text)
+    return "".join(content), encoding, line_index
+
 
 class FileLoader(QThread):
     progress = pyqtSignal(int)
+    # Aşamalı modda çözülen metin parça parça gelir.
+    text_loaded = pyqtSignal(str)
+    # Aşamalı modda başarıyla biterse boş metin taşır.
     finished = pyqtSignal(str)
-    
-    def __init__(self, file_path):
+    failed = pyqtSignal(str)
+    # UTF-8 sanılan dosya çözülemedi; encoding eski kod sayfasına çevrildi ve
+    # okuma baştan başlıyor. Aşamalı modda o ana kadar gelen metin atılmalıdır.
+    restarted = pyqtSignal()
+
+    def __init__(self, file_path, block_size=READ_BLOCK_SIZE,
+                 progress_interval_ms=PROGRESS_INTERVAL_MS, progressive=False,
+                 encoding=None):
         super().__init__()
         self.file_path = file_path
-        
+        # Verilmezse okumadan önce algılanır; kaydederken de kullanılır.
+        self.encoding = encoding
+        self.block_size = block_size
+        self.progress_interval = progress_interval_ms / 1000
+        self.progressive = progressive
+        # Okuma sırasında kurulan satır dizini; finished'ten sonra kullanılır.
+        self.line_index = None
+
     def run(self):
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                content = []
-                file.seek(0, 2)
-                file_size = file.tell()
-                file.seek(0)
-                
-                chunk_size = 8192
-                bytes_read = 0
-                
-                while True:
-                    data = file.read(chunk_size)
-                    if not data:
-                        break
-                    content.append(data)
-                    bytes_read += len(data.encode('utf-8'))
-                    progress = int((bytes_read / file_size) * 100)
-                    self.progress.emit(progress)
-                
+            if self.encoding is None:
+                self.encoding = detect_encoding(self.file_path)
+            try:
+                self._read()
+            except UnicodeDecodeError:
+                fallback = fallback_encoding(self.encoding)
+                if fallback is None:
+                    raise
+                self.encoding = fallback
+                self.restarted.emit()
+                self._read()
+        except Exception as e:
+            self.failed.emit(f"Hata: {str(e)}")
+
+    def _read(self):
+        # İlerleme gerçek bayt konumundan hesaplanır.
+        with open(self.file_path, "rb") as file:
+            file_size = os.fstat(file.fileno()).st_size
+            content = []
+            line_index = LineIndex()
+            bytes_read = 0
+            last_percent = -1
+            last_emit = 0.0
+            last_batch = None
+            first_block_size = FIRST_BLOCK_SIZE if self.progressive else None
+
+            for text, size in decode_blocks(file, self.encoding, self.block_size,
+                                            first_block_size):
+                if self.isInterruptionRequested():
+                    return
+                line_index.add(text)
+                content.append(text)
+                if not size:
+                    break
+                bytes_read += size
+
+                now = time.monotonic()
+                if self.progressive and (
+                        last_batch is None or now - last_batch >= BATCH_INTERVAL_MS / 1000):
+                    self.text_loaded.emit("".join(content))
+                    content = []
+                    last_batch = now
+
+                percent = bytes_read * 100 // file_size if file_size else 100
+                if percent != last_percent and now - last_emit >= self.progress_interval:
+                    self.progress.emit(percent)
+                    last_percent = percent
+                    last_emit = now
+
+            self.line_index = line_index
+            if last_percent != 100:
+                self.progress.emit(100)
+            if self.progressive:
+                if any(content):
+                    self.text_loaded.emit("".join(content))
+                self.finished.emit("")
+            else:
                 self.finished.emit("".join(content))
+
+
+class PagedFileLoader(QThread):
+    # Büyük dosya modu: dosyanın içeriği okunmaz, yalnızca sayfa dizini
+    # kurulur. finished bir PagedDocument taşır.
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, encoding=None):
+        super().__init__()
+        self.file_path = file_path
+        self.encoding = encoding
+
+    def run(self):
+        try:
+            document = PagedDocument(self.file_path, self.encoding)
+            if document.build_index(self.progress.emit, self.isInterruptionRequested):
+                self.finished.emit(document)
+            else:
+                document.close()
+        except Exception as e:
+            self.failed.emit(f"Hata: {str(e)}")
+
+
+class StructuredFileLoader(QThread):
+    # .json ve .csv dosyaları ham metin olarak değil, segment olarak okunur.
+    # finished bir SegmentStore taşır; dosya ayrıştırılamazsa failed gelir.
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, encoding=None, progress_interval_ms=PROGRESS_INTERVAL_MS):
+        super().__init__()
+        self.file_path = file_path
+        self.encoding = encoding
+        self.progress_interval = progress_interval_ms / 1000
+        self.file_size = 0
+        self._last_percent = -1
+        self._last_emit = 0.0
+
+    def _report(self, bytes_read):
+        percent = bytes_read * 100 // self.file_size if self.file_size else 100
+        now = time.monotonic()
+        if percent != self._last_percent and now - self._last_emit >= self.progress_interval:
+            self.progress.emit(percent)
+            self._last_percent = percent
+            self._last_emit = now
+
+    def run(self):
+        try:
+            self.file_size = os.path.getsize(self.file_path)
+            store = load_segments(self.file_path, self.encoding, self._report,
+                                  self.isInterruptionRequested)
+        except InterruptedError:
+            return
         except Exception as e:
-            self.finished.emit(f"Hata: {str(e)}")
\ No newline at end of file
+            self.failed.emit(f"Hata: {str(e)}")
+            return
+        self.progress.emit(100)
+        self.finished.emit(store)
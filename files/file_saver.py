@@ -0,0 +1,267 @@
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+import os
+import shutil
+import time
+from encoding_detection import add_bom
+
+# Bu boyuttan küçük dosyalar her zaman baştan yazılır.
+INCREMENTAL_SAVE_THRESHOLD = 4 * 1024 * 1024
+
+# Bir seferde okunan/yazılan bayt ve karakter sayısı.
+WRITE_BLOCK_SIZE = 1024 * 1024
+
+
+class IncrementalSaveError(Exception):
+    # Eski dosya satır satır eşlenemiyor; belge baştan yazılmalıdır.
+    pass
+
+
+class LineChanges(QObject):
+    # Belgenin hangi satırlarının diskteki dosyadan (son yükleme ya da
+    # kaydetmeden bu yana) değiştiğini izler. Belge, sırayla "eski" ve
+    # "yeni" satır dizilerinden oluşur: (eski_başlangıç, sayı) dosyadaki
+    # ardışık satırlara karşılık gelir, (None, sayı) ise değişmiş ya da
+    # eklenmiş satırlardır. Kaydederken yalnızca yeni satırların metni
+    # alınır; eski diziler dosyadan bayt olarak kopyalanır.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.document = None
+        self.runs = []
+        self.block_count = 0
+        self.revision = 0
+
+    def attach(self, document, line_count=None):
+        # Belge diskteki dosyayla aynıyken çağrılır. line_count verilirse
+        # (dosyadaki \n sayısı + 1) blok sayısıyla eşleşmelidir; U+2029 gibi
+        # blok ayıran karakterler varsa izleme kapalı kalır.
+        self.detach()
+        if line_count is not None and line_count != document.blockCount():
+            return
+        self.document = document
+        self.block_count = document.blockCount()
+        self.revision = document.revision()
+        self.runs = [(0, self.block_count)]
+        document.contentsChange.connect(self._changed)
+
+    def detach(self):
+        if self.document is not None:
+            self.document.contentsChange.disconnect(self._changed)
+        self.document = None
+        self.runs = []
+
+    def _changed(self, position, removed, added):
+        document = self.document
+        if document.revision() == self.revision:
+            # Yalnızca biçim değişti.
+            return
+        self.revision = document.revision()
+        count = document.blockCount()
+        first = document.findBlock(position).blockNumber()
+        end = min(position + added, document.characterCount() - 1)
+        current = document.findBlock(end).blockNumber() - first + 1
+        old = current - (count - self.block_count)
+        self.block_count = count
+        self._replace(first, old, current)
+
+    def _replace(self, first, removed, added):
+        # Geçerli satır numaralarıyla [first, first + removed) yerine added
+        # kadar yeni satır gelir.
+        last = first + removed
+        runs = []
+        pos = 0
+        inserted = False
+        for start, count in self.runs:
+            end = pos + count
+            if pos < first:
+                runs.append((start, min(end, first) - pos))
+            if not inserted and end >= first:
+                runs.append((None, added))
+                inserted = True
+            if end > last:
+                tail = max(pos, last)
+                runs.append((None if start is None else start + tail - pos, end - tail))
+            pos = end
+        if not inserted:
+            runs.append((None, added))
+
+        merged = []
+        for start, count in runs:
+            if not count:
+                continue
+            if merged and start is None and merged[-1][0] is None:
+                merged[-1] = (None, merged[-1][1] + count)
+            else:
+                merged.append((start, count))
+        self.runs = merged
+
+    def changed_lines(self):
+        return sum(count for start, count in self.runs if start is None)
+
+    def pieces(self):
+        # Kaydetme için anlık görüntü: eski diziler olduğu gibi, yeni
+        # diziler satır metinleriyle.
+        pieces = []
+        block = self.document.firstBlock()
+        for start, count in self.runs:
+            if start is None:
+                lines = []
+                for _ in range(count):
+                    lines.append(block.text())
+                    block = block.next()
+                pieces.append((None, lines))
+            else:
+                pieces.append((start, count))
+                block = self.document.findBlockByNumber(block.blockNumber() + count)
+        return pieces
+
+
+def write_text(file, text, encoding, progress=None):
+    # Tüm metni os.linesep satır sonlarıyla (metin modundaki gibi) yazar.
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    text = add_bom(text, encoding)
+    for start in range(0, len(text), WRITE_BLOCK_SIZE):
+        file.write(text[start:start + WRITE_BLOCK_SIZE].encode(encoding.codec))
+        if progress is not None:
+            progress(start * 100 // len(text))
+    return 0
+
+
+class _LineReader:
+    # Eski dosyayı sırayla satır satır kopyalar ya da atlar. Satırlar
+    # bayt düzeyinde \n ile ayrılır; tek başına \r (IncrementalNewlineDecoder
+    # onu da satır sonu sayar) görülürse satır numaraları tutmaz.
+    def __init__(self, file):
+        self.file = file
+        self.buffer = b''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.file.read(WRITE_BLOCK_SIZE)
+        if data.endswith(b'\r'):
+            data += self.file.read(1)
+        if not data:
+            self.eof = True
+        elif data.count(b'\r') != data.count(b'\r\n'):
+            raise IncrementalSaveError("Dosyada tek başına \\r satır sonu var")
+        self.buffer = data
+
+    def newline(self):
+        # Yeni satırlar için dosyanın ilk satır sonu kullanılır.
+        if not self.buffer:
+            self._fill()
+        index = self.buffer.find(b'\n')
+        return '\r\n' if index > 0 and self.buffer[index - 1:index] == b'\r' else '\n'
+
+    def take(self, count, target=None):
+        # count satır ilerler; target verilirse satırlar ona yazılır. Son
+        # satırın satır sonu olmayabilir. Yazılan son baytı döndürür.
+        last = b''
+        while count > 0:
+            if not self.buffer:
+                self._fill()
+                if self.eof:
+                    break
+            newlines = self.buffer.count(b'\n')
+            if newlines < count:
+                data, self.buffer = self.buffer, b''
+                count -= newlines
+            else:
+                rest = self.buffer.split(b'\n', count)[-1]
+                cut = len(self.buffer) - len(rest)
+                data, self.buffer = self.buffer[:cut], rest
+                count = 0
+            self.position += len(data)
+            if target is not None and data:
+                target.write(data)
+                last = data[-1:]
+        return last
+
+
+def write_changed_lines(file, source_path, pieces, encoding, progress=None):
+    # Değişmeyen satırlar eski dosyadan bayt olarak kopyalanır, yalnızca
+    # değişen satırlar kodlanır. Kodlama ASCII uyumlu olmalıdır (\n tek bayt).
+    # Değişen satır sayısını döndürür.
+    codec = encoding.codec
+    size = os.path.getsize(source_path)
+    changed = 0
+    with open(source_path, 'rb') as source:
+        reader = _LineReader(source)
+        newline = reader.newline()
+        line = 0
+        for index, (start, value) in enumerate(pieces):
+            final = index == len(pieces) - 1
+            if start is None:
+                text = newline.join(value) + ('' if final else newline)
+                if index == 0:
+                    text = add_bom(text, encoding)
+                file.write(text.encode(codec))
+                changed += len(value)
+            else:
+                reader.take(start - line)
+                last = reader.take(value, file)
+                line = start + value
+                if not final and last != b'\n':
+                    # Eski dosyanın son satırıydı; ardından satır geliyor.
+                    file.write(newline.encode(codec))
+            if progress is not None and size:
+                progress(min(99, reader.position * 100 // size))
+    return changed
+
+
+def write_atomically(file_path, write, progress=None):
+    # write(dosya, progress) hedefin yanındaki geçici dosyaya yazar; dosya
+    # diske işlendikten sonra os.replace ile yerine taşınır, yarıda kalan
+    # yazma asıl dosyayı bozmaz. (write'ın sonucu, yazılan bayt) döndürür.
+    temp_path = file_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            result = write(file, progress=progress)
+            file.flush()
+            os.fsync(file.fileno())
+            bytes_written = file.tell()
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return result, bytes_written
+
+
+class FileSaver(QThread):
+    # Kaydetme işini (bkz. write_atomically) arayüz iş parçacığı dışında
+    # yürütür. finished, write'ın sonucunu taşır.
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, write):
+        super().__init__()
+        self.file_path = file_path
+        self.write = write
+        self.bytes_written = 0
+        self.elapsed = 0.0
+        self._last_percent = -1
+        # Satır eşleme başarısız olduysa belge baştan yazılmalıdır.
+        self.retry_full = False
+
+    def _report(self, percent):
+        if percent != self._last_percent:
+            self.progress.emit(percent)
+            self._last_percent = percent
+
+    def run(self):
+        started = time.monotonic()
+        try:
+            result, self.bytes_written = write_atomically(
+                self.file_path, self.write, progress=self._report)
+        except Exception as e:
+            self.retry_full = isinstance(e, IncrementalSaveError)
+            self.failed.emit(f"Hata: {str(e)}")
+            return
+        self.elapsed = time.monotonic() - started
+        self.progress.emit(100)
+        self.finished.emit(result)
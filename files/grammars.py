@@ -0,0 +1,110 @@
+import os
+import re
+from collections import namedtuple
+
+# Renklendirme dilbilgileri. Bir dilbilgisi kurallardan oluşur; kuralların
+# hepsi tek bir regex'te birleştirilir ve her blok tek geçişte taranır.
+# Belirteçler iç içe geçmez: en soldaki eşleşme kazanır; aynı konumda
+# başlayan kurallardan listede önce gelen seçilir.
+#
+# Token tek satırlık bir belirteçtir. Span başlangıç, gövde ve bitiş
+# desenlerinden oluşur; multiline ise satır sonuna kadar kapanmayan span
+# sonraki bloğa durum (setCurrentBlockState) olarak taşınır. Durum 0 normal
+# metindir, açık kalan her span türünün kendi durumu vardır.
+#
+# first, kuralın ilk karakterlerini tanımlayan karakter sınıfı içeriğidir;
+# hiçbir kuralın başlayamayacağı konumlar tek bir denetimle atlanır.
+Token = namedtuple('Token', ['name', 'pattern', 'first'])
+Span = namedtuple('Span', ['name', 'begin', 'body', 'end', 'first', 'multiline'],
+                  defaults=(True,))
+
+
+class Grammar:
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = rules
+        # Grup adı -> (biçim adı, açık kalırsa durum, bitiş grubu).
+        self._groups = {}
+        # Durum -> (biçim adı, satır başından span'ı sürdüren desen).
+        self._resume = {}
+        parts = []
+        for index, rule in enumerate(rules):
+            group = f'r{index}'
+            if isinstance(rule, Span) and rule.multiline:
+                state = len(self._resume) + 1
+                end_group = f'e{index}'
+                parts.append(f'(?P<{group}>{rule.begin}{rule.body}(?P<{end_group}>{rule.end})?)')
+                self._groups[group] = (rule.name, state, end_group)
+                self._resume[state] = (rule.name, re.compile(rule.body + rule.end))
+            elif isinstance(rule, Span):
+                parts.append(f'(?P<{group}>{rule.begin}{rule.body}{rule.end})')
+                self._groups[group] = (rule.name, 0, None)
+            else:
+                parts.append(f'(?P<{group}>{rule.pattern})')
+                self._groups[group] = (rule.name, 0, None)
+        first = ''.join(rule.first for rule in rules)
+        self.pattern = re.compile(f'(?=[{first}])(?:' + '|'.join(parts) + ')')
+
+    def scan(self, text, state=0):
+        # ((başlangıç, uzunluk, biçim adı), ...) ve bloğun bitiş durumu.
+        spans = []
+        position = 0
+        if state:
+            name, resume = self._resume[state]
+            match = resume.match(text)
+            if match is None:
+                return ((0, len(text), name),) if text else (), state
+            position = match.end()
+            spans.append((0, position, name))
+        for match in self.pattern.finditer(text, position):
+            start, end = match.span()
+            name, open_state, end_group = self._groups[match.lastgroup]
+            spans.append((start, end - start, name))
+            if open_state and match.group(end_group) is None:
+                return tuple(spans), open_state
+        return tuple(spans), 0
+
+
+TEXT_GRAMMAR = Grammar('text', (
+    Span('tag', r'\[', r'[^\]]*', r'\]', r'\['),  # Köşeli parantez içindekiler
+    Span('string', '"', '[^"]*', '"', '"'),  # Tırnak içindeki metinler
+    Token('key', r'[A-Z][A-Za-z]*:', 'A-Z'),  # Büyük harfle başlayan kelimeler
+))
+
+# Tırnaklı alanlar satır sonu içerebilir; alan içindeki "" kaçış dizisidir.
+CSV_GRAMMAR = Grammar('csv', (
+    Span('string', '"', '(?:[^"]|"")*', '"(?!")', '"'),
+    Token('tag', r'\[[^\]]*\]', r'\['),
+))
+
+# JSON dizgileri satır sonu içeremez.
+JSON_GRAMMAR = Grammar('json', (
+    Token('key', r'"(?:[^"\\]|\\.)*"(?=\s*:)', '"'),
+    Span('string', '"', r'(?:[^"\\]|\\.)*', '"', '"', multiline=False),
+    Token('literal', r'(?<![\w.])(?:-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null)\b',
+          r'\-0-9tfn'),
+))
+
+GRAMMARS = {}
+EXTENSION_GRAMMARS = {}
+
+
+def register_grammar(grammar, extensions=()):
+    GRAMMARS[grammar.name] = grammar
+    for extension in extensions:
+        EXTENSION_GRAMMARS[extension.lower()] = grammar
+
+
+register_grammar(TEXT_GRAMMAR, ('.txt',))
+register_grammar(CSV_GRAMMAR, ('.csv',))
+register_grammar(JSON_GRAMMAR, ('.json',))
+
+
+def grammar_for(file_path, structured=False):
+    # Yapılandırılmış görünümde (.json/.csv segmentleri) düzenleyicide
+    # yalnızca çevrilebilir metinler bulunur; bunlar düz metin gibi
+    # renklendirilir.
+    if structured or not file_path:
+        return TEXT_GRAMMAR
+    extension = os.path.splitext(file_path)[1].lower()
+    return EXTENSION_GRAMMARS.get(extension, TEXT_GRAMMAR)
@@ -0,0 +1,255 @@
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QTextLayout
+import os
+import time
+
+# Bu boyuttan (karakter) küçük belgeler QSyntaxHighlighter ile bir seferde
+# renklendirilir.
+LAZY_HIGHLIGHT_THRESHOLD = 1024 * 1024
+
+# Görünmeyen blokların durumlarının boşta hesaplandığı en büyük belge (MB,
+# karakter olarak); Y3_HIGHLIGHT_LIMIT_MB ile değiştirilebilir. Daha büyük
+# belgelerde yalnızca görünen bloklar ele alınır; çok satırlı bir yapının
+# içine atlanırsa önceki bloklar bilinmediğinden normal metin varsayılır.
+DEFAULT_HIGHLIGHT_LIMIT_MB = 32
+
+# Görünen alanın üstünde ve altında hemen renklendirilen blok sayısı.
+VIEWPORT_MARGIN_BLOCKS = 50
+
+# Olay döngüsünün bir turunda boşta renklendirmeye ayrılan süre.
+IDLE_SLICE_MS = 8
+
+# Toplu değişiklikten (ör. aşamalı yüklemede eklenen dilim) bu kadar süre
+# sonra boşta renklendirme yeniden başlar; yükleme sürerken araya girmez.
+IDLE_DELAY_MS = 200
+
+# Bir düzenlemede bundan fazla blok değiştiyse (ör. aşamalı yükleme)
+# bloklar hemen değil, görünür olunca ya da boşta renklendirilir.
+EDIT_HIGHLIGHT_BLOCKS = 100
+
+# Ele alınmış bloğun userState değeri: (başlangıç durumu << STATE_BITS) |
+# bitiş durumu, biçimleri blok düzenine yazıldıysa | FORMATTED. Hiç ele
+# alınmamış blokların değeri -1'dir.
+STATE_BITS = 15
+STATE_MASK = (1 << STATE_BITS) - 1
+FORMATTED = 1 << (2 * STATE_BITS)
+
+
+def highlight_limit():
+    try:
+        megabytes = float(os.environ.get('Y3_HIGHLIGHT_LIMIT_MB', DEFAULT_HIGHLIGHT_LIMIT_MB))
+    except ValueError:
+        megabytes = DEFAULT_HIGHLIGHT_LIMIT_MB
+    return int(megabytes * 1024 * 1024)
+
+
+class LazyHighlighting(QObject):
+    # Büyük belgelerde renklendirici belgeye bağlanmaz: QSyntaxHighlighter
+    # belgeyi baştan sona renklendirmeden ilk çizim yapılamaz. Onun yerine
+    # görünen bloklar (ve bir pay) çizilmeden hemen önce renklendirilir.
+    # Biçimler QSyntaxHighlighter'ın yaptığı gibi blok düzenine yazılır;
+    # belge içeriği, geri alma geçmişi ve değişiklik durumu etkilenmez.
+    #
+    # Bloklar sırasız ele alındığından her blok hangi durumdan başladığını da
+    # saklar (bkz. STATE_BITS). Önceki bloğun bitiş durumu bununla uyuşmayan
+    # blok eskimiştir. Olay döngüsü boşken bloklar sırayla taranır ve eskimiş
+    # blokların yalnızca durumu hesaplanır; biçimler görünür olunca yazılır.
+    # Görünmeyen bloklara biçim yazmak her dilimde düzenin güncellenmesine
+    # ve görünen alanın yeniden çizilmesine yol açardı.
+    #
+    # Görünen alanda belirteçleri henüz hazır olmayan bloklar -1 kalır ve
+    # sonuçlar gelince renklendirilir; boşta tarama zaten kısa dilimlerle
+    # çalıştığından belirteçleri kendisi çözer (yine paylaşılan önbellek
+    # üzerinden).
+    def __init__(self, text_edit):
+        super().__init__(text_edit)
+        self.text_edit = text_edit
+        self.document = None
+        self.highlighter = None
+        # Boşta tarama bu bloktan devam eder.
+        self.next_block = 0
+        # Önbellek anahtarı -> belirteçleri beklenen (blok, blok sürümü,
+        # başlangıç durumu) üçlüleri.
+        self.waiting = {}
+        # Biçimi değişen ama düzene henüz bildirilmemiş aralık (bkz. _flush).
+        self.dirty = None
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(0)
+        self.idle_timer.timeout.connect(self.highlight_idle)
+        self.quiet_timer = QTimer(self)
+        self.quiet_timer.setSingleShot(True)
+        self.quiet_timer.setInterval(IDLE_DELAY_MS)
+        self.quiet_timer.timeout.connect(self._schedule_idle)
+        # Kaydırma ve yeniden çizim isteklerinde görünen alan, çizimden önce
+        # renklendirilir.
+        text_edit.updateRequest.connect(self.highlight_viewport)
+
+    def attach(self, document, highlighter):
+        self.detach()
+        self.document = document
+        self.highlighter = highlighter
+        self.next_block = 0
+        document.contentsChange.connect(self._changed)
+        if highlighter.tokenizer is not None:
+            highlighter.tokenizer.ready.connect(self._tokens_ready)
+        self.highlight_viewport()
+        self._schedule_idle()
+
+    def detach(self):
+        if self.document is not None:
+            self._flush()
+            self.document.contentsChange.disconnect(self._changed)
+            if self.highlighter.tokenizer is not None:
+                self.highlighter.tokenizer.ready.disconnect(self._tokens_ready)
+        self.document = None
+        self.highlighter = None
+        self.waiting = {}
+        self.dirty = None
+        self.idle_timer.stop()
+        self.quiet_timer.stop()
+
+    def _schedule_idle(self):
+        if self.quiet_timer.isActive():
+            return
+        if (self.document.characterCount() <= highlight_limit()
+                and self.next_block < self.document.blockCount()):
+            if not self.idle_timer.isActive():
+                self.idle_timer.start()
+        else:
+            self.idle_timer.stop()
+
+    def _incoming(self, block):
+        previous = block.previous()
+        state = previous.userState() if previous.isValid() else -1
+        return state & STATE_MASK if state >= 0 else 0
+
+    def _stale(self, block):
+        state = block.userState()
+        return state < 0 or (state >> STATE_BITS) & STATE_MASK != self._incoming(block)
+
+    def highlight_block(self, block, inline=False, formatted=True):
+        # formatted False ise yalnızca bloğun durumu hesaplanır.
+        incoming = self._incoming(block)
+        text = block.text()
+        result = self.highlighter.scan(text, incoming, inline)
+        if result is None:
+            block.setUserState(-1)
+            key = self.highlighter.tokenizer.key(self.highlighter.grammar, incoming, text)
+            self.waiting.setdefault(key, []).append((block, block.revision(), incoming))
+            return
+        spans, end_state = result
+        state = incoming << STATE_BITS | end_state
+        if formatted:
+            self._apply(block, self.highlighter.format_spans(spans))
+            state |= FORMATTED
+        block.setUserState(state)
+        self._check_following(block, end_state)
+
+    def _apply(self, block, tokens):
+        ranges = []
+        for start, length, format in tokens:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = format
+            ranges.append(format_range)
+        layout = block.layout()
+        if ranges or layout.formats():
+            layout.setFormats(ranges)
+            start = block.position()
+            end = start + block.length()
+            if self.dirty is not None:
+                start = min(start, self.dirty[0])
+                end = max(end, self.dirty[1])
+            self.dirty = (start, end)
+
+    def _check_following(self, block, end_state):
+        following = block.next()
+        if (following.isValid() and following.userState() >= 0
+                and (following.userState() >> STATE_BITS) & STATE_MASK != end_state):
+            # Sonraki blok eskidi; görünen alan ve boşta tarama onu (ve
+            # durumu değişen ardıllarını) yeniden ele alır.
+            self.next_block = min(self.next_block, following.blockNumber())
+            self._schedule_idle()
+
+    def _flush(self):
+        # setFormats değişikliği belgeye kaydeder ama düzene iletmez; iletilmeyen
+        # aralık bir sonraki düzenlemenin contentsChange aralığına katılır.
+        # Her geçişin sonunda tek bir markContentsDirty ile iletilir.
+        if self.dirty is not None:
+            start, end = self.dirty
+            self.dirty = None
+            end = min(end, self.document.characterCount())
+            self.document.markContentsDirty(start, end - start)
+
+    def highlight_viewport(self, *args):
+        if self.document is None or self.text_edit.document() is not self.document:
+            return
+        line_height = max(1, self.text_edit.fontMetrics().lineSpacing())
+        visible = self.text_edit.viewport().height() // line_height + 1
+        first = self.text_edit.firstVisibleBlock().blockNumber()
+        block = self.document.findBlockByNumber(max(0, first - VIEWPORT_MARGIN_BLOCKS))
+        for _ in range(visible + 2 * VIEWPORT_MARGIN_BLOCKS):
+            if not block.isValid():
+                break
+            if self._stale(block) or not block.userState() & FORMATTED:
+                self.highlight_block(block)
+            block = block.next()
+        self._flush()
+
+    def highlight_idle(self):
+        deadline = time.perf_counter() + IDLE_SLICE_MS / 1000
+        block = self.document.findBlockByNumber(self.next_block)
+        changed = False
+        while block.isValid() and time.perf_counter() < deadline:
+            if self._stale(block):
+                self.highlight_block(block, inline=True, formatted=False)
+                changed = True
+            block = block.next()
+        if block.isValid():
+            self.next_block = block.blockNumber()
+        else:
+            self.next_block = self.document.blockCount()
+            self.idle_timer.stop()
+        if changed:
+            # Durumu düzelen bloklar görünüyor olabilir.
+            self.highlight_viewport()
+
+    def _tokens_ready(self, results):
+        for key in results.keys() & self.waiting.keys():
+            spans, end_state = results[key]
+            tokens = self.highlighter.format_spans(spans)
+            for block, revision, incoming in self.waiting.pop(key):
+                # Blok bu arada silinmiş, değişmiş ya da önceki bloğun
+                # durumu değişmiş olabilir; o zaman yeniden istenir.
+                if (block.isValid() and block.document() is self.document
+                        and block.revision() == revision and block.userState() < 0
+                        and self._incoming(block) == incoming):
+                    self._apply(block, tokens)
+                    block.setUserState(incoming << STATE_BITS | end_state | FORMATTED)
+                    self._check_following(block, end_state)
+        self._flush()
+
+    def _changed(self, position, removed, added):
+        document = self.document
+        first = document.findBlock(position)
+        last = document.findBlock(min(position + added, document.characterCount() - 1))
+        count = last.blockNumber() - first.blockNumber() + 1
+        if count <= EDIT_HIGHLIGHT_BLOCKS:
+            block = first
+            for _ in range(count):
+                self.highlight_block(block)
+                block = block.next()
+        else:
+            # Aradaki bloklar yenidir (userState -1); uçlardaki bloklar eski
+            # biçimleriyle kalmış olabilir.
+            first.setUserState(-1)
+            last.setUserState(-1)
+            self.idle_timer.stop()
+            self.quiet_timer.start()
+        # Görünen alan (durumu değişen ardıllar dahil) bir sonraki çizimden
+        # önce renklendirilmelidir. contentsChange içinde yapılan biçim
+        # değişiklikleri bu düzenlemeyle birlikte düzene iletilir.
+        self.highlight_viewport()
+        self.next_block = min(self.next_block, first.blockNumber())
+        self._schedule_idle()
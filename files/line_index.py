@@ -0,0 +1,47 @@
+import bisect
+import re
+from array import array
+
+_NEWLINE = re.compile('\n')
+_ASTRAL = re.compile('[\U00010000-\U0010ffff]')
+_MATCH_START = re.Match.start
+
+
+class LineIndex:
+    # Metnin satır sonu konumlarını array('Q') olarak tutar. Metin parça
+    # parça eklenir (FileLoader okurken), hiçbir zaman satırlara bölünmüş
+    # olarak saklanmaz. Konumlar QTextDocument/QTextCursor ile aynı birimdedir
+    # (UTF-16 kod birimi), böylece setPosition'a doğrudan verilebilir.
+    def __init__(self):
+        self.newlines = array('Q')
+        self.length = 0
+
+    def add(self, text):
+        # Satır sonları metin bölünmeden, finditer ile doğrudan diziye yazılır.
+        # Temel düzlem dışı karakterler UTF-16'da iki birimdir; yalnızca böyle
+        # karakter içeren parçalarda her satır sonunun konumu, önündeki bu
+        # karakterlerin sayısı kadar kaydırılır.
+        offsets = map(_MATCH_START, _NEWLINE.finditer(text))
+        astral = None if text.isascii() else [
+            match.start() for match in _ASTRAL.finditer(text)]
+        if astral:
+            offsets = [offset + bisect.bisect_left(astral, offset) for offset in offsets]
+        self.newlines.extend(map(self.length.__add__, offsets))
+        self.length += len(text) + (len(astral) if astral else 0)
+
+    @property
+    def line_count(self):
+        if not self.length:
+            return 0
+        ends_with_newline = self.newlines and self.newlines[-1] == self.length - 1
+        return len(self.newlines) + (0 if ends_with_newline else 1)
+
+    def line_start(self, line):
+        # 0 tabanlı satırın başlangıç konumu.
+        if line <= 0:
+            return 0
+        return self.newlines[min(line, len(self.newlines)) - 1] + 1
+
+    def line_of(self, position):
+        # Konumun bulunduğu 0 tabanlı satır.
+        return bisect.bisect_left(self.newlines, position)
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QColor
 from PyQt5.QtCore import Qt
@@ -23,6 +24,7 @@ def setup_dark_theme(app):
     app.setPalette(dark_palette)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication([])
     setup_dark_theme(app)
     tool = TranslationTool()
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict, namedtuple
+from conversion_engine import CompiledMapping
+
+# Derlenmiş profil biçimi değiştiğinde artırılır; eski önbellek dosyaları
+# böylece yok sayılır.
+PROFILE_FORMAT = 5
+MEMORY_CACHE_SIZE = 16
+
+ProfileIssue = namedtuple('ProfileIssue', ['kind', 'message', 'keys'])
+
+# Hata türleri derlemeyi durdurur; diğerleri uyarıdır.
+ERROR_KINDS = ('duplicate', 'cycle', 'empty')
+
+
+class MappingProfileError(ValueError):
+    def __init__(self, issues):
+        self.issues = issues
+        super().__init__("\n".join(issue.message for issue in issues))
+
+
+class CompiledProfile:
+    # Bir kez doğrulanıp derlenmiş eşleştirme profili: translate tablosu ve
+    # çok karakterlik anahtar otomatı CompiledMapping içinde tutulur. Aynı
+    # profil iki yönde kullanılabilir: "encode" satırları yazıldığı gibi,
+    # "decode" ters tablo ile uygular. Ters tablo yalnızca eşleştirme
+    # birebirse kurulur; değilse nedenleri inverse_issues içindedir.
+    #
+    # Birebir olmak ters yönün doğru olması için yetmez: karşılık kodlama
+    # sırasında kendisi de değiştirilmiyorsa (ör. 'Ğ' -> 'G' varken 'G'
+    # için kural yoksa) özgün metindeki aynı karakterler de ters yönde
+    # çevrilir. Bunlar reverse_warnings'te uyarı olarak listelenir.
+    def __init__(self, pairs, warnings=(), key=None):
+        self.pairs = list(pairs)
+        self.key = key or profile_key(self.pairs)
+        self.mapping = CompiledMapping(dict(self.pairs))
+        self.fingerprint = self.mapping.fingerprint
+        self.warnings = list(warnings)
+
+        sources = {}
+        for orig, conv in self.pairs:
+            if orig not in sources.get(conv, ()):
+                sources.setdefault(conv, []).append(orig)
+        self.inverse_issues = [
+            ProfileIssue(
+                'not_bijective',
+                f"{conv!r} birden fazla karakterin karşılığı: "
+                + ", ".join(repr(orig) for orig in origs),
+                tuple(origs)
+            )
+            for conv, origs in sources.items() if len(origs) > 1
+        ]
+        if self.inverse_issues:
+            self.inverse = None
+        else:
+            self.inverse = CompiledMapping({conv: origs[0] for conv, origs in sources.items()})
+
+        mapping = self.mapping.mapping
+        self.reverse_warnings = [
+            ProfileIssue(
+                'shared_target',
+                f"{conv!r} özgün metinde de bulunabilir; ters yönde her {conv!r} "
+                + " / ".join(repr(orig) for orig in origs) + " olur",
+                tuple(origs)
+            )
+            for conv, origs in sources.items()
+            if conv and conv not in origs and mapping.get(conv, conv) == conv
+        ]
+
+    def to_data(self):
+        return {
+            'key': self.key,
+            'pairs': self.pairs,
+            'warnings': self.warnings,
+            'mapping': self.mapping.to_data(),
+            'inverse': None if self.inverse is None else self.inverse.to_data(),
+            'inverse_issues': self.inverse_issues,
+            'reverse_warnings': self.reverse_warnings,
+        }
+
+    @classmethod
+    def from_data(cls, data):
+        # Önbellekteki veri doğrulanmış sayılmaz: satırlar anahtarla, tablo
+        # satırlarla eşleşmelidir. Uymayan veride ValueError yükselir.
+        pairs = [(orig, conv) for orig, conv in data['pairs']]
+        inverse = data['inverse']
+        if profile_key(pairs) != data['key'] or data['mapping']['mapping'] != dict(pairs) \
+                or inverse is not None and inverse['mapping'] != {
+                    conv: orig for orig, conv in reversed(pairs)}:
+            raise ValueError("Önbellekteki profil satırlarıyla eşleşmiyor")
+        profile = cls.__new__(cls)
+        profile.pairs = pairs
+        profile.key = data['key']
+        profile.mapping = CompiledMapping.from_data(data['mapping'])
+        profile.fingerprint = profile.mapping.fingerprint
+        profile.warnings = [_issue(issue) for issue in data['warnings']]
+        profile.inverse_issues = [_issue(issue) for issue in data['inverse_issues']]
+        profile.reverse_warnings = [_issue(issue) for issue in data['reverse_warnings']]
+        profile.inverse = None if inverse is None else CompiledMapping.from_data(inverse)
+        return profile
+
+    def table(self, direction='encode'):
+        if direction == 'encode':
+            return self.mapping
+        if direction != 'decode':
+            raise ValueError(f"Bilinmeyen yön: {direction}")
+        if self.inverse is None:
+            raise MappingProfileError(self.inverse_issues)
+        return self.inverse
+
+
+def _issue(data):
+    kind, message, keys = data
+    return ProfileIssue(kind, message, tuple(keys))
+
+
+def profile_key(pairs):
+    # Önbellek anahtarı: satırların kendisi (sıra ve yinelemeler dahil).
+    # fingerprint ise yalnızca sonuç tablosuna bağlıdır.
+    data = json.dumps([list(pair) for pair in pairs], ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _check_pairs(pairs):
+    issues = []
+    seen = {}
+    for orig, conv in pairs:
+        if not orig:
+            issues.append(ProfileIssue('empty', f"Boş anahtar: -> {conv!r}", (orig,)))
+            continue
+        if orig in seen:
+            if seen[orig] == conv:
+                issues.append(ProfileIssue(
+                    'repeat', f"{orig!r} -> {conv!r} satırı birden fazla kez var", (orig,)
+                ))
+            else:
+                issues.append(ProfileIssue(
+                    'duplicate',
+                    f"Yinelenen anahtar {orig!r}: {seen[orig]!r} ve {conv!r}",
+                    (orig,)
+                ))
+            continue
+        seen[orig] = conv
+
+    keys = list(seen)
+
+    # Bir kuralın çıktısı başka bir kuralın anahtarını içeriyorsa zincir
+    # vardır; tek geçişli motor zinciri izlemez ama eski sıralı motor izlerdi.
+    edges = {key: [other for other in keys if other in seen[key]] for key in keys}
+    for key, targets in edges.items():
+        for other in targets:
+            if other != key:
+                issues.append(ProfileIssue(
+                    'chain',
+                    f"{key!r} -> {seen[key]!r} çıktısı {other!r} kuralını içeriyor",
+                    (key, other)
+                ))
+
+    for cycle in _find_cycles(edges):
+        issues.append(ProfileIssue(
+            'cycle',
+            "Döngüsel eşleştirme: " + " -> ".join(repr(key) for key in cycle + [cycle[0]]),
+            tuple(cycle)
+        ))
+
+    # Çakışan önekler: bir anahtar diğerinin içinde geçiyorsa en uzun
+    # eşleşme kazanır, kısa kural o konumda uygulanmaz.
+    for key in keys:
+        for other in keys:
+            if other != key and len(other) < len(key) and other in key:
+                issues.append(ProfileIssue(
+                    'overlap',
+                    f"{other!r} anahtarı {key!r} anahtarının içinde geçiyor",
+                    (key, other)
+                ))
+    return issues
+
+
+def _find_cycles(edges):
+    cycles = []
+    state = {}
+    stack = []
+
+    def visit(key):
+        state[key] = 1
+        stack.append(key)
+        for other in edges[key]:
+            if other == key:
+                # Kendine eşleme (ör. 'a' -> 'a') zararsızdır; yalnızca
+                # çıktının anahtarı tekrar içermesi döngü sayılır.
+                continue
+            if state.get(other) == 1:
+                cycles.append(stack[stack.index(other):])
+            elif other not in state:
+                visit(other)
+        stack.pop()
+        state[key] = 2
+
+    for key in edges:
+        if key not in state:
+            visit(key)
+    return cycles
+
+
+def read_profile_pairs(file_path):
+    # CharacterMapEditor.save_mappings biçimindeki JSON'u, yinelenen
+    # anahtarları kaybetmeden satır çiftleri olarak okur.
+    with open(file_path, 'r', encoding='utf-8') as file:
+        pairs = json.load(file, object_pairs_hook=list)
+    if not isinstance(pairs, list) or not all(
+            isinstance(orig, str) and isinstance(conv, str) for orig, conv in pairs):
+        raise ValueError(f"Geçersiz eşleştirme dosyası: {file_path}")
+    return pairs
+
+
+def cache_dir():
+    base = os.environ.get('Y3_CACHE_DIR')
+    if not base:
+        if os.name == 'nt':
+            base = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'y3')
+        else:
+            base = os.path.join(
+                os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'y3'
+            )
+    return base
+
+
+def profile_cache_dir():
+    return os.path.join(cache_dir(), 'profiles')
+
+
+def _cache_path(key):
+    # Derlenmiş profil veri olarak (JSON) saklanır; önbellek dizini başka
+    # biri tarafından yazılabilse bile okurken kod çalıştırılmaz.
+    return os.path.join(profile_cache_dir(), f'{key}.v{PROFILE_FORMAT}.json')
+
+
+_memory_cache = OrderedDict()
+
+
+def _remember(profile):
+    _memory_cache[profile.key] = profile
+    _memory_cache.move_to_end(profile.key)
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+    return profile
+
+
+def load_cached_profile(key):
+    profile = _memory_cache.get(key)
+    if profile is not None:
+        _memory_cache.move_to_end(key)
+        return profile
+    try:
+        with open(_cache_path(key), 'r', encoding='utf-8') as file:
+            profile = CompiledProfile.from_data(json.load(file))
+    except (OSError, ValueError, KeyError, TypeError, re.error):
+        return None
+    if profile.key != key:
+        return None
+    return _remember(profile)
+
+
+def _store(profile):
+    path = _cache_path(profile.key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(profile.to_data(), file, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError:
+        # Önbellek yazılamazsa profil yine de bellekte kullanılabilir.
+        pass
+
+
+def compile_profile(pairs):
+    # pairs: (orijinal, dönüştürülecek) çiftleri ya da sözlük. Aynı satırlar
+    # daha önce doğrulanıp derlendiyse önbellekteki sonuç döner; hata
+    # türündeki sorunlarda MappingProfileError yükseltilir.
+    if isinstance(pairs, dict):
+        pairs = list(pairs.items())
+    pairs = [(orig, conv) for orig, conv in pairs if orig or conv]
+
+    key = profile_key(pairs)
+    profile = load_cached_profile(key)
+    if profile is not None:
+        return profile
+
+    issues = _check_pairs(pairs)
+    errors = [issue for issue in issues if issue.kind in ERROR_KINDS]
+    if errors:
+        raise MappingProfileError(errors)
+
+    profile = CompiledProfile(pairs, issues, key)
+    _store(profile)
+    return _remember(profile)
+
+
+def load_profile(file_path):
+    return compile_profile(read_profile_pairs(file_path))
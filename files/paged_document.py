@@ -0,0 +1,175 @@
+import bisect
+import codecs
+import mmap
+import re
+from array import array
+from collections import OrderedDict
+from encoding_detection import detect_encoding
+
+# Bu boyutun üzerindeki dosyalar büyük dosya modunda açılır.
+LARGE_FILE_THRESHOLD = 64 * 1024 * 1024
+
+# Bir sayfadaki satır sayısı ve bellekte tutulan çözülmüş sayfa sayısı.
+PAGE_LINES = 1000
+PAGE_CACHE_SIZE = 8
+
+# Bir sayfanın en fazla bayt sayısı. Uzun satırlı dosyalarda (ör. tek
+# satırlık JSON dökümleri) sayfa PAGE_LINES satırdan önce, gerekirse satırın
+# ortasında kesilir; çalışma kümesi satır uzunluğundan bağımsız kalır.
+PAGE_BYTES = 1024 * 1024
+
+
+class PagedDocument:
+    # Dosyayı belleğe eşler (mmap) ve her sayfanın (PAGE_LINES satır ya da
+    # en fazla PAGE_BYTES bayt) başlangıç bayt konumunu ve öncesindeki satır
+    # sonu sayısını tutar. Birden çok sayfaya yayılan satırlarda sonraki
+    # sayfalar satırın ortasından başlar (bkz. continues). Metin yalnızca
+    # istenen sayfalar için çözülür; bellek kullanımı sayfa önbelleği ve
+    # dizinle sınırlı kalır, dosya boyutuna bağlı değildir.
+    # Satır sonları bayt düzeyinde aranır; bu yüzden yalnızca ASCII uyumlu
+    # kodlamalar (UTF-8 ve tek baytlık kod sayfaları) desteklenir.
+    def __init__(self, file_path, encoding=None, page_lines=PAGE_LINES, page_bytes=PAGE_BYTES):
+        self.file_path = file_path
+        self.encoding = encoding or detect_encoding(file_path)
+        if not supports_encoding(self.encoding):
+            raise ValueError(f"Büyük dosya modu bu kodlamayı desteklemiyor: {self.encoding.codec}")
+        self.page_lines = page_lines
+        self.page_bytes = page_bytes
+        self._file = open(file_path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Boş dosyalar eşlenemez.
+            self._data = b''
+        self.size = len(self._data)
+        # BOM metne dahil edilmez.
+        self.start = 3 if self.encoding.bom and self._data[:3] == b'\xef\xbb\xbf' else 0
+        self.page_offsets = [self.start]
+        # Sayfa başlangıcından önceki satır sonu sayısı: sayfanın ilk
+        # bloğunun satır numarası.
+        self.page_first_lines = array('Q', [0])
+        self.line_count = 0
+        self._pages = OrderedDict()
+
+    def build_index(self, progress=None, stop=None):
+        # Her sayfanın sonu, PAGE_BYTES ile sınırlı aralıkta tek bir regex
+        # eşleşmesiyle bulunur; satır satır Python döngüsü yoktur. Eşleşme
+        # yoksa sayfa aralıktaki son satır sonunda, o da yoksa bir karakter
+        # sınırında kesilir. progress(yüzde) isteğe bağlıdır.
+        page = re.compile(rb'(?:[^\n]*\n){%d}' % self.page_lines)
+        data = self._data
+        offsets = [self.start]
+        first_lines = array('Q', [0])
+        lines = 0
+        pos = self.start
+        last_percent = -1
+        while self.size - pos > self.page_bytes:
+            if stop is not None and stop():
+                return False
+            limit = pos + self.page_bytes
+            match = page.match(data, pos, limit)
+            if match:
+                end = match.end()
+                lines += self.page_lines
+            else:
+                end = data.rfind(b'\n', pos, limit + 1) + 1
+                if end <= pos:
+                    end = self._char_boundary(pos, limit)
+                lines += data[pos:end].count(b'\n')
+            pos = end
+            offsets.append(pos)
+            first_lines.append(lines)
+            if progress is not None:
+                percent = pos * 100 // self.size
+                if percent != last_percent:
+                    progress(percent)
+                    last_percent = percent
+
+        self.page_offsets = offsets
+        self.page_first_lines = first_lines
+        total = lines + data[pos:self.size].count(b'\n')
+        ends_with_newline = self.size > self.start and data[self.size - 1:self.size] == b'\n'
+        self.line_count = total + (1 if self.size > self.start and not ends_with_newline else 0)
+        self._pages.clear()
+        if progress is not None:
+            progress(100)
+        return True
+
+    def _char_boundary(self, pos, end):
+        # Çok baytlı karakterin ortasında kesmemek için çözücüde bekleyen
+        # (tamamlanmamış) baytlar kadar geri gidilir.
+        decoder = codecs.getincrementaldecoder(self.encoding.codec)(errors='replace')
+        decoder.decode(self._data[max(pos, end - 16):end], final=False)
+        pending = decoder.getstate()[0]
+        return end - len(pending) if end - len(pending) > pos else end
+
+    def continues(self, page):
+        # Sayfa önceki sayfadaki satırın devamıyla mı başlıyor?
+        start = self.page_offsets[page]
+        return page > 0 and self._data[start - 1:start] != b'\n'
+
+    def page_of_line(self, line):
+        # Satırın başladığı sayfa.
+        page = bisect.bisect_left(self.page_first_lines, line)
+        if page == len(self.page_first_lines) or self.page_first_lines[page] > line \
+                or self.continues(page):
+            page -= 1
+        return max(0, page)
+
+    def page_of_offset(self, offset):
+        return max(0, bisect.bisect_right(self.page_offsets, offset) - 1)
+
+    def line_of_offset(self, offset):
+        page = self.page_of_offset(offset)
+        start = self.page_offsets[page]
+        return self.page_first_lines[page] + self._data[start:offset].count(b'\n')
+
+    def text_length(self, start, end):
+        # [start, end) bayt aralığının düzenleyicideki uzunluğu (UTF-16 kod
+        # birimi, \r\n tek karakter).
+        text = self._data[start:end].decode(self.encoding.codec, errors='replace')
+        return len(text.replace('\r\n', '\n').encode('utf-16-le')) // 2
+
+    @property
+    def page_count(self):
+        return len(self.page_offsets)
+
+    def page_span(self, page):
+        start = self.page_offsets[page]
+        end = self.page_offsets[page + 1] if page + 1 < len(self.page_offsets) else self.size
+        return start, end
+
+    def page_text(self, page):
+        text = self._pages.get(page)
+        if text is not None:
+            self._pages.move_to_end(page)
+            return text
+        start, end = self.page_span(page)
+        text = self._data[start:end].decode(self.encoding.codec, errors='replace')
+        text = text.replace('\r\n', '\n')
+        self._pages[page] = text
+        while len(self._pages) > PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)
+        return text
+
+    def lines(self, first_page, last_page):
+        # [first_page, last_page] aralığındaki sayfaları tek metin olarak
+        # döndürür; sondaki satır sonu atılır.
+        last_page = min(last_page, self.page_count - 1)
+        text = ''.join(self.page_text(page) for page in range(first_page, last_page + 1))
+        return text[:-1] if text.endswith('\n') else text
+
+    def find(self, text, start_offset=0):
+        # Bayt düzeyinde arar; bulunan konumun bayt ofsetini ya da -1 döndürür.
+        needle = text.encode(self.encoding.codec)
+        return self._data.find(needle, start_offset)
+
+    def close(self):
+        self._pages.clear()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+def supports_encoding(encoding):
+    return '\n'.encode(encoding.codec) == b'\n'
@@ -0,0 +1,111 @@
+from PyQt5.QtCore import QObject, Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QPlainTextEdit
+
+# Düzenleyicide aynı anda tutulan sayfa sayısı: görünen sayfa ve iki komşusu.
+WINDOW_PAGES = 3
+
+
+class PagedView(QObject):
+    # Bir PagedDocument'ı QPlainTextEdit'e sayfa penceresi olarak bağlar.
+    # Düzenleyici yalnızca görünen sayfayı ve komşularını içerir; dış kaydırma
+    # çubuğu tüm dosyanın satırlarını temsil eder. Düzenleyicinin kendi
+    # kaydırması (tekerlek, klavye) dış çubuğa aktarılır, pencerenin kenarına
+    # gelindiğinde pencere kaydırılır.
+    def __init__(self, text_edit, scrollbar):
+        super().__init__(text_edit)
+        self.text_edit = text_edit
+        self.scrollbar = scrollbar
+        self.document = None
+        self.first_page = 0
+        self.last_page = -1
+        self._updating = False
+        self.scrollbar.hide()
+        self.scrollbar.valueChanged.connect(self._scrolled)
+        self.text_edit.verticalScrollBar().valueChanged.connect(self._inner_scrolled)
+
+    def attach(self, document):
+        self.document = document
+        self.first_page = 0
+        self.last_page = -1
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.scrollbar.blockSignals(True)
+        self.scrollbar.setRange(0, max(0, document.line_count - 1))
+        self.scrollbar.setValue(0)
+        self.scrollbar.blockSignals(False)
+        self.scrollbar.show()
+        self._scrolled(0)
+
+    def detach(self):
+        self.document = None
+        self.scrollbar.hide()
+        self.text_edit.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.text_edit.clear()
+
+    @property
+    def window_start_line(self):
+        # Pencere bir satırın ortasından başlayabilir; ilk blok o satırdır.
+        return self.document.page_first_lines[self.first_page]
+
+    def _show_window(self, page):
+        half = WINDOW_PAGES // 2
+        first = max(0, page - half)
+        last = min(self.document.page_count - 1, first + WINDOW_PAGES - 1)
+        if (first, last) == (self.first_page, self.last_page):
+            return
+        self._updating = True
+        try:
+            self.text_edit.setPlainText(self.document.lines(first, last))
+        finally:
+            self._updating = False
+        self.first_page, self.last_page = first, last
+
+    def _scrolled(self, line):
+        if self.document is None:
+            return
+        self._show_window(self.document.page_of_line(line))
+        self._updating = True
+        try:
+            self.text_edit.verticalScrollBar().setValue(line - self.window_start_line)
+        finally:
+            self._updating = False
+
+    def _inner_scrolled(self, value):
+        if self._updating or self.document is None:
+            return
+        self.scrollbar.setValue(self.window_start_line + value)
+
+    def go_to(self, line, column=0, length=0):
+        # Satırı görünür yapar ve imleci (isteğe bağlı seçimle) oraya taşır.
+        if self.document is None:
+            return
+        self.scrollbar.setValue(line)
+        self._scrolled(line)
+        block = self.text_edit.document().findBlockByNumber(line - self.window_start_line)
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, column)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, length)
+        self.text_edit.setTextCursor(cursor)
+
+    def go_to_offset(self, offset, length=0):
+        # Bayt ofsetindeki metni seçer. Sayfalara yayılan uzun satırlarda
+        # satırın başı değil, ofsetin bulunduğu sayfa gösterilir.
+        if self.document is None:
+            return
+        self._show_window(self.document.page_of_offset(offset))
+        self.scrollbar.blockSignals(True)
+        self.scrollbar.setValue(self.document.line_of_offset(offset))
+        self.scrollbar.blockSignals(False)
+        window_start = self.document.page_offsets[self.first_page]
+        position = self.document.text_length(window_start, offset)
+        cursor = self.text_edit.textCursor()
+        cursor.setPosition(position)
+        cursor.setPosition(position + length, QTextCursor.KeepAnchor)
+        self._updating = True
+        try:
+            self.text_edit.setTextCursor(cursor)
+            self.text_edit.ensureCursorVisible()
+        finally:
+            self._updating = False
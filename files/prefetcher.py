@@ -0,0 +1,107 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+import os
+import sys
+import threading
+from collections import deque, namedtuple
+from document_cache import DocumentCache
+from file_loader import read_text
+
+# Seçili dosyanın her iki yanında önceden yüklenen dosya sayısı;
+# Y3_PREFETCH_COUNT ile değiştirilebilir.
+DEFAULT_PREFETCH_COUNT = 2
+
+# Önceden yüklenen metinlerin bellek bütçesi; Y3_PREFETCH_CACHE_MB ile
+# değiştirilebilir. Bütçeden büyük dosyalar önceden yüklenmez.
+DEFAULT_PREFETCH_BUDGET_MB = 64
+
+PrefetchedFile = namedtuple('PrefetchedFile', ['text', 'encoding', 'line_index'])
+
+
+def prefetch_count():
+    try:
+        return max(0, int(os.environ.get('Y3_PREFETCH_COUNT', DEFAULT_PREFETCH_COUNT)))
+    except ValueError:
+        return DEFAULT_PREFETCH_COUNT
+
+
+def prefetch_budget():
+    try:
+        megabytes = float(os.environ.get('Y3_PREFETCH_CACHE_MB', DEFAULT_PREFETCH_BUDGET_MB))
+    except ValueError:
+        megabytes = DEFAULT_PREFETCH_BUDGET_MB
+    return int(megabytes * 1024 * 1024)
+
+
+def prefetched_cost(entry):
+    return sys.getsizeof(entry.text) + entry.line_index.newlines.itemsize * len(entry.line_index.newlines)
+
+
+def neighbours(row, count, total):
+    # Yakından uzağa, aynı uzaklıkta önce sonraki dosya: row+1, row-1,
+    # row+2, row-2, ...
+    rows = []
+    for distance in range(1, count + 1):
+        for candidate in (row + distance, row - distance):
+            if 0 <= candidate < total:
+                rows.append(candidate)
+    return rows
+
+
+class Prefetcher(QThread):
+    # Listede seçili dosyanın komşularını en düşük öncelikle arka planda okur
+    # ve çözer. Sonuçlar prefetched sinyaliyle arayüz iş parçacığına gider;
+    # önbelleğe yalnızca orada yazılır. schedule her çağrıldığında istek
+    # listesi baştan kurulur; okunmakta olan dosya yeni listede yoksa (kullanıcı
+    # başka bir yere atladıysa) okuma blok sınırında bırakılır.
+    prefetched = pyqtSignal(object, object)
+
+    def __init__(self, max_size=None):
+        super().__init__()
+        self.max_size = prefetch_budget() if max_size is None else max_size
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._wanted = frozenset()
+        self._stopping = False
+
+    def schedule(self, paths):
+        with self._condition:
+            self._queue = deque(paths)
+            self._wanted = frozenset(paths)
+            self._condition.notify()
+        if paths and not self.isRunning():
+            self.start(QThread.LowestPriority)
+
+    def cancel(self):
+        self.schedule([])
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._queue.clear()
+            self._wanted = frozenset()
+            self._condition.notify()
+        self.wait()
+
+    def _cancelled(self, path):
+        return self._stopping or path not in self._wanted
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                path = self._queue.popleft()
+
+            # Anahtar okumadan önce alınır; okuma sırasında değişen dosya
+            # sonradan eşleşmez.
+            key = DocumentCache.key(path)
+            if key is None or key[2] > self.max_size:
+                continue
+            try:
+                result = read_text(path, stop=lambda: self._cancelled(path))
+            except (OSError, UnicodeDecodeError, LookupError):
+                continue
+            if result is not None:
+                self.prefetched.emit(key, PrefetchedFile(*result))
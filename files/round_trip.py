@@ -0,0 +1,28 @@
+from collections import namedtuple
+from encoding_detection import detect_encoding
+
+LineDifference = namedtuple('LineDifference', ['path', 'line', 'original', 'round_trip'])
+
+
+def verify_file(file_path, profile, encoding=None):
+    # Kodlanmış bir dosyayı satır satır çözer ve yeniden kodlar; yalnızca
+    # ilk haline dönmeyen satırları üretir. Dosya tek geçişte, satır satır
+    # okunur.
+    decode = profile.table('decode').convert
+    encode = profile.table('encode').convert
+    if encoding is None:
+        encoding = detect_encoding(file_path).codec
+    with open(file_path, 'r', encoding=encoding, newline='') as file:
+        for number, line in enumerate(file, 1):
+            text = line.rstrip('\r\n')
+            round_trip = encode(decode(text))
+            if round_trip != text:
+                yield LineDifference(file_path, number, text, round_trip)
+
+
+def verify_files(file_paths, profile, encoding=None):
+    # Ters tablo kurulamıyorsa (eşleştirme birebir değilse) hiçbir dosya
+    # okunmadan MappingProfileError yükselir.
+    profile.table('decode')
+    for file_path in file_paths:
+        yield from verify_file(file_path, profile, encoding)
@@ -0,0 +1,387 @@
+import csv
+import io
+import json
+import os
+import re
+from array import array
+from collections import namedtuple
+from encoding_detection import detect_encoding, fallback_encoding
+
+# Bu uzantılardaki dosyalar ham metin yerine segment olarak açılır.
+STRUCTURED_EXTENSIONS = ('.json', '.csv')
+
+# Bir seferde okunan bayt sayısı.
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Nesne alanlarının ve CSV başlıklarının anlamı (küçük harfle karşılaştırılır).
+# Kaynak/hedef alanı olan bir nesne tek segment olur; kimlik alanı segmentin
+# anahtarıdır ve çevrilmez.
+ID_FIELDS = ('key', 'id')
+SOURCE_FIELDS = ('source', 'original', 'en')
+TARGET_FIELDS = ('target', 'translation', 'tr')
+
+# Bir JSON olayı: isteğe bağlı virgül ve nesne anahtarıyla birlikte tek bir
+# değer, açılış ya da kapanış. Değerlerden sonraki boşluk da eşleşmeye
+# dahildir; eşleşme tamponun sonuna dayanıyorsa belirteç bölünmüş olabilir.
+_JSON_EVENT = re.compile(rb'''
+    [ \t\r\n]*(,)?[ \t\r\n]*
+    (?:("[^"\\]*(?:\\.[^"\\]*)*")[ \t\r\n]*:[ \t\r\n]*)?
+    (?:
+        ("[^"\\]*(?:\\.[^"\\]*)*")[ \t\r\n]*(?=[,}\]]|\Z)
+      | ([{\[])
+      | ([}\]])
+      | ([^ \t\r\n{}\[\],:"]+)[ \t\r\n]*(?=[,}\]]|\Z)
+    )''', re.X | re.S)
+
+Segment = namedtuple('Segment', ['key', 'source', 'target', 'start', 'end'])
+
+
+def is_structured(file_path):
+    return file_path.lower().endswith(STRUCTURED_EXTENSIONS)
+
+
+def _ascii_compatible(encoding):
+    # Belirteçler bayt düzeyinde aranır; JSON'un yapı karakterleri kodlamada
+    # tek baytlık ASCII olarak kalmalıdır (UTF-16'da kalmaz).
+    marks = '"\\{}[],:\n'
+    try:
+        return marks.encode(encoding.codec) == marks.encode('ascii')
+    except LookupError:
+        return False
+
+
+class SegmentStore:
+    # Yapılandırılmış dosyanın çevrilebilir değerleri. Ham dosya bellekte
+    # tutulmaz: her segment için anahtar, kaynak, hedef (yoksa None) ve
+    # dosyada değiştirilecek değerin bayt aralığı saklanır. Bellek segment
+    # sayısıyla orantılıdır. Aralıklar array('Q') içinde [başlangıç, bitiş]
+    # çiftleri olarak tutulur.
+    def __init__(self, file_path, encoding, kind):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.kind = kind
+        self.keys = []
+        self.sources = []
+        self.targets = []
+        self.spans = array('Q')
+        # CSV: yazılacak sütun ve alan ayırıcı.
+        self.column = None
+        self.delimiter = ','
+
+    def add(self, key, source, target, start, end):
+        self.keys.append(key)
+        self.sources.append(source)
+        self.targets.append(target)
+        self.spans.append(start)
+        self.spans.append(end)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def span(self, index):
+        return self.spans[2 * index], self.spans[2 * index + 1]
+
+    def segment(self, index):
+        return Segment(self.keys[index], self.sources[index], self.targets[index],
+                       *self.span(index))
+
+    def text(self, index):
+        # Düzenleyicide gösterilen değer: hedef varsa hedef, yoksa kaynak.
+        target = self.targets[index]
+        return self.sources[index] if target is None else target
+
+    def texts(self):
+        return [self.text(index) for index in range(len(self))]
+
+    def update(self, values, spans):
+        # Kaydedilen değerler ve yeni aralıklar yazma başarılı olunca işlenir.
+        for index, value in enumerate(values):
+            if self.targets[index] is None:
+                self.sources[index] = value
+            else:
+                self.targets[index] = value
+        self.spans = spans
+
+
+def to_line(text):
+    # Düzenleyicide her segment bir satırdır; değerdeki satır sonları ve ters
+    # eğik çizgiler kaçışlanır.
+    return text.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+
+
+_ESCAPES = {'\\': '\\', 'n': '\n', 'r': '\r'}
+
+
+def from_line(line):
+    return re.sub(r'\\([\\nr])', lambda match: _ESCAPES[match.group(1)], line)
+
+
+def _iter_json_events(file, block_size, start, progress=None, stop=None):
+    # Eşleşmeler bitişik olmalıdır; arada boşluk dışında bir şey kalırsa
+    # (bölünmüş dize ya da anahtar) tampon bir sonraki blokla tamamlanıp
+    # o konumdan yeniden taranır.
+    buffer = b''
+    offset = start
+    pos = 0
+    eof = False
+    while True:
+        if stop is not None and stop():
+            raise InterruptedError
+        data = file.read(block_size)
+        offset += pos
+        buffer = buffer[pos:] + data
+        pos = 0
+        eof = not data
+        if progress is not None:
+            progress(offset + len(buffer))
+        for match in _JSON_EVENT.finditer(buffer):
+            if match.start() != pos or (match.end() == len(buffer) and not eof):
+                break
+            pos = match.end()
+            yield offset, match
+        if eof:
+            if buffer[pos:].strip():
+                raise ValueError(f"Geçersiz JSON ({offset + pos}. bayt)")
+            return
+
+
+class _Container:
+    __slots__ = ('is_object', 'path', 'name', 'index', 'id', 'pair')
+
+    def __init__(self, is_object, path):
+        self.is_object = is_object
+        self.path = path
+        self.name = None
+        self.index = 0
+        self.id = None
+        self.pair = {}
+
+    def child_path(self):
+        if self.is_object:
+            return f'{self.path}.{self.name}' if self.path else self.name
+        return f'{self.path}[{self.index}]'
+
+
+def parse_json(file_path, encoding, progress=None, stop=None, block_size=READ_BLOCK_SIZE):
+    # JSON'u akış halinde tarar; yalnızca dize değerleri segment olur.
+    # Anahtar, değerin yoludur (ör. "menu.items[3].label"). Kaynak/hedef
+    # alanları olan nesneler tek segmenttir; anahtarı kimlik alanı ya da yolu.
+    if not _ascii_compatible(encoding):
+        raise ValueError(f"JSON bu kodlamayla akış halinde okunamaz: {encoding.codec}")
+    codec = encoding.codec
+    store = SegmentStore(file_path, encoding, 'json')
+    stack = []
+
+    def decode(token):
+        # Kaçış dizisi yoksa json.loads'a gerek yoktur.
+        if b'\\' in token:
+            return json.loads(token.decode(codec))
+        return token[1:-1].decode(codec)
+
+    def close(container):
+        pair = container.pair
+        if 'source' not in pair and 'target' not in pair:
+            return
+        source = pair.get('source') or pair['target']
+        target = pair.get('target') if 'source' in pair else None
+        value, start, end = target or source
+        store.add(container.id or container.path, source[0],
+                  None if target is None else target[0], start, end)
+
+    with open(file_path, 'rb') as file:
+        start = 3 if encoding.bom and file.read(3) == b'\xef\xbb\xbf' else 0
+        file.seek(start)
+        for offset, match in _iter_json_events(file, block_size, start, progress, stop):
+            comma, name, string, opener, closer, literal = match.groups()
+            top = stack[-1] if stack else None
+            if top is not None:
+                if comma and not top.is_object:
+                    top.index += 1
+                if name:
+                    top.name = decode(name)
+
+            if string:
+                field = top.name.lower() if top is not None and top.is_object else None
+                if field in ID_FIELDS:
+                    top.id = decode(string)
+                    continue
+                value = (decode(string), offset + match.start(3), offset + match.end(3))
+                if field in SOURCE_FIELDS:
+                    top.pair.setdefault('source', value)
+                elif field in TARGET_FIELDS:
+                    top.pair.setdefault('target', value)
+                else:
+                    store.add(top.child_path() if top is not None else '', value[0], None,
+                              value[1], value[2])
+            elif opener:
+                path = top.child_path() if top is not None else ''
+                stack.append(_Container(opener == b'{', path))
+            elif closer:
+                if top is None or top.is_object != (closer == b'}'):
+                    raise ValueError(f"Geçersiz JSON ({offset + match.start(5)}. bayt)")
+                stack.pop()
+                if top.is_object:
+                    close(top)
+            elif top is not None and top.is_object:
+                field = top.name.lower()
+                if field in ID_FIELDS:
+                    top.id = literal.decode(codec)
+                elif field in TARGET_FIELDS and literal == b'null':
+                    # Boş hedef: çeviri null'un yerine dize olarak yazılır;
+                    # kaynak alanına dokunulmaz.
+                    top.pair.setdefault(
+                        'target', ('', offset + match.start(6), offset + match.end(6)))
+    if stack:
+        raise ValueError("Geçersiz JSON (dosya erken bitti)")
+    return store
+
+
+def _csv_columns(header):
+    # Başlık tanınırsa (kimlik, kaynak, hedef) sütunları ve True; tanınmazsa
+    # ilk sütun anahtar, ikincisi kaynak, üçüncüsü hedef sayılır.
+    names = [cell.strip().lower() for cell in header]
+
+    def find(fields):
+        return next((i for i, name in enumerate(names) if name in fields), None)
+
+    key, source, target = find(ID_FIELDS), find(SOURCE_FIELDS), find(TARGET_FIELDS)
+    if source is not None or target is not None:
+        return key, source if source is not None else target, \
+            target if source is not None else None, True
+    if len(header) == 1:
+        return None, 0, None, False
+    return 0, 1, 2 if len(header) > 2 else None, False
+
+
+def _csv_records(file):
+    # Tırnak içindeki satır sonları kaydı bölmez: tırnak sayısı çift olana
+    # kadar satırlar birleştirilir.
+    record = []
+    quotes = 0
+    for line in file:
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield ''.join(record)
+            record = []
+            quotes = 0
+    if record:
+        yield ''.join(record)
+
+
+def parse_csv(file_path, encoding, progress=None, stop=None, block_size=READ_BLOCK_SIZE):
+    # CSV'yi satır satır okur; her kayıt bir segmenttir ve aralığı kaydın
+    # satır sonu hariç tamamıdır (kaydederken yalnızca değer sütunu değişir).
+    codec = encoding.codec
+    store = SegmentStore(file_path, encoding, 'csv')
+    with open(file_path, 'r', encoding=codec, newline='') as file:
+        offset = 0
+        reported = 0
+        columns = None
+        for number, record in enumerate(_csv_records(file)):
+            if number == 0 and encoding.bom and record.startswith('\ufeff'):
+                offset += len('\ufeff'.encode(codec))
+                record = record[1:]
+            size = len(record.encode(codec))
+            body = record.rstrip('\r\n')
+            start = offset
+            offset += size
+            if offset - reported >= block_size:
+                if stop is not None and stop():
+                    raise InterruptedError
+                if progress is not None:
+                    progress(offset)
+                reported = offset
+            if not body.strip():
+                continue
+
+            if columns is None:
+                try:
+                    store.delimiter = csv.Sniffer().sniff(body, delimiters=',;\t').delimiter
+                except csv.Error:
+                    store.delimiter = ','
+                row = next(csv.reader([body], delimiter=store.delimiter))
+                key, source, target, has_header = _csv_columns(row)
+                columns = key, source, target
+                store.column = source if target is None else target
+                if has_header:
+                    continue
+            row = next(csv.reader([body], delimiter=store.delimiter))
+            key, source, target = columns
+            store.add(
+                row[key] if key is not None and key < len(row) else str(number + 1),
+                row[source] if source < len(row) else '',
+                None if target is None else (row[target] if target < len(row) else ''),
+                start, start + len(body.encode(codec))
+            )
+    if progress is not None:
+        progress(offset)
+    return store
+
+
+def load_segments(file_path, encoding=None, progress=None, stop=None):
+    # progress(okunan bayt) isteğe bağlıdır; stop() True dönerse
+    # InterruptedError yükselir. UTF-8 sanılan dosya çözülemezse eski kod
+    # sayfasıyla yeniden okunur; kullanılan kodlama store.encoding'dedir.
+    encoding = encoding or detect_encoding(file_path)
+    parse = parse_json if file_path.lower().endswith('.json') else parse_csv
+    try:
+        return parse(file_path, encoding, progress, stop)
+    except UnicodeDecodeError:
+        fallback = fallback_encoding(encoding)
+        if fallback is None:
+            raise
+        return parse(file_path, fallback, progress, stop)
+
+
+def _copy(source, target, count):
+    while count > 0:
+        data = source.read(min(count, READ_BLOCK_SIZE))
+        if not data:
+            break
+        target.write(data)
+        count -= len(data)
+
+
+def _replacement(store, old, value):
+    codec = store.encoding.codec
+    if store.kind == 'json':
+        return json.dumps(value, ensure_ascii=False).encode(codec)
+    row = next(csv.reader([old.decode(codec)], delimiter=store.delimiter))
+    row.extend([''] * (store.column + 1 - len(row)))
+    row[store.column] = value
+    line = io.StringIO()
+    # Satır sonu içeren alanların tırnaklanması için sonlandırıcı '\n'
+    # olmalıdır; eklenen sonlandırıcı atılır.
+    csv.writer(line, delimiter=store.delimiter, lineterminator='\n').writerow(row)
+    return line.getvalue()[:-1].encode(codec)
+
+
+def write_segments(store, values, target, progress=None):
+    # Kaynak dosya olduğu gibi kopyalanır; yalnızca değişen segmentlerin
+    # aralıkları yeniden yazılır. target ikili modda açık başka bir dosyadır.
+    # Yeni aralıkları döndürür (store.update ile işlenir).
+    if len(values) != len(store):
+        raise ValueError(f"Segment sayısı eşleşmiyor: {len(values)} / {len(store)}")
+    order = sorted(range(len(store)), key=lambda index: store.spans[2 * index])
+    spans = array('Q', store.spans)
+    shift = 0
+    with open(store.file_path, 'rb') as source:
+        size = os.fstat(source.fileno()).st_size
+        position = 0
+        for index in order:
+            start, end = store.span(index)
+            spans[2 * index] = start + shift
+            if values[index] == store.text(index):
+                spans[2 * index + 1] = end + shift
+                continue
+            _copy(source, target, start - position)
+            new = _replacement(store, source.read(end - start), values[index])
+            target.write(new)
+            position = end
+            shift += len(new) - (end - start)
+            spans[2 * index + 1] = end + shift
+            if progress is not None and size:
+                progress(position * 100 // size)
+        _copy(source, target, size - position)
+    return spans
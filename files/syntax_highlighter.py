@@ -1,32 +1,97 @@
 from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
-import re
+from grammars import TEXT_GRAMMAR
+
 
 class SyntaxHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent=None):
+    # Bloklar grammar ile (bkz. grammars) taranır; satır sonunda açık kalan
+    # span'ın durumu bloğa yazılır ve sonraki blok o durumdan başlar. Bir
+    # bloğun durumu değişmedikçe sonrakiler yeniden renklendirilmez.
+    #
+    # tokenizer (bkz. Tokenizer) verilirse belirteçler paylaşılan önbellekten
+    # alınır; hazır olmayan bloklar sonuç gelince yeniden renklendirilir.
+    # Verilmezse her blok burada çözülür.
+    def __init__(self, parent=None, tokenizer=None, grammar=None):
         super().__init__(parent)
-        self.rules = []
+        self.formats = {}
+        self.tokenizer = tokenizer
+        self.grammar = TEXT_GRAMMAR if grammar is None else grammar
+        # Önbellek anahtarı -> belirteçleri beklenen (blok, blok sürümü)
+        # çiftleri.
+        self.waiting = {}
+        if tokenizer is not None:
+            tokenizer.ready.connect(self.tokens_ready)
         self.setup_rules()
-        
+
     def setup_rules(self):
         tag_format = QTextCharFormat()
         tag_format.setForeground(QColor("red"))
         tag_format.setFontWeight(QFont.Bold)
-        
+
         key_format = QTextCharFormat()
         key_format.setForeground(QColor("#FFD700"))  # Altın sarısı
-        
+
         string_format = QTextCharFormat()
         string_format.setForeground(QColor("#98FB98"))  # Açık yeşil
-        
-        self.rules = [
-            (r'\[.*?\]', tag_format),  # Köşeli parantez içindekiler
-            (r'".*?"', string_format),  # Tırnak içindeki metinler
-            (r'[A-Z][A-Za-z]*:', key_format),  # Büyük harfle başlayan kelimeler
-        ]
-    
+
+        literal_format = QTextCharFormat()
+        literal_format.setForeground(QColor("#87CEFA"))  # Açık mavi
+
+        self.formats = {
+            'tag': tag_format,
+            'string': string_format,
+            'key': key_format,
+            'literal': literal_format,
+        }
+
+    def set_grammar(self, grammar):
+        if grammar is not self.grammar:
+            self.grammar = grammar
+            self.waiting = {}
+            if self.document() is not None:
+                self.rehighlight()
+
+    def scan(self, text, state=0, inline=False):
+        # (belirteçler, bitiş durumu) ya da belirteçler henüz hazır değilse
+        # None.
+        if self.tokenizer is None:
+            return self.grammar.scan(text, state)
+        return self.tokenizer.scan(self.grammar, state, text, inline)
+
+    def tokens(self, text, state=0, inline=False):
+        # (başlangıç, uzunluk, biçim) üçlüleri ve bitiş durumu ya da None;
+        # belgeye bağlı olmadan da kullanılabilir (bkz. LazyHighlighting).
+        result = self.scan(text, state, inline)
+        if result is None:
+            return None
+        spans, end_state = result
+        return self.format_spans(spans), end_state
+
+    def format_spans(self, spans):
+        formats = self.formats
+        return [(start, length, formats[name]) for start, length, name in spans]
+
     def highlightBlock(self, text):
-        for pattern, format in self.rules:
-            for match in re.finditer(pattern, text):
-                start = match.start()
-                length = match.end() - match.start()
-                self.setFormat(start, length, format)
\ No newline at end of file
+        state = max(self.previousBlockState(), 0)
+        result = self.scan(text, state)
+        if result is None:
+            # Blok durumu eskisi gibi kalır; sonuç gelince bu blok ve durumu
+            # değişirse sonrakiler yeniden renklendirilir.
+            block = self.currentBlock()
+            key = self.tokenizer.key(self.grammar, state, text)
+            self.waiting.setdefault(key, []).append((block, block.revision()))
+            return
+        spans, end_state = result
+        formats = self.formats
+        for start, length, name in spans:
+            self.setFormat(start, length, formats[name])
+        self.setCurrentBlockState(end_state)
+
+    def tokens_ready(self, results):
+        for key in results.keys() & self.waiting.keys():
+            for block, revision in self.waiting.pop(key):
+                # Blok bu arada silinmiş ya da değişmiş olabilir; değişen
+                # metin zaten yeniden istenmiştir.
+                if (self.document() is not None and block.isValid()
+                        and block.document() is self.document()
+                        and block.revision() == revision):
+                    self.rehighlightBlock(block)
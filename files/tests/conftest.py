@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# Modüller birbirini düz adla içe aktarır (ör. "from line_index import ...");
+# testler files/ dizininden çalıştırılıyormuş gibi görsün.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Qt testleri ekransız da çalışır.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,55 @@
+import io
+
+import pytest
+
+from conversion_engine import REPLACE_MAX_ROWS, CompiledMapping
+
+TURKISH = {'ı': 'i', 'ğ': 'g', 'ü': 'u', 'ş': 's', 'ö': 'o', 'ç': 'c',
+           'İ': 'I', 'Ğ': 'G', 'Ü': 'U', 'Ş': 'S', 'Ö': 'O', 'Ç': 'C'}
+TEXT = 'Çığ düştü; İstanbul\'da ŞÖĞÜ ıı\r\n' * 3 + 'son satır'
+
+
+@pytest.mark.parametrize('mapping', [
+    TURKISH,
+    {**TURKISH, 'â': 'a', 'î': 'i'},
+    {'ş': 'sh', 'ç': 'ch', '\U0001F600': ':)', 'x': ''},
+])
+def test_replace_and_translate_give_identical_output(mapping):
+    text = TEXT + ' âî x \U0001F600'
+    replace = CompiledMapping(mapping, 'replace')
+    translate = CompiledMapping(mapping, 'translate')
+    assert replace.convert(text) == translate.convert(text)
+    assert translate.convert(text) == ''.join(mapping.get(char, char) for char in text)
+
+
+def test_default_strategy_uses_replace_only_for_small_chain_free_tables():
+    assert CompiledMapping(TURKISH).strategy == 'replace'
+    large = {chr(0x100 + index): 'x' for index in range(REPLACE_MAX_ROWS + 1)}
+    assert CompiledMapping(large).strategy == 'translate'
+    # Zincirde art arda replace bir kuralın çıktısını yeniden çevirirdi.
+    chained = CompiledMapping({'a': 'b', 'b': 'c'})
+    assert chained.chained and chained.strategy == 'translate'
+    assert chained.convert('ab') == 'bc'
+    assert CompiledMapping({'ae': 'æ', 'ı': 'i'}).strategy == 'translate'
+
+
+def test_multi_character_keys_prefer_the_longest_match():
+    mapping = CompiledMapping({'s': 'z', 'sh': 'ş', 'shh': '!'})
+    assert mapping.convert('s sh shh shhh') == 'z ş ! !h'
+
+
+def test_to_data_round_trip_keeps_strategy():
+    mapping = CompiledMapping(TURKISH, 'translate')
+    loaded = CompiledMapping.from_data(mapping.to_data())
+    assert loaded.strategy == 'translate'
+    assert loaded.fingerprint == mapping.fingerprint
+    assert loaded.convert(TEXT) == mapping.convert(TEXT)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1024])
+def test_stream_matches_whole_text_across_chunk_boundaries(chunk_size):
+    mapping = CompiledMapping({'ş': 'sh', 'ıı': 'İ', 'abc': 'X', 'ç': 'c'})
+    text = 'abcabşıııab cçabc' * 5
+    target = io.StringIO()
+    mapping.convert_stream(io.StringIO(text), target, chunk_size)
+    assert target.getvalue() == mapping.convert(text)
@@ -0,0 +1,91 @@
+import os
+
+from conversion_engine import convert_file, converted_path, init_worker, convert_in_worker
+from conversion_manifest import ConversionManifest
+
+MAPPING = {'ş': 's'}
+
+
+def convert(manifest, path, fingerprint='f1'):
+    # Klasör işçisinin yaptığı gibi: atlanmayan dosya dönüştürülüp kaydedilir.
+    skip, digest = manifest.check(path, fingerprint)
+    if skip:
+        return 'skip'
+    result = convert_in_worker(path, digest)
+    manifest.record(path, fingerprint, result)
+    return 'same' if result['skipped'] else 'converted'
+
+
+def source(tmp_path, name, text):
+    path = tmp_path / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_unchanged_file_is_skipped_after_reload(tmp_path):
+    init_worker(MAPPING)
+    path = source(tmp_path, 'a.txt', 'şeker')
+    manifest = ConversionManifest(str(tmp_path))
+    assert convert(manifest, path) == 'converted'
+    manifest.save()
+
+    manifest = ConversionManifest(str(tmp_path))
+    assert convert(manifest, path) == 'skip'
+    # Eşleştirme değişirse yeniden dönüştürülür.
+    assert convert(manifest, path, 'f2') == 'converted'
+
+
+def test_touched_file_is_compared_by_digest(tmp_path):
+    init_worker(MAPPING)
+    path = source(tmp_path, 'a.txt', 'şeker')
+    manifest = ConversionManifest(str(tmp_path))
+    convert(manifest, path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert manifest.check(path, 'f1')[0] is False
+    assert convert(manifest, path) == 'same'
+    assert convert(manifest, path) == 'skip'
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('şeker!')
+    assert convert(manifest, path) == 'converted'
+    with open(converted_path(path), encoding='utf-8') as file:
+        assert file.read() == 'seker!'
+
+
+def test_missing_output_is_not_skipped(tmp_path):
+    init_worker(MAPPING)
+    path = source(tmp_path, 'a.txt', 'şeker')
+    manifest = ConversionManifest(str(tmp_path))
+    convert(manifest, path)
+    os.remove(converted_path(path))
+    assert manifest.check(path, 'f1') == (False, None)
+
+
+def test_remove_missing_deletes_entries_and_outputs_of_removed_sources(tmp_path):
+    kept = source(tmp_path, 'sub/kept.txt', 'a')
+    removed = source(tmp_path, 'sub/removed.txt', 'b')
+    outside = source(tmp_path, 'other.txt', 'c')
+    manifest = ConversionManifest(str(tmp_path))
+    for path in (kept, removed, outside):
+        convert_file(path, MAPPING)
+        manifest.record(path, 'f1', {'size': 1, 'mtime_ns': 0, 'digest': ''})
+    assert sorted(manifest.entries) == ['other.txt', 'sub/kept.txt', 'sub/removed.txt']
+
+    os.remove(removed)
+    # Taranmamış ama hâlâ var olan dosyaların kaydı korunur.
+    assert manifest.remove_missing([kept]) == 1
+    assert sorted(manifest.entries) == ['other.txt', 'sub/kept.txt']
+    assert not os.path.exists(converted_path(removed))
+    assert os.path.exists(converted_path(kept))
+
+
+def test_unreadable_or_old_manifest_starts_empty(tmp_path):
+    manifest = ConversionManifest(str(tmp_path))
+    with open(manifest.path, 'w', encoding='utf-8') as file:
+        file.write('{"version": 0, "files": {"a.txt": {}}}')
+    assert ConversionManifest(str(tmp_path)).entries == {}
+    with open(manifest.path, 'w', encoding='utf-8') as file:
+        file.write('{bozuk')
+    assert ConversionManifest(str(tmp_path)).entries == {}
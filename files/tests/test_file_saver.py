@@ -0,0 +1,89 @@
+import io
+
+import pytest
+from PyQt5.QtGui import QTextCursor, QTextDocument
+
+from encoding_detection import DetectedEncoding
+from file_saver import IncrementalSaveError, LineChanges, write_changed_lines
+
+UTF8 = DetectedEncoding('utf-8', False)
+
+
+def tracked(text):
+    # contentsChange yalnızca düzeni olan belgelerde yayılır; düzenleyicideki
+    # belgenin her zaman bir düzeni vardır.
+    document = QTextDocument()
+    document.setPlainText(text)
+    document.documentLayout()
+    changes = LineChanges()
+    changes.attach(document, text.count('\n') + 1)
+    return document, changes
+
+
+def edit(document, line, column, removed, inserted):
+    cursor = QTextCursor(document.findBlockByNumber(line))
+    cursor.movePosition(QTextCursor.Right, n=column)
+    cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, removed)
+    cursor.insertText(inserted)
+
+
+def saved(tmp_path, raw, pieces, encoding=UTF8):
+    path = tmp_path / 'source.txt'
+    path.write_bytes(raw)
+    target = io.BytesIO()
+    changed = write_changed_lines(target, str(path), pieces, encoding)
+    return target.getvalue(), changed
+
+
+def test_runs_follow_edits(qapp):
+    document, changes = tracked('\n'.join('line %d' % number for number in range(10)))
+    edit(document, 3, 0, 1, 'L')
+    assert changes.runs == [(0, 3), (None, 1), (4, 6)]
+    edit(document, 5, 6, 0, '\nnew')
+    assert changes.runs == [(0, 3), (None, 1), (4, 1), (None, 2), (6, 4)]
+    # İki satırı birleştiren silme.
+    edit(document, 8, 6, 1, '')
+    assert changes.runs == [(0, 3), (None, 1), (4, 1), (None, 2), (6, 1), (None, 1), (9, 1)]
+    assert changes.changed_lines() == 4
+    assert document.blockCount() == 10
+
+
+def test_untracked_when_line_count_differs():
+    document = QTextDocument()
+    # U+2029 blok ayırır ama dosyada satır sonu değildir.
+    document.setPlainText('a\u2029b')
+    changes = LineChanges()
+    changes.attach(document, 1)
+    assert changes.document is None
+
+
+@pytest.mark.parametrize('newline', [b'\n', b'\r\n'])
+@pytest.mark.parametrize('final_newline', [True, False])
+def test_saved_file_matches_document(qapp, tmp_path, newline, final_newline):
+    lines = ['satır %d ğüş' % number for number in range(8)]
+    raw = newline.join(line.encode() for line in lines) + (newline if final_newline else b'')
+    document, changes = tracked('\n'.join(lines) + ('\n' if final_newline else ''))
+    edit(document, 0, 0, 0, '>')
+    edit(document, 4, 2, 3, 'X\nY')
+    edit(document, 8, 0, 0, 'son ')
+
+    data, changed = saved(tmp_path, raw, changes.pieces())
+    expected = document.toPlainText().replace('\n', newline.decode()).encode()
+    assert data == expected
+    assert changed == changes.changed_lines()
+
+
+def test_unchanged_pieces_copy_bytes_verbatim(tmp_path):
+    raw = b'\xef\xbb\xbfa\nb\xff\nc'
+    data, changed = saved(tmp_path, raw, [(0, 3)])
+    assert data == raw and changed == 0
+
+
+def test_line_appended_after_last_line_without_newline(tmp_path):
+    data, _ = saved(tmp_path, b'a\r\nb', [(0, 2), (None, ['c'])])
+    assert data == b'a\r\nb\r\nc'
+
+
+def test_lone_carriage_return_is_rejected(tmp_path):
+    with pytest.raises(IncrementalSaveError):
+        saved(tmp_path, b'a\rb\nc', [(0, 1), (None, ['x'])])
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from line_index import LineIndex
+
+
+def reference(text):
+    # UTF-16 kod birimleriyle satır sonu konumları.
+    units = text.encode('utf-16-le')
+    return [index // 2 for index in range(0, len(units), 2) if units[index:index + 2] == b'\n\x00']
+
+
+def build(parts):
+    index = LineIndex()
+    for part in parts:
+        index.add(part)
+    return index
+
+
+@pytest.mark.parametrize('text', [
+    '', 'a', '\n', 'a\nb', 'a\nb\n', '\n\n\n',
+    'ğüş\nçö\n', '\U0001F600\na\U0001F600b\n\U0001F600',
+])
+def test_newlines_and_length_are_in_utf16_units(text):
+    index = build([text])
+    assert list(index.newlines) == reference(text)
+    assert index.length == len(text.encode('utf-16-le')) // 2
+    assert index.line_count == (0 if not text else text.count('\n') + (not text.endswith('\n')))
+
+
+def test_split_blocks_give_the_same_index():
+    rng = random.Random(7)
+    alphabet = 'ab\nğ\U0001F600\U00010348'
+    for _ in range(200):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(40)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, 4)))
+        parts = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+        index = build(parts)
+        assert list(index.newlines) == reference(text)
+        assert index.length == len(text.encode('utf-16-le')) // 2
+
+
+def test_line_start_and_line_of():
+    index = build(['ab\n\U0001F600c\n', 'd'])
+    assert [index.line_start(line) for line in range(3)] == [0, 3, 7]
+    assert index.line_start(10) == 7
+    assert [index.line_of(position) for position in (0, 2, 3, 6, 7)] == [0, 0, 1, 1, 2]
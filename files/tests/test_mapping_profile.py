@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+
+import mapping_profile
+from mapping_profile import (
+    CompiledProfile, MappingProfileError, compile_profile, load_cached_profile, profile_key
+)
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('Y3_CACHE_DIR', str(tmp_path))
+    mapping_profile._memory_cache.clear()
+    yield tmp_path
+    mapping_profile._memory_cache.clear()
+
+
+def kinds(issues):
+    return sorted(issue.kind for issue in issues)
+
+
+@pytest.mark.parametrize('pairs, kind', [
+    ([('a', 'b'), ('a', 'c')], 'duplicate'),
+    ([('a', 'b'), ('b', 'a')], 'cycle'),
+    ([('', 'x')], 'empty'),
+])
+def test_errors_stop_compilation(pairs, kind):
+    with pytest.raises(MappingProfileError) as error:
+        compile_profile(pairs)
+    assert kind in kinds(error.value.issues)
+
+
+def test_warnings_are_kept_with_the_profile():
+    profile = compile_profile([('a', 'b'), ('a', 'b'), ('c', 'ax'), ('sh', 'ş'), ('s', 'z')])
+    assert kinds(profile.warnings) == ['chain', 'overlap', 'repeat']
+    assert profile.mapping.convert('ash') == 'bş'
+
+
+def test_reverse_table_needs_a_bijective_mapping():
+    profile = compile_profile([('ı', 'i'), ('İ', 'i')])
+    assert kinds(profile.inverse_issues) == ['not_bijective']
+    with pytest.raises(MappingProfileError):
+        profile.table('decode')
+
+    profile = compile_profile([('ş', 's'), ('s', 'ś'), ('ç', 'c')])
+    assert profile.table('decode').convert('sśc') == 'şsç'
+
+
+def test_reverse_warns_about_targets_that_occur_as_plain_text():
+    # 'G' kodlamada değişmediği için ters yönde özgün 'G'ler de 'Ğ' olur;
+    # 's' kendisi de eşlendiğinden uyarı gerekmez, ama 'ś' için kural yoktur.
+    profile = compile_profile([('Ğ', 'G'), ('ş', 's'), ('s', 'ś')])
+    assert [issue.keys for issue in profile.reverse_warnings] == [('Ğ',), ('s',)]
+    swap = CompiledProfile([('a', 'b'), ('b', 'a')])
+    assert swap.reverse_warnings == []
+
+
+def test_compiled_profile_is_reloaded_from_disk(cache):
+    pairs = [('ş', 's'), ('ae', 'æ'), ('Ğ', 'G')]
+    profile = compile_profile(pairs)
+    mapping_profile._memory_cache.clear()
+    loaded = load_cached_profile(profile_key(pairs))
+    assert loaded is not None and loaded is not profile
+    assert loaded.pairs == profile.pairs
+    assert loaded.mapping.strategy == profile.mapping.strategy
+    assert loaded.reverse_warnings == profile.reverse_warnings
+    assert loaded.table('decode').convert('sæG') == 'şaeĞ'
+
+
+def test_tampered_cache_file_is_ignored(cache):
+    pairs = [('ş', 's')]
+    profile = compile_profile(pairs)
+    mapping_profile._memory_cache.clear()
+    path = mapping_profile._cache_path(profile.key)
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    data['mapping']['mapping'] = {'ş': 'x'}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    assert load_cached_profile(profile.key) is None
+    assert compile_profile(pairs).mapping.convert('ş') == 's'
+    assert os.path.exists(path)
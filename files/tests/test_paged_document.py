@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from encoding_detection import DetectedEncoding
+from paged_document import PagedDocument
+
+UTF8 = DetectedEncoding('utf-8', False)
+
+
+def opened(tmp_path, raw, encoding=UTF8, **sizes):
+    path = tmp_path / 'big.txt'
+    path.write_bytes(raw)
+    document = PagedDocument(str(path), encoding, **sizes)
+    assert document.build_index()
+    return document
+
+
+def check(document, raw, encoding=UTF8):
+    text = raw.decode(encoding.codec, errors='replace')
+    if encoding.bom:
+        text = text[1:]
+    text = text.replace('\r\n', '\n')
+    assert document.lines(0, document.page_count - 1) == (text[:-1] if text.endswith('\n') else text)
+    for page in range(document.page_count):
+        start, end = document.page_span(page)
+        assert end - start <= document.page_bytes + 1
+        assert not document.page_text(page).endswith('\r')
+        assert document.page_first_lines[page] == raw[:start].count(b'\n')
+    assert document.line_count == (text.count('\n') + (not text.endswith('\n')) if text else 0)
+
+
+def test_crlf_at_page_byte_limit_stays_on_one_page(tmp_path):
+    raw = b'abcdefg\r\nxyz'
+    document = opened(tmp_path, raw, page_lines=100, page_bytes=8)
+    assert document.page_span(0) == (0, 9)
+    assert document.page_text(0) == 'abcdefg\n'
+    check(document, raw)
+
+
+def test_long_line_is_cut_at_character_boundary(tmp_path):
+    raw = 'ğüşiöç'.encode() * 4 + b'\n' + b'x\n'
+    document = opened(tmp_path, raw, page_lines=100, page_bytes=7)
+    assert document.page_count > 1
+    assert document.continues(1)
+    assert document.page_of_line(1) == document.page_count - 1
+    check(document, raw)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_pages_decode_to_the_whole_text(tmp_path, seed):
+    rng = random.Random(seed)
+    pieces = [b'a', b'\n', b'\r\n', 'ğ'.encode(), '\U0001F600'.encode(), b'xyz' * 5]
+    raw = b''.join(rng.choice(pieces) for _ in range(rng.randrange(1, 200)))
+    encoding = DetectedEncoding('utf-8', bool(seed % 2))
+    if encoding.bom:
+        raw = b'\xef\xbb\xbf' + raw
+    document = opened(tmp_path, raw, encoding,
+                      page_lines=rng.randrange(1, 6), page_bytes=rng.randrange(4, 24))
+    check(document, raw, encoding)
+    for offset in range(document.start, len(raw)):
+        assert document.line_of_offset(offset) == raw[document.start:offset].count(b'\n')
+
+
+def test_empty_file(tmp_path):
+    document = opened(tmp_path, b'')
+    assert document.line_count == 0
+    assert document.lines(0, 0) == ''
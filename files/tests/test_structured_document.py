@@ -0,0 +1,107 @@
+import io
+import json
+
+import pytest
+
+from encoding_detection import DetectedEncoding
+from structured_document import READ_BLOCK_SIZE, load_segments, parse_json, write_segments
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def saved(store, values):
+    target = io.BytesIO()
+    write_segments(store, values, target)
+    return target.getvalue().decode('utf-8')
+
+
+def test_json_null_target_is_filled_not_source(tmp_path):
+    path = write(tmp_path / 'items.json',
+                 '[{"key": "a", "source": "Sword", "target": null}]')
+    store = load_segments(path)
+    assert store.keys == ['a']
+    assert store.sources == ['Sword']
+    assert store.targets == ['']
+    assert saved(store, ['Kılıç']) == '[{"key": "a", "source": "Sword", "target": "Kılıç"}]'
+
+
+def test_json_unchanged_null_target_is_kept(tmp_path):
+    text = '[{"source": "Sword", "target": null}, {"source": "x", "note": null}]'
+    store = load_segments(write(tmp_path / 'items.json', text))
+    assert saved(store, store.texts()) == text
+
+
+JSON_TEXT = '''{
+  "menu": {"title": "File \\"x\\" \\u00e7\\n", "items": ["Open", "Save", 3, true]},
+  "rows": [
+    {"id": 7, "en": "Sword", "tr": "Kılıç"},
+    {"key": "shield", "source": "Shield"},
+    {"source": "Bow", "translation": ""}
+  ]
+}'''
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 5, 64, READ_BLOCK_SIZE])
+def test_json_segments_do_not_depend_on_block_size(tmp_path, block_size):
+    path = write(tmp_path / 'menu.json', JSON_TEXT)
+    store = parse_json(path, DetectedEncoding('utf-8', False), block_size=block_size)
+    assert store.keys == ['menu.title', 'menu.items[0]', 'menu.items[1]', '7', 'shield', 'rows[2]']
+    assert store.sources == ['File "x" ç\n', 'Open', 'Save', 'Sword', 'Shield', 'Bow']
+    assert store.targets == [None, None, None, 'Kılıç', None, '']
+    raw = JSON_TEXT.encode('utf-8')
+    start, end = store.span(3)
+    assert raw[start:end] == '"Kılıç"'.encode('utf-8')
+
+
+def test_json_save_rewrites_only_changed_values(tmp_path):
+    store = load_segments(write(tmp_path / 'menu.json', JSON_TEXT))
+    values = store.texts()
+    values[1] = 'Aç "dosya"'
+    values[5] = 'Yay'
+    text = saved(store, values)
+    assert json.loads(text) == {
+        'menu': {'title': 'File "x" ç\n', 'items': ['Aç "dosya"', 'Save', 3, True]},
+        'rows': [{'id': 7, 'en': 'Sword', 'tr': 'Kılıç'}, {'key': 'shield', 'source': 'Shield'},
+                 {'source': 'Bow', 'translation': 'Yay'}],
+    }
+    # Dokunulmayan değerler kaçış dizileri dahil aynen kalır.
+    assert '"File \\"x\\" \\u00e7\\n"' in text
+
+
+@pytest.mark.parametrize('text', ['{"a": "b"', '{"a": "b"]', '["a" "b"]'])
+def test_invalid_json_is_rejected(tmp_path, text):
+    with pytest.raises(ValueError):
+        load_segments(write(tmp_path / 'bad.json', text))
+
+
+def test_json_needs_ascii_compatible_encoding(tmp_path):
+    path = tmp_path / 'wide.json'
+    path.write_bytes('["a"]'.encode('utf-16-le'))
+    with pytest.raises(ValueError):
+        parse_json(str(path), DetectedEncoding('utf-16-le', False))
+
+
+def test_csv_header_columns_and_quoted_newlines(tmp_path):
+    text = 'id;source;target\r\n1;"Line one\r\nline two";\r\n2;"say ""hi""";merhaba\r\n\r\n3;x\r\n'
+    store = load_segments(write(tmp_path / 'strings.csv', text))
+    assert store.delimiter == ';'
+    assert store.keys == ['1', '2', '3']
+    assert store.sources == ['Line one\r\nline two', 'say "hi"', 'x']
+    assert store.targets == ['', 'merhaba', '']
+    start, end = store.span(0)
+    assert text.encode()[start:end] == b'1;"Line one\r\nline two";'
+
+    values = ['Birinci\nikinci', 'merhaba', 'iks']
+    assert saved(store, values) == (
+        'id;source;target\r\n1;"Line one\r\nline two";"Birinci\nikinci"\r\n'
+        '2;"say ""hi""";merhaba\r\n\r\n3;x;iks\r\n')
+
+
+def test_csv_without_header_translates_the_source_column(tmp_path):
+    store = load_segments(write(tmp_path / 'plain.csv', 'a,Hello\nb,"World, again"\n'))
+    assert store.keys == ['a', 'b']
+    assert store.targets == [None, None]
+    assert saved(store, ['Merhaba', 'Dünya, yine']) == 'a,Merhaba\nb,"Dünya, yine"\n'
@@ -0,0 +1,63 @@
+import pytest
+
+from translation_memory import TranslationMemory, normalize_text
+
+
+class Translator:
+    source = 'en'
+    target = 'tr'
+
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        return text.upper()
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory(str(tmp_path / 'memory.sqlite3'))
+    yield memory
+    memory.close()
+
+
+def test_normalize_text_ignores_whitespace_differences():
+    assert normalize_text('  Hello \t world \r\n again  ') == 'Hello world\nagain'
+    assert normalize_text('e\u0301') == '\u00e9'
+
+
+def test_translate_calls_the_backend_once(memory):
+    translator = Translator()
+    assert memory.translate(translator, 'hello  world') == ('HELLO  WORLD', False)
+    assert memory.translate(translator, ' hello world\n') == ('HELLO  WORLD', True)
+    assert translator.calls == ['hello  world']
+    assert (memory.hits, memory.misses) == (1, 1)
+    assert memory.get('en', 'de', 'Translator', 'hello world') is None
+
+
+def test_is_translation_recognizes_stored_translations(memory):
+    memory.put_many('en', 'tr', 'B', [('Sword', 'Kılıç'), ('', 'boş'), ('Bow', None)])
+    assert len(memory) == 1
+    assert memory.is_translation('en', 'tr', 'B', 'Kılıç')
+    assert not memory.is_translation('en', 'tr', 'B', 'Sword')
+    assert not memory.is_translation('en', 'tr', 'Other', 'Kılıç')
+
+
+def test_memory_persists_across_connections(tmp_path):
+    path = str(tmp_path / 'memory.sqlite3')
+    memory = TranslationMemory(path)
+    memory.put('en', 'tr', 'B', 'Shield', 'Kalkan')
+    memory.close()
+    memory = TranslationMemory(path)
+    assert memory.get('en', 'tr', 'B', 'Shield') == 'Kalkan'
+    memory.close()
+
+
+def test_unusable_path_still_translates(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    memory = TranslationMemory(str(blocker / 'memory.sqlite3'))
+    assert memory.connection is None
+    assert memory.translate(Translator(), 'hi') == ('HI', False)
+    assert len(memory) == 0
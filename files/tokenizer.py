@@ -0,0 +1,133 @@
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
+import os
+import threading
+from collections import OrderedDict
+
+# Önbellekte tutulan en fazla blok metni; Y3_TOKEN_CACHE_BLOCKS ile
+# değiştirilebilir. Üç belirteçli blok başına yaklaşık 400 bayt ve blok
+# metnini tutar.
+DEFAULT_TOKEN_CACHE_BLOCKS = 200000
+
+# Olay döngüsünün bir turunda arayüz iş parçacığında hemen çözülen en fazla
+# blok. Yazarken değişen satır ve ilk ekran beklemeden renklenir; toplu
+# değişikliklerde kalan bloklar iş parçacığına gider.
+INLINE_TOKENIZE_BLOCKS = 256
+
+# İş parçacığının tek sinyalle döndürdüğü en fazla blok.
+TOKENIZE_BATCH_BLOCKS = 1000
+
+
+def token_cache_blocks():
+    try:
+        return max(1, int(os.environ.get('Y3_TOKEN_CACHE_BLOCKS', DEFAULT_TOKEN_CACHE_BLOCKS)))
+    except ValueError:
+        return DEFAULT_TOKEN_CACHE_BLOCKS
+
+
+class TokenCache:
+    # (dilbilgisi, başlangıç durumu, blok metni) -> (belirteçler, bitiş
+    # durumu), blok sayısıyla sınırlı LRU. Aynı metin hangi belgede ve satırda
+    # olursa olsun bir kez çözülür. Anahtar metnin kendisini taşır; özet
+    # (hash) çakışmasında sözlük metinleri karşılaştırır ve başka satırın
+    # biçimleri uygulanmaz.
+    def __init__(self, max_blocks=None):
+        self.max_blocks = token_cache_blocks() if max_blocks is None else max_blocks
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_blocks:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Tokenizer(QThread):
+    # Tüm renklendiricilerin paylaştığı belirteç önbelleği ve onu dolduran
+    # iş parçacığı. scan önbellekte olmayan metni kuyruğa alıp None
+    # döndürür; inline ise ya da bu turun hakkı bitmediyse hemen çözer.
+    # Sonuçlar önbelleğe yalnızca arayüz iş parçacığında yazılır ve ready
+    # sinyaliyle ({anahtar: (belirteçler, bitiş durumu)}) duyurulur.
+    tokenized = pyqtSignal(object)
+    ready = pyqtSignal(object)
+
+    def __init__(self, max_blocks=None, inline_blocks=INLINE_TOKENIZE_BLOCKS):
+        super().__init__()
+        self.cache = TokenCache(max_blocks)
+        self.inline_blocks = inline_blocks
+        self._inline_left = inline_blocks
+        self._turn_timer = QTimer(self)
+        self._turn_timer.setSingleShot(True)
+        self._turn_timer.setInterval(0)
+        self._turn_timer.timeout.connect(self._new_turn)
+        self._condition = threading.Condition()
+        self._pending = OrderedDict()
+        self._stopping = False
+        self.tokenized.connect(self._store)
+
+    @staticmethod
+    def key(grammar, state, text):
+        return (grammar.name, state, text)
+
+    def scan(self, grammar, state, text, inline=False):
+        key = self.key(grammar, state, text)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        if inline or self._inline_left > 0:
+            if not inline:
+                if not self._turn_timer.isActive():
+                    self._turn_timer.start()
+                self._inline_left -= 1
+            result = grammar.scan(text, state)
+            self.cache.put(key, result)
+            return result
+        with self._condition:
+            self._pending[key] = (grammar, state, text)
+            self._condition.notify()
+        if not self.isRunning() and not self._stopping:
+            self.start(QThread.LowPriority)
+        return None
+
+    def pending(self):
+        return len(self._pending)
+
+    def _new_turn(self):
+        self._inline_left = self.inline_blocks
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._pending.clear()
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                batch = [self._pending.popitem(last=False)
+                         for _ in range(min(TOKENIZE_BATCH_BLOCKS, len(self._pending)))]
+            self.tokenized.emit([(key, grammar.scan(text, state))
+                                 for key, (grammar, state, text) in batch])
+
+    def _store(self, results):
+        for key, result in results:
+            self.cache.put(key, result)
+        self.ready.emit(dict(results))
@@ -0,0 +1,150 @@
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from mapping_profile import cache_dir
+
+# Veritabanı biçimi değiştiğinde artırılır; eski tablolar yeniden kurulur.
+MEMORY_FORMAT = 1
+
+
+def translation_memory_path():
+    # Y3_TRANSLATION_MEMORY ile başka bir dosya seçilebilir.
+    return os.environ.get('Y3_TRANSLATION_MEMORY') or os.path.join(
+        cache_dir(), 'translation_memory.sqlite3'
+    )
+
+
+def normalize_text(text):
+    # Yalnızca boşluk farkı olan metinler aynı kaydı kullanır. QTextCursor
+    # seçimlerde satır sonunu U+2029 olarak verir.
+    text = unicodedata.normalize('NFC', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\u2029', '\n')
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    return re.sub(r' ?\n ?', '\n', text).strip()
+
+
+def backend_name(translator):
+    return type(translator).__name__
+
+
+class TranslationMemory:
+    # Daha önce yapılmış çevirilerin kalıcı kaydı. Anahtar (kaynak dil, hedef
+    # dil, çevirmen, normalleştirilmiş metin) dörtlüsüdür; translate önce
+    # buraya bakar, yalnızca bulunamayan metinler çevirmene (ağa) gider.
+    #
+    # Veritabanı WAL kipinde açılır: okumalar yazmaları beklemez ve her
+    # kayıt tek bir küçük eklemeyle diske yazılır. Veritabanı açılamazsa
+    # çeviriler yine yapılır, yalnızca saklanmaz.
+    def __init__(self, path=None):
+        self.path = translation_memory_path() if path is None else path
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+        try:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.connection = self._open()
+        except (OSError, sqlite3.Error):
+            self.connection = None
+
+    def _open(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        if connection.execute('PRAGMA user_version').fetchone()[0] != MEMORY_FORMAT:
+            connection.execute('DROP TABLE IF EXISTS translations')
+            connection.execute(f'PRAGMA user_version={MEMORY_FORMAT}')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            ' source TEXT NOT NULL, target TEXT NOT NULL, backend TEXT NOT NULL,'
+            ' text TEXT NOT NULL, translation TEXT NOT NULL, created REAL NOT NULL,'
+            ' PRIMARY KEY (source, target, backend, text)) WITHOUT ROWID'
+        )
+        # is_translation için: çevirinin kendisinden kayda ulaşılır.
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS translations_by_translation'
+            ' ON translations (source, target, backend, translation)'
+        )
+        connection.commit()
+        return connection
+
+    def get(self, source, target, backend, text):
+        if self.connection is not None:
+            try:
+                row = self.connection.execute(
+                    'SELECT translation FROM translations'
+                    ' WHERE source=? AND target=? AND backend=? AND text=?',
+                    (source, target, backend, normalize_text(text))
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                self.hits += 1
+                return row[0]
+        self.misses += 1
+        return None
+
+    def is_translation(self, source, target, backend, text):
+        # Metin bu dil çifti ve çevirmen için daha önce üretilmiş bir çeviri
+        # mi? Hedef alanı olmayan dosyalarda çeviri kaynağın yerine yazılır;
+        # yeniden çevrilmemesi için buna bakılır. İsabet sayılmaz.
+        if self.connection is None:
+            return False
+        try:
+            row = self.connection.execute(
+                'SELECT 1 FROM translations'
+                ' WHERE source=? AND target=? AND backend=? AND translation=? LIMIT 1',
+                (source, target, backend, text)
+            ).fetchone()
+        except sqlite3.Error:
+            return False
+        return row is not None
+
+    def put(self, source, target, backend, text, translation):
+        self.put_many(source, target, backend, [(text, translation)])
+
+    def put_many(self, source, target, backend, pairs):
+        # (metin, çeviri) çiftleri tek bir işlemde yazılır.
+        if self.connection is None:
+            return
+        now = time.time()
+        rows = []
+        for text, translation in pairs:
+            key = normalize_text(text)
+            if key and translation is not None:
+                rows.append((source, target, backend, key, translation, now))
+        if not rows:
+            return
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)', rows
+                )
+        except sqlite3.Error:
+            # Bellek yazılamazsa çeviri yine de kullanılabilir.
+            pass
+
+    def translate(self, translator, text):
+        # (çeviri, bellekten mi) döndürür; çevirmen hataları yükseltilir.
+        key = (translator.source, translator.target, backend_name(translator))
+        translation = self.get(*key, text)
+        if translation is not None:
+            return translation, True
+        translation = translator.translate(text)
+        self.put(*key, text, translation)
+        return translation, False
+
+    def __len__(self):
+        if self.connection is None:
+            return 0
+        return self.connection.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def stats(self):
+        return f'çeviri belleği: {self.hits} isabet, {self.misses} ıska'
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
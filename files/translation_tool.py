@@ -3,26 +3,81 @@ from PyQt5.QtWidgets import (
     QSplitter, QPlainTextEdit, QListWidget, QPushButton,
     QProgressBar, QStatusBar, QMenuBar, QAction, QFontDialog,
     QInputDialog, QMessageBox, QFileDialog, QTabWidget, QDialog,
-    QApplication
+    QApplication, QScrollBar, QPlainTextDocumentLayout
 )
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QTextCursor
+from PyQt5.QtGui import QTextCursor, QTextDocument
 import os
 import webbrowser
+from collections import deque
+from functools import partial
 import pyperclip
 from deep_translator import GoogleTranslator
-from file_loader import FileLoader
+from document_cache import CachedDocument, DocumentCache, document_cost
+from file_loader import PROGRESSIVE_THRESHOLD, FileLoader, PagedFileLoader, StructuredFileLoader
+from encoding_detection import UTF8, describe, detect_encoding
+from lazy_highlighting import LAZY_HIGHLIGHT_THRESHOLD, LazyHighlighting
+from file_saver import (
+    INCREMENTAL_SAVE_THRESHOLD, FileSaver, LineChanges, write_changed_lines, write_text
+)
+from line_index import LineIndex
+from paged_document import LARGE_FILE_THRESHOLD, supports_encoding
+from paged_view import PagedView
+from prefetcher import Prefetcher, neighbours, prefetch_budget, prefetch_count, prefetched_cost
+from structured_document import from_line, is_structured, to_line, write_segments
+from grammars import grammar_for
 from syntax_highlighter import SyntaxHighlighter
+from tokenizer import Tokenizer
+from translation_memory import TranslationMemory
+from batch_translation import BatchTranslator, DocumentJob, FileJob
 from character_converter import ModernCharacterConverter
 
+# Aşamalı yüklemede olay döngüsünün bir turunda belgeye eklenen en fazla
+# karakter; arada çizim ve kullanıcı olayları işlenir.
+APPEND_SLICE_CHARS = 64 * 1024
+
 class TranslationTool(QMainWindow):
     def __init__(self):
         super().__init__()
         self.folder_path = None
         self.current_file_path = None
+        # Yüklenen dosyanın kodlaması; kaydederken aynısı kullanılır.
+        self.current_encoding = UTF8
         self.file_loader = None
+        self.paged_document = None
+        # .json/.csv dosyalarında düzenleyici yalnızca çevrilebilir değerleri
+        # (segment başına bir satır) gösterir.
+        self.segment_store = None
+        self.line_index = None
+        # Satır dizini belgenin bu sürümüne aittir (bkz. invalidate_line_index).
+        self.line_index_revision = None
+        self.current_document = None
+        self.pending_text = deque()
+        self.pending_finish = None
+        # Gösterilen belge tamamen yüklendiyse ve değiştirilmediyse başka bir
+        # dosyaya geçerken önbelleğe konur.
+        self.document_cache = DocumentCache()
+        self.document_key = None
+        self.document_complete = False
+        # Kaydetme arka planda yapılır; büyük dosyalarda yalnızca değişen
+        # satırlar yeniden yazılır.
+        self.file_saver = None
+        self.line_changes = LineChanges(self)
+        # İsteğe bağlı: listede seçili dosyanın komşuları arka planda okunur.
+        self.prefetch_enabled = False
+        self.prefetch_count = prefetch_count()
+        self.prefetch_cache = DocumentCache(prefetch_budget())
+        self.prefetcher = None
+        # Tüm belgelerin renklendiricileri blok belirteçlerini paylaşır; aynı
+        # satır bir kez çözülür.
+        self.tokenizer = Tokenizer()
         self.last_search = ""
+        self.last_find_offset = -1
         self.translator = GoogleTranslator(source='auto', target='tr')
+        # Aynı metin (ör. yinelenen arayüz dizgileri) yeniden ağa gönderilmez.
+        self.translation_memory = TranslationMemory()
+        # Belgenin ya da klasörün tüm değerleri arka planda çevrilir.
+        self.batch_translator = None
         self.init_ui()
 
     def init_ui(self):
@@ -99,12 +154,32 @@ class TranslationTool(QMainWindow):
             }
         """)
         
-        # Syntax Highlighter
-        self.highlighter = SyntaxHighlighter(self.text_edit.document())
+        self.append_timer = QTimer(self)
+        self.append_timer.setInterval(0)
+        self.append_timer.timeout.connect(self.flush_loaded_text)
+        
+        # Her dosyanın kendi belgesi ve renklendiricisi vardır; önbellekten
+        # dönülen belge yeniden renklendirilmez. Büyük belgeler görünen
+        # alandan başlayarak renklendirilir (bkz. highlight_document).
+        self.highlighter = None
+        self.lazy_highlighting = LazyHighlighting(self.text_edit)
+        self.show_document(*self.new_document())
+        self.highlight_document(lazy=False)
+        
+        # Büyük dosya modu: düzenleyici yalnızca görünen sayfaları tutar,
+        # dış kaydırma çubuğu tüm dosyayı temsil eder.
+        self.page_scrollbar = QScrollBar(Qt.Vertical)
+        self.paged_view = PagedView(self.text_edit, self.page_scrollbar)
+        self.editor_widget = QWidget()
+        editor_layout = QHBoxLayout(self.editor_widget)
+        editor_layout.setContentsMargins(0, 0, 0, 0)
+        editor_layout.setSpacing(0)
+        editor_layout.addWidget(self.text_edit)
+        editor_layout.addWidget(self.page_scrollbar)
         
         # Splitter'a widget'ları ekle
         self.splitter.addWidget(self.file_list)
-        self.splitter.addWidget(self.text_edit)
+        self.splitter.addWidget(self.editor_widget)
         self.splitter.setSizes([200, 800])
         
         # Kontrol Butonları
@@ -194,7 +269,12 @@ class TranslationTool(QMainWindow):
         change_font = QAction('Yazı Tipi...', self)
         change_font.triggered.connect(self.change_font)
         
+        go_to_line = QAction('Satıra Git...', self)
+        go_to_line.setShortcut('Ctrl+G')
+        go_to_line.triggered.connect(self.go_to_line)
+        
         edit_menu.addAction(change_font)
+        edit_menu.addAction(go_to_line)
         
         # Görünüm menüsü
         view_menu = menubar.addMenu('Görünüm')
@@ -203,28 +283,166 @@ class TranslationTool(QMainWindow):
         toggle_wrap.setCheckable(True)
         toggle_wrap.triggered.connect(self.toggle_word_wrap)
         
+        toggle_prefetch = QAction('Komşu Dosyaları Önceden Yükle', self)
+        toggle_prefetch.setCheckable(True)
+        toggle_prefetch.triggered.connect(self.toggle_prefetch)
+        
+        prefetch_count = QAction('Önceden Yüklenecek Dosya Sayısı...', self)
+        prefetch_count.triggered.connect(self.change_prefetch_count)
+        
         view_menu.addAction(toggle_wrap)
+        view_menu.addAction(toggle_prefetch)
+        view_menu.addAction(prefetch_count)
+        
+        # Çeviri menüsü
+        translate_menu = menubar.addMenu('Çeviri')
+        
+        translate_document = QAction('Dosyayı Çevir', self)
+        translate_document.setShortcut('Ctrl+Shift+T')
+        translate_document.triggered.connect(self.translate_document)
+        
+        translate_folder = QAction('Klasörü Çevir...', self)
+        translate_folder.triggered.connect(self.translate_folder)
+        
+        cancel_translation = QAction('Toplu Çeviriyi Durdur', self)
+        cancel_translation.triggered.connect(self.cancel_batch_translation)
+        
+        translate_menu.addAction(translate_document)
+        translate_menu.addAction(translate_folder)
+        translate_menu.addAction(cancel_translation)
 
     def save_file(self):
+        if self.paged_document:
+            self.status_bar.showMessage('Büyük dosya modunda dosya salt okunurdur')
+            return
+        if self.file_saver and self.file_saver.isRunning():
+            self.status_bar.showMessage('Önceki kaydetme henüz bitmedi')
+            return
+
         if not self.current_file_path:
             self.current_file_path, _ = QFileDialog.getSaveFileName(
                 self, 'Dosyayı Kaydet', '', 
                 'Metin Dosyası (*.txt);;Tüm Dosyalar (*)'
             )
         
-        if self.current_file_path:
-            try:
-                with open(self.current_file_path, "w", encoding="utf-8") as file:
-                    content = self.text_edit.toPlainText()
-                    file.write(content)
-                self.status_bar.showMessage('Dosya kaydedildi')
-                QMessageBox.information(self, "Başarılı", "Değişiklikler kaydedildi.")
-            except Exception as e:
-                self.status_bar.showMessage('Dosya kaydedilemedi')
-                QMessageBox.critical(
+        if not self.current_file_path:
+            return
+        file_path = self.current_file_path
+        document = self.text_edit.document()
+        if self.segment_store is not None:
+            # Değerler dosyanın geri kalanına dokunulmadan kendi aralıklarına
+            # yazılır.
+            store = self.segment_store
+            text = document.toPlainText()
+            # Segmentsiz dosyanın belgesi boştur; ''.split('\n') bir değer verir.
+            if not text and len(store) == 0:
+                values = []
+            else:
+                values = [from_line(line) for line in text.split('\n')]
+            if len(values) != len(store):
+                QMessageBox.warning(
                     self, "Hata",
-                    f"Dosya kaydedilirken hata oluştu: {str(e)}"
+                    f"Satır sayısı ({len(values)}) segment sayısıyla ({len(store)}) eşleşmiyor; "
+                    "her satır bir değerdir, satır eklenip silinemez."
                 )
+                return
+            self.start_saving(file_path, partial(write_segments, store, values), values=values)
+        elif self.can_save_incrementally(file_path):
+            # Yalnızca değişen satırların metni alınır; gerisi eski dosyadan
+            # kopyalanır.
+            self.start_saving(file_path, partial(
+                write_changed_lines, source_path=file_path,
+                pieces=self.line_changes.pieces(), encoding=self.current_encoding
+            ), incremental=True)
+        else:
+            self.start_saving(file_path, partial(
+                write_text, text=document.toPlainText(), encoding=self.current_encoding
+            ))
+
+    def can_save_incrementally(self, file_path):
+        # Dosya yüklendiğinden beri diskte değişmediyse, yeterince büyükse ve
+        # kodlamada \n tek baytsa.
+        return (self.line_changes.document is self.text_edit.document()
+                and self.document_key is not None
+                and self.document_key == DocumentCache.key(file_path)
+                and self.document_key[2] >= INCREMENTAL_SAVE_THRESHOLD
+                and supports_encoding(self.current_encoding))
+
+    def start_saving(self, file_path, write, incremental=False, values=None):
+        # Yazma arka planda yapılır; bitene kadar belge salt okunurdur, ama
+        # kaydırma, arama ve dosya listesi kullanılabilir.
+        saver = FileSaver(file_path, write)
+        saver.document = self.text_edit.document()
+        saver.segments = self.segment_store
+        saver.values = values
+        saver.incremental = incremental
+        saver.progress.connect(self.update_save_progress)
+        saver.finished.connect(self.file_saved)
+        saver.failed.connect(self.file_save_failed)
+        self.file_saver = saver
+        self.text_edit.setReadOnly(True)
+        self.save_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.status_bar.showMessage('Kaydediliyor...')
+        saver.start()
+
+    def update_save_progress(self, value):
+        if self.sender() is not self.file_saver or not self.is_saving_current():
+            return
+        self.progress_bar.setValue(value)
+        self.status_bar.showMessage(f'Kaydediliyor... %{value}')
+
+    def is_saving_current(self):
+        return self.file_saver is not None and self.file_saver.document is self.text_edit.document()
+
+    def file_saved(self, result):
+        saver = self.sender()
+        # Kaydetme nesnesi belgeyi bırakır; başka dosyaya geçildiyse belge
+        # burada tutulmasın.
+        document, saver.document = saver.document, None
+        if saver.segments is not None:
+            saver.segments.update(saver.values, result)
+        if saver is not self.file_saver or document is not self.text_edit.document():
+            # Kaydetme sürerken başka bir dosyaya geçildi.
+            return
+        document.setModified(False)
+        # Disk sürümü değişti; önbellek anahtarı yenilenir.
+        self.document_key = DocumentCache.key(saver.file_path)
+        self.document_complete = True
+        if self.segment_store is None:
+            self.line_changes.attach(document)
+        self.text_edit.setReadOnly(False)
+        self.save_button.setEnabled(True)
+        self.progress_bar.hide()
+        megabytes = saver.bytes_written / 1024 / 1024
+        speed = megabytes / saver.elapsed if saver.elapsed else 0
+        details = f'{megabytes:.1f} MB, {saver.elapsed:.2f} sn, {speed:.0f} MB/sn'
+        if saver.incremental:
+            details += f', değişen satır: {result}'
+        self.status_bar.showMessage(f'Dosya kaydedildi ({details})')
+        QMessageBox.information(self, "Başarılı", "Değişiklikler kaydedildi.")
+
+    def file_save_failed(self, message):
+        saver = self.sender()
+        document, saver.document = saver.document, None
+        if saver is not self.file_saver or document is not self.text_edit.document():
+            return
+        if saver.retry_full:
+            # Eski dosya satır satır eşlenemedi (ör. tek başına \r); belge
+            # baştan yazılır.
+            self.line_changes.detach()
+            self.start_saving(saver.file_path, partial(
+                write_text, text=document.toPlainText(), encoding=self.current_encoding))
+            return
+        self.text_edit.setReadOnly(False)
+        self.save_button.setEnabled(True)
+        self.progress_bar.hide()
+        self.status_bar.showMessage('Dosya kaydedilemedi')
+        QMessageBox.critical(
+            self, "Hata",
+            f"Dosya kaydedilirken hata oluştu: {message}"
+        )
 
     def translate_selection(self):
         cursor = self.text_edit.textCursor()
@@ -235,15 +453,164 @@ class TranslationTool(QMainWindow):
                 self.status_bar.showMessage('Çeviri yapılıyor...')
                 QApplication.processEvents()
                 
-                translated_text = self.translator.translate(selected_text)
+                translated_text, remembered = self.translation_memory.translate(
+                    self.translator, selected_text
+                )
                 self.show_translation_dialog(selected_text, translated_text)
                 
-                self.status_bar.showMessage('Çeviri tamamlandı')
+                source = 'bellekten' if remembered else 'çevirmenden'
+                self.status_bar.showMessage(
+                    f'Çeviri tamamlandı ({source}; {self.translation_memory.stats()})'
+                )
             except Exception as e:
                 QMessageBox.warning(self, "Hata", f"Çeviri sırasında hata: {str(e)}")
         else:
             QMessageBox.warning(self, "Hata", "Çevrilecek metin seçilmedi.")
 
+    def translate_document(self):
+        # .json/.csv dosyalarında her satır (segment), diğerlerinde
+        # renklendiricinin tanıdığı tırnaklı dizgiler çevrilir.
+        if self.batch_translation_running():
+            return
+        if self.paged_document:
+            self.status_bar.showMessage('Büyük dosya modunda metin değiştirilemez')
+            return
+        if self.file_loader and self.file_loader.isRunning():
+            self.status_bar.showMessage('Dosya henüz yüklenmedi')
+            return
+        document = self.text_edit.document()
+        job = DocumentJob(document.toPlainText(), self.highlighter.grammar, self.segment_store)
+        job.document = document
+        job.revision = document.revision()
+        self.start_batch_translation([job])
+
+    def translate_folder(self):
+        # Klasör listesindeki dosyalar diskte, yerinde çevrilir.
+        if self.batch_translation_running():
+            return
+        if not self.folder_path or not self.file_list.count():
+            QMessageBox.warning(self, "Hata", "Önce çevrilecek dosyaların bulunduğu klasörü yükleyin.")
+            return
+        if self.text_edit.document().isModified():
+            QMessageBox.warning(self, "Hata", "Kaydedilmemiş değişiklikler var; önce kaydedin.")
+            return
+        paths = [os.path.join(self.folder_path, self.file_list.item(row).text())
+                 for row in range(self.file_list.count())]
+        reply = QMessageBox.question(
+            self, 'Klasörü Çevir',
+            f'{len(paths)} dosyadaki metinler çevrilip dosyaların üzerine yazılacak. '
+            'Devam edilsin mi?',
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.start_batch_translation([FileJob(path) for path in paths])
+
+    def batch_translation_running(self):
+        if self.batch_translator and self.batch_translator.isRunning():
+            self.status_bar.showMessage('Toplu çeviri sürüyor')
+            return True
+        return False
+
+    def start_batch_translation(self, jobs):
+        worker = BatchTranslator(
+            jobs,
+            partial(GoogleTranslator, source=self.translator.source, target=self.translator.target),
+            memory_path=self.translation_memory.path
+        )
+        worker.progress.connect(self.update_batch_progress)
+        worker.finished.connect(self.batch_translation_finished)
+        self.batch_translator = worker
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.status_bar.showMessage('Çevrilecek metinler toplanıyor...')
+        worker.start()
+
+    def cancel_batch_translation(self):
+        if self.batch_translator and self.batch_translator.isRunning():
+            self.batch_translator.cancel()
+            self.status_bar.showMessage('Toplu çeviri durduruluyor...')
+
+    def update_batch_progress(self, done, total, rate, eta):
+        if self.sender() is not self.batch_translator:
+            return
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+        remaining = f'{int(eta) // 60}:{int(eta) % 60:02d}' if eta >= 0 else '?'
+        details = f'{rate:.1f} segment/sn, kalan {remaining}'
+        self.progress_bar.setFormat(f'%v / %m segment — {details}')
+        self.status_bar.showMessage(f'Çevriliyor... {done} / {total} segment, {details}')
+
+    def batch_translation_finished(self, report):
+        worker = self.sender()
+        if worker is not self.batch_translator:
+            return
+        self.batch_translator = None
+        self.progress_bar.hide()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.resetFormat()
+        memory = self.translation_memory
+        memory.hits += report['remembered']
+        memory.misses += report['unique'] - report['remembered']
+        details = (f"{report['segments']} segment: {report['translated']} çevrildi, "
+                   f"{report['remembered']} bellekten, {report['failed']} başarısız, "
+                   f"{report['seconds']:.1f} sn")
+        job = worker.jobs[0] if worker.jobs else None
+        if isinstance(job, DocumentJob):
+            if job.document is self.text_edit.document():
+                skipped = self.apply_translations(job)
+                if skipped:
+                    details += f', belge değiştiği için atlanan: {skipped}'
+            else:
+                details += ', belge kapatıldığı için uygulanmadı'
+        else:
+            details = f"{report['files']} dosya, " + details
+            # Gösterilen dosya diskte değiştiyse yeniden yüklenir.
+            if self.current_file_path and not self.text_edit.document().isModified() \
+                    and self.document_key != DocumentCache.key(self.current_file_path) \
+                    and any(job.file_path == self.current_file_path for job in worker.jobs):
+                self.load_file(self.current_file_path)
+        if report['unwritable']:
+            details += f", tırnak içerdiği için yazılamayan: {report['unwritable']}"
+        if report['cancelled']:
+            details += ', durduruldu'
+        self.status_bar.showMessage(f'Toplu çeviri bitti ({details})')
+        if not isinstance(job, DocumentJob):
+            QMessageBox.information(self, "Toplu Çeviri", f'Toplu çeviri bitti ({details})')
+        if report['errors']:
+            QMessageBox.warning(
+                self, "Hata",
+                "Toplu çeviride hatalar oluştu:\n" + "\n".join(
+                    f"{os.path.basename(path)}: {message}" if path else message
+                    for path, message in report['errors'][:10]
+                )
+            )
+
+    def apply_translations(self, job):
+        # Çeviriler tek bir geri alınabilir düzenleme olarak uygulanır. Belge
+        # iş sürerken değiştiyse yalnızca metni aynı kalan satırlara yazılır.
+        # Atlanan değer sayısını döndürür.
+        document = job.document
+        changed = document.revision() != job.revision
+        lines = job.text.split('\n') if changed else None
+        skipped = 0
+        line_ok = True
+        current_line = None
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        for number, start, end, text in reversed(job.edits):
+            block = document.findBlockByNumber(number)
+            if number != current_line:
+                current_line = number
+                line_ok = not changed or (block.isValid() and block.text() == lines[number])
+            if not line_ok:
+                skipped += 1
+                continue
+            cursor.setPosition(block.position() + start)
+            cursor.setPosition(block.position() + end, QTextCursor.KeepAnchor)
+            cursor.insertText(text)
+        cursor.endEditBlock()
+        return skipped
+
     def show_translation_dialog(self, original_text, translated_text):
         dialog = QDialog(self)
         dialog.setWindowTitle("Çeviri Sonucu")
@@ -371,12 +738,18 @@ class TranslationTool(QMainWindow):
         self.status_bar.showMessage('Çeviri panoya kopyalandı')
 
     def insert_translation(self, text):
+        if self.paged_document:
+            self.status_bar.showMessage('Büyük dosya modunda metin değiştirilemez')
+            return
         cursor = self.text_edit.textCursor()
         cursor.movePosition(QTextCursor.End)
         cursor.insertText('\n' + text)
         self.status_bar.showMessage('Çeviri metne eklendi')
 
     def replace_selected_text(self, text):
+        if self.paged_document:
+            self.status_bar.showMessage('Büyük dosya modunda metin değiştirilemez')
+            return
         cursor = self.text_edit.textCursor()
         if cursor.hasSelection():
             cursor.insertText(text)
@@ -385,11 +758,156 @@ class TranslationTool(QMainWindow):
             self.status_bar.showMessage('Değiştirilecek metin seçilmedi')
 
     def update_progress(self, value):
+        if self.sender() is not self.file_loader:
+            return
         self.progress_bar.setValue(value)
         self.status_bar.showMessage(f'Dosya yükleniyor... %{value}')
 
+    def new_document(self):
+        document = QTextDocument()
+        document.setDocumentLayout(QPlainTextDocumentLayout(document))
+        # Renklendirici belgeye highlight_document ile bağlanır.
+        return document, SyntaxHighlighter(tokenizer=self.tokenizer)
+
+    def show_document(self, document, highlighter):
+        # Belgelerin ebeveyni yoktur; düzenleyici onları silmez, önbellekten
+        # çıkarılan ya da bırakılan belgeyi Python siler.
+        if self.current_document is not None:
+            self.current_document.contentsChange.disconnect(self.invalidate_line_index)
+        self.current_document = document
+        self.highlighter = highlighter
+        # Dosyayla birlikte yüklenen satır dizini metin değişince geçersizleşir.
+        document.contentsChange.connect(self.invalidate_line_index)
+        self.line_changes.detach()
+        self.lazy_highlighting.detach()
+        self.text_edit.setDocument(document)
+
+    def highlight_document(self, lazy=None):
+        # Küçük belgeler bir seferde renklendirilir. Büyük belgelerde
+        # renklendirici bağlanırsa ilk çizimden önce tüm belge renklendirilir;
+        # onun yerine yalnızca görünen bloklar hemen renklendirilir.
+        document = self.text_edit.document()
+        if self.highlighter.document() is document:
+            return
+        self.highlighter.set_grammar(
+            grammar_for(self.current_file_path, structured=self.segment_store is not None))
+        if lazy is None:
+            lazy = document.characterCount() >= LAZY_HIGHLIGHT_THRESHOLD
+        if lazy:
+            if self.lazy_highlighting.document is not document:
+                self.lazy_highlighting.attach(document, self.highlighter)
+        else:
+            self.lazy_highlighting.detach()
+            self.highlighter.setDocument(document)
+
+    def cancel_loading(self):
+        # Yalnızca son istek geçerlidir: önceki yükleyici durdurulur ve
+        # bitmesi beklenir (en fazla bir blok okuma süresi). Kuyruğa girmiş
+        # sinyalleri sender denetimi eler.
+        if self.file_loader and self.file_loader.isRunning():
+            self.file_loader.requestInterruption()
+            self.file_loader.wait()
+        self.pending_text.clear()
+        self.pending_finish = None
+        self.append_timer.stop()
+
+    def stash_current_document(self):
+        if (self.document_key and self.document_complete and not self.paged_document
+                and not self.current_document.isModified()):
+            self.document_cache.put(
+                self.document_key,
+                CachedDocument(self.current_document, self.highlighter,
+                               self.current_encoding, self.line_index, self.segment_store),
+                document_cost(self.current_document)
+            )
+        self.document_key = None
+        self.document_complete = False
+
+    def append_loaded_text(self, text):
+        # Aşamalı yükleme: gelen metin kuyruğa alınır ve flush_loaded_text
+        # ile dilim dilim eklenir.
+        if self.sender() is not self.file_loader:
+            return
+        self.pending_text.append(text)
+        if not self.append_timer.isActive():
+            self.append_timer.start()
+
+    def flush_loaded_text(self):
+        # Metin belgenin sonuna eklenir, kullanıcının kaydırma konumu
+        # değişmez. Dilimler mümkünse satır sonunda kesilir.
+        budget = APPEND_SLICE_CHARS
+        parts = []
+        while self.pending_text and budget > 0:
+            text = self.pending_text.popleft()
+            if len(text) > budget:
+                cut = text.rfind('\n', 0, budget) + 1 or budget
+                self.pending_text.appendleft(text[cut:])
+                text = text[:cut]
+            parts.append(text)
+            budget -= len(text)
+
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(''.join(parts))
+
+        if not self.pending_text:
+            self.append_timer.stop()
+            if self.pending_finish is not None:
+                args, self.pending_finish = self.pending_finish, None
+                self.finish_loading(*args)
+
     def file_loading_finished(self, content):
-        self.text_edit.setPlainText(content)
+        if self.sender() is not self.file_loader:
+            return
+        # Aşamalı modda metin zaten eklenmiştir.
+        replace = not self.file_loader.progressive
+        self.finish_loading(content, self.file_loader.line_index, replace)
+
+    def file_loading_restarted(self):
+        # Dosya UTF-8 olarak çözülemedi, eski kod sayfasıyla baştan okunuyor;
+        # kaydederken de bu kodlama kullanılır. Aşamalı modda eklenmiş ya da
+        # kuyrukta bekleyen metin atılır.
+        if self.sender() is not self.file_loader:
+            return
+        self.current_encoding = self.file_loader.encoding
+        self.pending_text.clear()
+        self.append_timer.stop()
+        self.text_edit.document().clear()
+        self.status_bar.showMessage(
+            f'Dosya UTF-8 değil; {describe(self.current_encoding)} ile yeniden okunuyor')
+
+    def file_loading_failed(self, message):
+        # Hata metni belgeye yazılmaz: yarım ya da yanlış bir metin dosyanın
+        # üzerine kaydedilebilirdi. Boş, dosyaya bağlı olmayan bir belge açılır.
+        if self.sender() is not self.file_loader:
+            return
+        self.pending_text.clear()
+        self.pending_finish = None
+        self.append_timer.stop()
+        self.show_document(*self.new_document())
+        self.document_key = None
+        self.current_file_path = None
+        self.text_edit.setReadOnly(False)
+        self.progress_bar.hide()
+        self.status_bar.showMessage('Dosya açılamadı')
+        QMessageBox.critical(self, "Hata", f"Dosya açılamadı.\n{message}")
+
+    def finish_loading(self, content, line_index, replace=True):
+        if self.pending_text:
+            # Kuyruktaki metin eklenince yeniden çağrılır.
+            self.pending_finish = (content, line_index, replace)
+            return
+        if replace:
+            self.text_edit.setPlainText(content)
+        self.highlight_document()
+        document = self.text_edit.document()
+        document.setUndoRedoEnabled(True)
+        document.setModified(False)
+        self.set_line_index(line_index)
+        if line_index is not None and self.segment_store is None:
+            self.line_changes.attach(document, len(line_index.newlines) + 1)
+        # Hata durumunda satır dizini yoktur; hata metni önbelleğe alınmaz.
+        self.document_complete = self.line_index is not None
         self.text_edit.setReadOnly(False)
         self.save_button.setEnabled(True)
         self.translate_button.setEnabled(True)
@@ -398,13 +916,107 @@ class TranslationTool(QMainWindow):
         
         if self.current_file_path:
             file_size = os.path.getsize(self.current_file_path) / 1024  # KB
-            line_count = len(content.splitlines())
+            line_count = self.line_index.line_count if self.line_index else 0
             self.status_bar.showMessage(
                 f'Dosya: {os.path.basename(self.current_file_path)} | '
                 f'Boyut: {file_size:.1f} KB | '
-                f'Satır: {line_count}'
+                f'Satır: {line_count} | '
+                f'Kodlama: {describe(self.current_encoding)}'
+                f'{self.segment_stats()}'
+                f'{self.prefetch_stats()}'
             )
 
+    def large_file_loaded(self, document):
+        if self.sender() is not self.file_loader:
+            document.close()
+            return
+        self.paged_document = document
+        self.last_find_offset = -1
+        # Düzenleyicide yalnızca birkaç sayfa bulunur.
+        self.highlight_document(lazy=False)
+        self.paged_view.attach(document)
+        self.save_button.setEnabled(False)
+        self.translate_button.setEnabled(True)
+        self.find_button.setEnabled(True)
+        self.progress_bar.hide()
+        self.status_bar.showMessage(
+            f'Dosya: {os.path.basename(document.file_path)} | '
+            f'Boyut: {document.size / 1024 / 1024:.1f} MB | '
+            f'Satır: {document.line_count} | '
+            f'Kodlama: {describe(document.encoding)} | Büyük dosya modu (salt okunur)'
+        )
+
+    def structured_file_loaded(self, store):
+        if self.sender() is not self.file_loader:
+            return
+        self.segment_store = store
+        self.current_encoding = store.encoding
+        text = '\n'.join(map(to_line, store.texts()))
+        line_index = LineIndex()
+        line_index.add(text)
+        self.show_loaded_text(text, line_index)
+
+    def structured_file_failed(self, message):
+        # Ayrıştırılamayan dosya (ör. bozuk JSON) düz metin olarak açılır.
+        if self.sender() is not self.file_loader:
+            return
+        self.status_bar.showMessage(f'{message} — düz metin olarak açılıyor')
+        self.start_text_loader(self.current_file_path)
+
+    def segment_stats(self):
+        store = self.segment_store
+        if store is None:
+            return ''
+        return f' | {len(store)} segment ({store.kind.upper()})'
+
+    def set_line_index(self, line_index):
+        self.line_index = line_index
+        self.line_index_revision = self.current_document.revision()
+
+    def invalidate_line_index(self, position, removed, added):
+        # Renklendirme de (setFormat, rehighlight) contentsChange ve
+        # textChanged yayar; yalnızca metin değiştiyse (belge sürümü
+        # ilerlediyse) dizin atılır.
+        if self.line_index is not None \
+                and self.current_document.revision() != self.line_index_revision:
+            self.line_index = None
+
+    def line_count(self):
+        if self.paged_document:
+            return self.paged_document.line_count
+        if self.line_index:
+            return self.line_index.line_count
+        return self.text_edit.document().blockCount()
+
+    def go_to_line(self):
+        line_count = self.line_count()
+        if not line_count:
+            return
+        line, ok = QInputDialog.getInt(
+            self, 'Satıra Git', f'Satır (1 - {line_count}):',
+            1, 1, line_count
+        )
+        if not ok:
+            return
+        line -= 1
+        if self.paged_document:
+            self.paged_view.go_to(line)
+        else:
+            cursor = self.text_edit.textCursor()
+            if self.line_index:
+                cursor.setPosition(self.line_index.line_start(line))
+            else:
+                cursor.setPosition(self.text_edit.document().findBlockByNumber(line).position())
+            self.text_edit.setTextCursor(cursor)
+            self.text_edit.centerCursor()
+        self.status_bar.showMessage(f'Satır {line + 1}')
+
+    def close_paged_document(self):
+        if self.paged_document:
+            self.paged_view.detach()
+            self.paged_document.close()
+            self.paged_document = None
+
     def load_folder(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Klasör Seç")
         if folder_path:
@@ -416,6 +1028,7 @@ class TranslationTool(QMainWindow):
                     self.file_list.addItem(file_name)
             
             self.status_bar.showMessage(f'{len(os.listdir(folder_path))} dosya bulundu')
+            self.schedule_prefetch()
 
     def load_file(self, file_path=None):
         if not file_path:
@@ -425,15 +1038,174 @@ class TranslationTool(QMainWindow):
             )
         
         if file_path:
+            self.cancel_loading()
+            self.stash_current_document()
+            self.close_paged_document()
             self.current_file_path = file_path
-            self.text_edit.clear()
+            
+            self.document_key = DocumentCache.key(file_path)
+            cached = self.document_cache.take(self.document_key)
+            if cached:
+                self.show_cached_document(cached)
+                self.schedule_prefetch()
+                return
+            
+            self.segment_store = None
+            self.show_document(*self.new_document())
+            prefetched = self.prefetch_cache.take(self.document_key) if self.prefetch_enabled else None
+            self.schedule_prefetch()
+            if prefetched:
+                self.show_prefetched_file(prefetched)
+                return
+            
             self.progress_bar.show()
             self.progress_bar.setValue(0)
             
-            self.file_loader = FileLoader(file_path)
-            self.file_loader.progress.connect(self.update_progress)
+            # Kodlama yalnızca BOM'a ve baştan/sondan birkaç KB'lık örneğe
+            # bakılarak belirlenir; dosya ardından bir kez okunur.
+            try:
+                self.current_encoding = detect_encoding(file_path)
+            except OSError:
+                self.current_encoding = UTF8
+            
+            if is_structured(file_path):
+                # Bellek ham dosya boyutuyla değil segment sayısıyla büyür;
+                # bu yüzden büyük dosya modundan önce denenir.
+                self.file_loader = StructuredFileLoader(file_path, self.current_encoding)
+                self.file_loader.finished.connect(self.structured_file_loaded)
+                self.file_loader.failed.connect(self.structured_file_failed)
+                self.file_loader.progress.connect(self.update_progress)
+                self.file_loader.start()
+            else:
+                self.start_text_loader(file_path)
+
+    def start_text_loader(self, file_path):
+        if os.path.getsize(file_path) >= LARGE_FILE_THRESHOLD \
+                and supports_encoding(self.current_encoding):
+            self.file_loader = PagedFileLoader(file_path, self.current_encoding)
+            self.file_loader.finished.connect(self.large_file_loaded)
+            self.file_loader.failed.connect(self.file_loading_failed)
+        else:
+            progressive = os.path.getsize(file_path) >= PROGRESSIVE_THRESHOLD
+            self.file_loader = FileLoader(
+                file_path, progressive=progressive, encoding=self.current_encoding
+            )
+            if progressive:
+                # Yükleme bitene kadar belge salt okunurdur ve geri alma
+                # geçmişi tutulmaz.
+                self.text_edit.setReadOnly(True)
+                self.text_edit.document().setUndoRedoEnabled(False)
+                self.highlight_document(lazy=True)
+                self.file_loader.text_loaded.connect(self.append_loaded_text)
             self.file_loader.finished.connect(self.file_loading_finished)
-            self.file_loader.start()
+            self.file_loader.failed.connect(self.file_loading_failed)
+            self.file_loader.restarted.connect(self.file_loading_restarted)
+        self.file_loader.progress.connect(self.update_progress)
+        self.file_loader.start()
+
+    def show_prefetched_file(self, prefetched):
+        self.current_encoding = prefetched.encoding
+        self.show_loaded_text(prefetched.text, prefetched.line_index)
+
+    def show_loaded_text(self, text, line_index):
+        # Metin zaten çözülmüştür; yalnızca belgeye eklenir. Büyük metin
+        # aşamalı yüklemedeki gibi dilim dilim eklenir.
+        self.progress_bar.hide()
+        if len(text) >= PROGRESSIVE_THRESHOLD:
+            self.text_edit.setReadOnly(True)
+            self.text_edit.document().setUndoRedoEnabled(False)
+            self.highlight_document(lazy=True)
+            self.pending_text.append(text)
+            self.append_timer.start()
+            self.finish_loading('', line_index, replace=False)
+        else:
+            self.finish_loading(text, line_index)
+
+    def toggle_prefetch(self, checked):
+        self.prefetch_enabled = checked
+        if checked:
+            if self.prefetcher is None:
+                self.prefetcher = Prefetcher()
+                self.prefetcher.prefetched.connect(self.file_prefetched)
+            self.schedule_prefetch()
+        else:
+            self.cancel_prefetch()
+            self.prefetch_cache.clear()
+
+    def change_prefetch_count(self):
+        count, ok = QInputDialog.getInt(
+            self, 'Önceden Yükleme',
+            'Seçili dosyanın her iki yanında önceden yüklenecek dosya sayısı:',
+            self.prefetch_count, 0, 50
+        )
+        if ok:
+            self.prefetch_count = count
+            self.schedule_prefetch()
+
+    def cancel_prefetch(self):
+        if self.prefetcher:
+            self.prefetcher.cancel()
+
+    def schedule_prefetch(self):
+        # Gösterilen dosya klasör listesinde değilse (Aç ile başka bir yerden
+        # açıldıysa) bekleyen önceden yükleme iptal edilir.
+        if not self.prefetch_enabled or not self.folder_path or not self.current_file_path:
+            self.cancel_prefetch()
+            return
+        folder, name = os.path.split(self.current_file_path)
+        items = self.file_list.findItems(name, Qt.MatchExactly)
+        if not items or os.path.normcase(os.path.abspath(folder)) != \
+                os.path.normcase(os.path.abspath(self.folder_path)):
+            self.cancel_prefetch()
+            return
+        paths = []
+        for row in neighbours(self.file_list.row(items[0]), self.prefetch_count,
+                              self.file_list.count()):
+            path = os.path.join(self.folder_path, self.file_list.item(row).text())
+            key = DocumentCache.key(path)
+            # Önbelleklerden birinde olan dosya yeniden okunmaz; segment
+            # olarak açılan dosyalar düz metin olarak önceden yüklenmez.
+            if key and not is_structured(path) and key not in self.document_cache.entries \
+                    and key not in self.prefetch_cache.entries:
+                paths.append(path)
+        self.prefetcher.schedule(paths)
+
+    def file_prefetched(self, key, prefetched):
+        if not self.prefetch_enabled or key == self.document_key:
+            return
+        self.prefetch_cache.put(key, prefetched, prefetched_cost(prefetched))
+
+    def prefetch_stats(self):
+        if not self.prefetch_enabled:
+            return ''
+        cache = self.prefetch_cache
+        requests = cache.hits + cache.misses
+        rate = cache.hits * 100 // requests if requests else 0
+        return (f' | Önceden yükleme: {cache.hits} isabet / {cache.misses} ıska '
+                f'(%{rate}, {cache.used / 1024 / 1024:.0f} MB)')
+
+    def show_cached_document(self, cached):
+        self.show_document(cached.document, cached.highlighter)
+        self.current_encoding = cached.encoding
+        self.set_line_index(cached.line_index)
+        self.segment_store = cached.segments
+        self.highlight_document(lazy=True)
+        if cached.line_index is not None and cached.segments is None:
+            self.line_changes.attach(cached.document, len(cached.line_index.newlines) + 1)
+        self.document_complete = True
+        self.text_edit.setReadOnly(False)
+        self.save_button.setEnabled(True)
+        self.translate_button.setEnabled(True)
+        self.find_button.setEnabled(True)
+        self.progress_bar.hide()
+        cache = self.document_cache
+        self.status_bar.showMessage(
+            f'Dosya: {os.path.basename(self.current_file_path)} | '
+            f'Satır: {self.line_count()} | '
+            f'Kodlama: {describe(self.current_encoding)}{self.segment_stats()} | '
+            f'Önbellekten ({cache.hits} isabet / {cache.misses} ıska, '
+            f'{cache.used / 1024 / 1024:.0f} MB)'
+        )
 
     def load_selected_file(self, item):
         if not self.folder_path:
@@ -444,9 +1216,16 @@ class TranslationTool(QMainWindow):
             self.load_file(file_path)
 
     def new_file(self):
-        self.text_edit.clear()
+        self.cancel_loading()
+        self.stash_current_document()
+        self.close_paged_document()
+        self.cancel_prefetch()
+        self.show_document(*self.new_document())
         self.text_edit.setReadOnly(False)
         self.current_file_path = None
+        self.current_encoding = UTF8
+        self.segment_store = None
+        self.highlight_document(lazy=False)
         self.save_button.setEnabled(True)
         self.translate_button.setEnabled(True)
         self.find_button.setEnabled(True)
@@ -458,6 +1237,9 @@ class TranslationTool(QMainWindow):
             self.text_edit.setFont(font)
 
     def toggle_word_wrap(self, checked):
+        if self.paged_document:
+            # Sayfa penceresi satır birimiyle kaydırılır; kaydırma kapalı kalır.
+            return
         self.text_edit.setLineWrapMode(
             QPlainTextEdit.WidgetWidth if checked else QPlainTextEdit.NoWrap
         )
@@ -470,16 +1252,44 @@ class TranslationTool(QMainWindow):
         )
         
         if ok and text:
+            if self.paged_document:
+                if text != self.last_search:
+                    self.last_find_offset = -1
+                self.last_search = text
+                self.find_in_large_file(text)
+                return
             self.last_search = text
             cursor = self.text_edit.document().find(text)
             if not cursor.isNull():
                 self.text_edit.setTextCursor(cursor)
+                if self.line_index:
+                    line = self.line_index.line_of(cursor.selectionStart())
+                else:
+                    line = cursor.blockNumber()
+                self.status_bar.showMessage(f'Satır {line + 1}')
             else:
                 QMessageBox.information(
                     self, "Sonuç",
                     f"'{text}' metni bulunamadı."
                 )
 
+    def find_in_large_file(self, text):
+        # Dosyanın tamamında, önceki eşleşmeden sonra arar; sona gelince
+        # baştan devam eder.
+        document = self.paged_document
+        offset = document.find(text, self.last_find_offset + 1)
+        if offset < 0 and self.last_find_offset >= 0:
+            offset = document.find(text)
+        if offset < 0:
+            QMessageBox.information(
+                self, "Sonuç",
+                f"'{text}' metni bulunamadı."
+            )
+            return
+        self.last_find_offset = offset
+        self.paged_view.go_to_offset(offset, len(text))
+        self.status_bar.showMessage(f'Satır {document.line_of_offset(offset) + 1}')
+
     def open_char_converter(self):
         self.char_converter = ModernCharacterConverter()
         self.char_converter.show()
@@ -494,14 +1304,33 @@ class TranslationTool(QMainWindow):
             )
 
             if reply == QMessageBox.Save:
+                # Kaydetme bitmeden çıkılmaz; başarısız olursa pencere açık kalır.
                 self.save_file()
-                event.accept()
+                if self.file_saver:
+                    self.file_saver.wait()
+                    QApplication.processEvents()
+                if self.text_edit.document().isModified():
+                    event.ignore()
+                else:
+                    event.accept()
             elif reply == QMessageBox.Discard:
                 event.accept()
             else:
                 event.ignore()
         else:
             event.accept()
+        
+        if event.isAccepted():
+            self.cancel_loading()
+            if self.file_saver:
+                self.file_saver.wait()
+            if self.prefetcher:
+                self.prefetcher.stop()
+            self.tokenizer.stop()
+            if self.batch_translator:
+                self.batch_translator.cancel()
+                self.batch_translator.wait()
+            self.translation_memory.close()
 
 if __name__ == '__main__':
     app = QApplication([])